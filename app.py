@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 import os
+import sys
+import json
+import math
 
 # Set page configuration
 st.set_page_config(
@@ -11,567 +14,863 @@ st.set_page_config(
 BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)))
 POINTS_FILE = os.path.join(BASE_DIR, "data", "assistant_manager_points.csv")
 RESULTS_FILE = os.path.join(BASE_DIR, "data", "results.csv")
+LEAGUE_TABLE_FILE = os.path.join(BASE_DIR, "data", "final_league_table.csv")
+DB_FILE = os.path.join(BASE_DIR, "data", "assistant_manager_points.sqlite")
+FIXTURE_MATRIX_FILE = os.path.join(BASE_DIR, "data", "fixture_matrix.csv")
+UPCOMING_FIXTURES_FILE = os.path.join(BASE_DIR, "data", "upcoming_fixtures.csv")
+STATUS_FILE = os.path.join(BASE_DIR, "data", "status.json")
+CHIP_STANDINGS_FILE = os.path.join(BASE_DIR, "data", "chip_standings.npz")
+METADATA_FILE = os.path.join(BASE_DIR, "data", "metadata.json")
+
+# The pipeline modules live in app/, next to this dashboard script
+sys.path.insert(0, os.path.join(BASE_DIR, "app"))
+import sqlite_store  # noqa: E402
+from chip_optimizer import (  # noqa: E402
+    CHIP_WINDOW,
+    best_picks,
+    project_amp,
+    value_rankings,
+)
+from chip_standings import (  # noqa: E402
+    FORM_WINDOWS,
+    compute_chip_standings,
+    current_rank,
+    load_chip_standings,
+    team_series,
+)
+from lean_types import LEAN_TYPES, memory_footprint, read_lean_csv  # noqa: E402
+from dashboard_html import (  # noqa: E402
+    CUSTOM_CSS,
+    OVERALL_HEADER_HTML,
+    TeamInfo,
+    match_result_html,
+    render_fixture_heatmap,
+    team_header_html,
+    team_row_html,
+)
+from metadata import load_metadata  # noqa: E402
+from what_if import WhatIf  # noqa: E402
 
-# Team logos (using Wikipedia SVG links)
-TEAM_LOGOS = {
-    "Man Utd": "https://upload.wikimedia.org/wikipedia/en/7/7a/Manchester_United_FC_crest.svg",
-    "Liverpool": "https://upload.wikimedia.org/wikipedia/en/0/0c/Liverpool_FC.svg",
-    "Arsenal": "https://upload.wikimedia.org/wikipedia/en/5/53/Arsenal_FC.svg",
-    "Chelsea": "https://upload.wikimedia.org/wikipedia/en/c/cc/Chelsea_FC.svg",
-    "Aston Villa": "https://upload.wikimedia.org/wikipedia/en/9/9a/Aston_Villa_FC_new_crest.svg",
-    "Crystal Palace": "https://upload.wikimedia.org/wikipedia/en/a/a2/Crystal_Palace_FC_logo_%282022%29.svg",
-    "Brentford": "https://upload.wikimedia.org/wikipedia/en/2/2a/Brentford_FC_crest.svg",
-    "Leicester": "https://upload.wikimedia.org/wikipedia/en/2/2d/Leicester_City_crest.svg",
-    "Spurs": "https://upload.wikimedia.org/wikipedia/en/b/b4/Tottenham_Hotspur.svg",
-    "Nottingham Forest": "https://upload.wikimedia.org/wikipedia/en/e/e5/Nottingham_Forest_F.C._logo.svg",
-    "Man City": "https://upload.wikimedia.org/wikipedia/en/e/eb/Manchester_City_FC_badge.svg",
-    "Newcastle": "https://upload.wikimedia.org/wikipedia/en/5/56/Newcastle_United_Logo.svg",
-    "Brighton": "https://upload.wikimedia.org/wikipedia/en/f/fd/Brighton_%26_Hove_Albion_logo.svg",
-    "Fulham": "https://upload.wikimedia.org/wikipedia/en/e/eb/Fulham_FC_%28shield%29.svg",
-    "Bournemouth": "https://upload.wikimedia.org/wikipedia/en/e/e5/AFC_Bournemouth_%282013%29.svg",
-    "Ipswich": "https://upload.wikimedia.org/wikipedia/en/4/43/Ipswich_Town.svg",
-    "West Ham": "https://upload.wikimedia.org/wikipedia/en/c/c2/West_Ham_United_FC_logo.svg",
-    "Everton": "https://upload.wikimedia.org/wikipedia/en/7/7c/Everton_FC_logo.svg",
-    "Wolves": "https://upload.wikimedia.org/wikipedia/en/f/fc/Wolverhampton_Wanderers.svg",
-    "Southampton": "https://upload.wikimedia.org/wikipedia/en/c/c9/FC_Southampton.svg",
-}
+# Query the SQLite store when the pipeline has written one, else use the CSVs
+DATA_BACKEND = os.environ.get(
+    "AMP_DATA_BACKEND", "sqlite" if os.path.exists(DB_FILE) else "csv"
+)
 
-# Manager & price data
-TEAM_MANAGER_DATA = {
-    "Arsenal": ("Mikel Arteta", "£1.5m"),
-    "Chelsea": ("Enzo Maresca", "£1.5m"),
-    "Liverpool": ("Arne Slot", "£1.5m"),
-    "Man City": ("Pep Guardiola", "£1.5m"),
-    "Newcastle": ("Eddie Howe", "£1.5m"),
-    "Bournemouth": ("Andoni Iraola", "£1.1m"),
-    "Brighton": ("Fabian Hurzeler", "£1.1m"),
-    "Fulham": ("Marco Silva", "£1.1m"),
-    "Nottingham Forest": ("Nuno Espirito Santo", "£1.1m"),
-    "Spurs": ("Ange Postecoglou", "£1.1m"),
-    "Aston Villa": ("Unai Emery", "£0.8m"),
-    "Brentford": ("Thomas Frank", "£0.8m"),
-    "Crystal Palace": ("Oliver Glasner", "£0.8m"),
-    "Man Utd": ("Ruben Amorim", "£0.8m"),
-    "Wolves": ("Vitor Pereira", "£0.8m"),
-    "Everton": ("David Moyes", "£0.5m"),
-    "Ipswich": ("Kieran McKenna", "£0.5m"),
-    "Leicester": ("Ruud van Nistelrooy", "£0.5m"),
-    "Southampton": ("Ivan Juric", "£0.5m"),
-    "West Ham": ("Graham Potter", "£0.5m"),
-}
+# Default number of matches / history rows per page (the sidebar can change it)
+PAGE_SIZE = int(os.environ.get("AMP_PAGE_SIZE", "10"))
+
+# Sidebar pages, in navigation order
+PAGES = [
+    "Overall View",
+    "Gameweek Points",
+    "Team History",
+    "Chip Optimizer",
+    "Fixture Difficulty",
+    "What If",
+    "About",
+]
+
+
+# With AMP_LEAN_TYPES=1 the CSVs are read into int8/int16 columns and
+# categorical team names, so the cached frames take far less memory
+@st.cache_data
+def load_points_data():
+    if LEAN_TYPES:
+        return read_lean_csv(POINTS_FILE, "assistant_manager_points")
+    return pd.read_csv(POINTS_FILE)
+
+
+@st.cache_data
+def load_results_data():
+    if LEAN_TYPES:
+        return read_lean_csv(RESULTS_FILE, "results")
+    return pd.read_csv(RESULTS_FILE)
+
+
+@st.cache_data
+def load_fixture_matrix(modified_time):
+    # modified_time is only part of the cache key, so a pipeline run that
+    # rewrites the matrix is picked up without clearing the cache
+    return pd.read_csv(FIXTURE_MATRIX_FILE)
+
+
+@st.cache_data
+def load_upcoming_events(modified_time):
+    return pd.read_csv(UPCOMING_FIXTURES_FILE, usecols=["event"])["event"]
 
-# Custom CSS for a dark theme (including new “.stat-cards-container” and “.stat-card” classes)
-st.markdown(
+
+def get_final_event(last_event):
     """
-<style>
-
-/* Global dark background and light text */
-html, body, [class*="css"] {
-    font-family: 'Helvetica Neue', Arial, sans-serif !important;
-    font-size: 15px !important;
-    background-color: #1e1e1e !important; 
-    color: #eaeaea !important;
-}
+    The season's last gameweek: the latest one with a scheduled fixture, or
+    last_event (the latest played) when none are scheduled.
+    """
+    if not os.path.exists(UPCOMING_FIXTURES_FILE):
+        return last_event
+    events = load_upcoming_events(os.path.getmtime(UPCOMING_FIXTURES_FILE))
+    return max([last_event, *events.astype(int)])
 
-.block-container {
-    padding: 1rem 2rem;
-}
 
-/* Headings in white */
-h1, h2, h3, h4, h5, h6 {
-    color: #ffffff !important;
-}
+@st.cache_data
+def load_team_info(modified_time):
+    # The pipeline only rewrites the file when the metadata version changes,
+    # so its modification time is a cheap cache key
+    return TeamInfo(load_metadata(METADATA_FILE))
 
-/* Container for summary stat cards */
-.stat-cards-container {
-    display: flex;
-    flex-wrap: wrap;
-    gap: 20px;
-    margin-bottom: 20px;
-}
 
-/* Individual stat card */
-.stat-card {
-    background-color: #2b2b2b;
-    border: 1px solid #3a3a3a;
-    border-radius: 8px;
-    width: 220px;
-    min-height: 120px;
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-    justify-content: center;
-    padding: 15px;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.3);
-    text-align: center;
-}
+def get_team_info():
+    """
+    Logos and managers for this season, from the pipeline's FPL metadata
+    (the built-in ones until it has been fetched).
+    """
+    if not os.path.exists(METADATA_FILE):
+        return TeamInfo()
+    return load_team_info(os.path.getmtime(METADATA_FILE))
 
-.stat-icon {
-    font-size: 28px;
-    margin-bottom: 8px;
-}
 
-.stat-title {
-    font-weight: bold;
-    margin-bottom: 3px;
-    color: #fff;
-}
+@st.cache_resource
+def load_what_if(modified_time):
+    # Shared by all sessions, so gameweeks recomputed for one scenario are
+    # reused by the next; a pipeline run (new modified_time) starts afresh
+    return WhatIf.from_dir(os.path.join(BASE_DIR, "data"))
 
-.stat-value {
-    font-size: 18px;
-    font-weight: 500;
-    color: #eaeaea;
-}
 
-/* Team row container */
-.team-row {
-    display: flex;
-    align-items: center;
-    border-radius: 6px;
-    padding: 10px;
-    margin-bottom: 5px;
-    background-color: #2b2b2b;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.4);
-    color: #eaeaea !important;
-}
+def load_status():
+    """
+    The pipeline's last run status (or None if it has not written one).
+    """
+    if not os.path.exists(STATUS_FILE):
+        return None
+    with open(STATUS_FILE) as f:
+        return json.load(f)
 
-.team-row:nth-child(even) {
-    background-color: #3a3a3a;
-}
 
-.team-row div {
-    text-align: center;
-    flex: 1;
-}
+def display_match_result(match):
+    st.markdown(match_result_html(match, get_team_info()), unsafe_allow_html=True)
 
-/* The first column left-aligned for the team name + logo */
-.team-row div:first-child {
-    text-align: left !important;
-    display: flex;
-    align-items: center;
-}
 
-/* Header row styling */
-.header-row {
-    font-weight: bold;
-    background-color: #444444 !important; 
-    color: #ffffff !important;
-    margin-bottom: 10px;
-    border-radius: 6px;
-}
+# -------------------------------------------------------
+# Data access: each page asks only for the rows it shows
+# -------------------------------------------------------
+def get_overall_totals():
+    """
+    Total points, games played and table bonus per team, best first.
+    """
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.overall_totals(DB_FILE)
 
-.header-row div {
-    padding: 10px 0 !important;
-}
+    points_df = load_points_data()
+    totals = (
+        points_df.groupby("team", observed=True)
+        .agg(
+            total_points=("total_points", "sum"),
+            games_played=("event", "count"),
+            total_table_bonus=("total_table_bonus", "sum"),
+        )
+        .reset_index()
+    )
+    return totals.sort_values("total_points", ascending=False)
 
-/* Team logo adjustments */
-.team-logo {
-    width: 40px;
-    height: 40px;
-    object-fit: contain;
-    margin-right: 10px;
-    vertical-align: middle;
-}
 
-/* Match result container */
-.match-result {
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    background-color: #2b2b2b;
-    padding: 10px 20px;
-    border: 1px solid #3a3a3a;
-    border-radius: 8px;
-    margin-bottom: 10px;
-    gap: 20px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.4);
-    color: #eaeaea !important;
-}
+def get_events():
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.list_events(DB_FILE)
+    return sorted(load_points_data()["event"].unique())
 
-.home-team {
-    display: flex;
-    align-items: center;
-    justify-content: flex-start;
-    flex: 1;
-    gap: 5px;
-}
 
-.away-team {
-    display: flex;
-    align-items: center;
-    justify-content: flex-end;
-    flex: 1;
-    gap: 5px;
-}
+def get_teams():
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.list_teams(DB_FILE)
+    return sorted(load_points_data()["team"].unique())
 
-/* Score style */
-.match-score {
-    font-size: 1.2em;
-    font-weight: bold;
-    color: #ffffff;
-    width: 80px;
-    text-align: center;
-}
 
-/* DataFrame styling override for dark background */
-[data-testid="stDataFrame"] {
-    background-color: #2b2b2b !important;
-    color: #eaeaea !important;
-    border: 1px solid #3a3a3a !important;
-}
+def get_gameweek_breakdown(events):
+    """
+    Points per team summed over the selected gameweeks.
+    """
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.gameweek_breakdown(events, DB_FILE)
 
-.css-1nh1x9a svg { 
-    display: none; /* Hide row index icon in dataframes */
-}
+    points_df = load_points_data()
+    selected_event_points = points_df[points_df["event"].isin(events)]
+    return selected_event_points.groupby("team", as_index=False, observed=True).agg(
+        {
+            "total_points": "sum",
+            "total_win_points": "sum",
+            "total_goal_points": "sum",
+            "total_cs_points": "sum",
+            "total_table_bonus": "sum",
+        }
+    )
 
-/* Responsive design for mobile */
-@media (max-width: 768px) {
-    .stat-cards-container {
-        flex-direction: column;
-        align-items: center;
-    }
-    .stat-card {
-        width: 100%; /* Full width for smaller screens */
-    }
-    .team-row, .match-result {
-        flex-direction: column;
-        align-items: flex-start;
-        text-align: left;
-    }
-    .match-score {
-        width: auto;
-        text-align: left;
-    }
-    .block-container {
-        padding: 1rem;
-    }
-    h1, h2, h3 {
-        font-size: 1.5rem;
-    }
-}
 
-    .scrollable-container {
-        overflow-x: auto; /* Enable horizontal scrolling */
-        white-space: nowrap; /* Prevent wrapping of content */
-    }
-
-    .team-row, .header-row {
-        display: flex;
-        flex-wrap: nowrap; /* Prevent wrapping within rows */
-    }
-
-    .team-logo {
-        width: 40px;
-        height: 40px;
-        object-fit: contain;
-        margin-right: 10px;
-        vertical-align: middle;
-    }
-</style>
-""",
-    unsafe_allow_html=True,
-)
+def _page(df, limit, offset):
+    # The CSV backend slices in memory; the SQLite backend uses LIMIT/OFFSET
+    if limit is None:
+        return df
+    return df.iloc[offset : offset + limit]
 
 
-@st.cache_data
-def load_points_data():
-    return pd.read_csv(POINTS_FILE)
+def get_event_matches(events, limit=None, offset=0):
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.event_matches(events, DB_FILE, limit, offset)
+    results_df = load_results_data()
+    selected = results_df[results_df["event"].isin(events)]
+    return _page(selected.sort_values("event", kind="stable"), limit, offset)
 
 
-@st.cache_data
-def load_results_data():
-    return pd.read_csv(RESULTS_FILE)
+def count_event_matches(events):
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.count_event_matches(events, DB_FILE)
+    return int(load_results_data()["event"].isin(events).sum())
 
 
-def get_team_logo(team_name):
-    return TEAM_LOGOS.get(team_name, "https://via.placeholder.com/50")
+def get_team_history(team, limit=None, offset=0):
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.team_history(team, DB_FILE, limit, offset)
+    points_df = load_points_data()
+    history = points_df[points_df["team"] == team]
+    return _page(history.sort_values("event", kind="stable"), limit, offset)
 
 
-def get_manager_and_price(team_name):
-    return TEAM_MANAGER_DATA.get(team_name, ("N/A", "N/A"))
+def get_team_summary(team):
+    """
+    Games played and summed points columns for a team, as a dict.
+    """
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.team_summary(team, DB_FILE)
+    history = get_team_history(team)
+    summary = history.drop(columns=["event", "team"]).sum().to_dict()
+    return {"games_played": len(history), **summary}
 
 
-def display_match_result(match):
-    home_logo = get_team_logo(match["home"])
-    away_logo = get_team_logo(match["away"])
+def get_team_matches(team, limit=None, offset=0):
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.team_matches(team, DB_FILE, limit, offset)
+    results_df = load_results_data()
+    selected = results_df[(results_df["home"] == team) | (results_df["away"] == team)]
+    # Same order as the SQLite backend (event, then file order), so pages
+    # match whichever backend serves them
+    return _page(selected.sort_values("event", kind="stable"), limit, offset)
 
-    st.markdown(
-        f"""
-    <div class="match-result">
-        <div class="home-team">
-            <img src="{home_logo}" class="team-logo" alt="{match['home']} logo">
-            <span>{match['home']}</span>
-        </div>
-        <div class="match-score">
-            {match['home_score']} - {match['away_score']}
-        </div>
-        <div class="away-team">
-            <span>{match['away']}</span>
-            <img src="{away_logo}" class="team-logo" alt="{match['away']} logo">
-        </div>
-    </div>
-    """,
-        unsafe_allow_html=True,
-    )
 
+def count_team_matches(team):
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.count_team_matches(team, DB_FILE)
+    results_df = load_results_data()
+    return int(((results_df["home"] == team) | (results_df["away"] == team)).sum())
 
-def get_league_position(points_df, selected_team):
+
+def get_team_event_points():
     """
-    Simple helper to determine the league position based on total_points.
-    Ranks teams by descending total_points.
+    One row per (event, team) with that team's total points in the event.
     """
-    df = points_df.groupby("team")["total_points"].sum().reset_index()
-    df.columns = ["Team", "TotalPoints"]
-    df = df.sort_values("TotalPoints", ascending=False).reset_index(drop=True)
-    # Create a dictionary {team_name -> rank}
-    rank_dict = {row["Team"]: idx + 1 for idx, row in df.iterrows()}
-    return rank_dict.get(selected_team, "N/A")
+    if DATA_BACKEND == "sqlite":
+        return sqlite_store.team_event_points(DB_FILE)
+    points_df = load_points_data()
+    return points_df.groupby(["event", "team"], as_index=False, observed=True)[
+        "total_points"
+    ].sum()
 
 
-def main():
-    st.title("🏆 Assistant Manager Points Tracker")
+@st.cache_data
+def get_chip_standings(modified_time):
+    """
+    Cumulative AMP, chip rank and form per team per event, as precomputed by
+    the pipeline. Falls back to computing them once if the file is missing.
+    """
+    if modified_time is None:
+        return compute_chip_standings(get_team_event_points())
+    return load_chip_standings(CHIP_STANDINGS_FILE)
 
-    # Initialize session state for the page if it doesn't exist
-    if 'page' not in st.session_state:
-        st.session_state.page = "Overall View"  # Default page
 
-    # Sidebar for navigation
-    page = st.sidebar.radio(
-        "Navigate", 
-        ["Overall View", "Gameweek Points", "Team History", "About"],
-        index=["Overall View", "Gameweek Points", "Team History", "About"].index(st.session_state.page)
+def load_current_chip_standings():
+    # The file's modification time keys the cache, so new runs are picked up
+    modified_time = (
+        os.path.getmtime(CHIP_STANDINGS_FILE)
+        if os.path.exists(CHIP_STANDINGS_FILE)
+        else None
     )
+    return get_chip_standings(modified_time)
 
-    # Update session state with the selected page
-    if page != st.session_state.page:
-        st.session_state.page = page
-        st.rerun()
 
-    # Load data
-    points_df = load_points_data()
-    results_df = load_results_data()
+def get_league_position(chip_standings, selected_team):
+    """
+    The team's current chip position (teams level on points share a rank).
+    """
+    rank = current_rank(chip_standings, selected_team)
+    return "N/A" if rank is None else rank
 
-    if page == "Overall View":
-        st.subheader("Total Points by Club")
 
-        # Calculate total points and other statistics for each team
-        team_stats = (
-            points_df.groupby("team")
-            .agg({"total_points": "sum", "event": "count", "total_table_bonus": "sum"})
-            .reset_index()
+def page_slice(total_rows, key):
+    """
+    Page picker for a list of total_rows. Returns (limit, offset) of the
+    page being shown, so callers only load and render that slice.
+    """
+    page_size = st.session_state.get("page_size", PAGE_SIZE)
+    pages = max(math.ceil(total_rows / page_size), 1)
+    page = 1
+    if pages > 1:
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key
         )
+    offset = (page - 1) * page_size
+    if total_rows:
+        st.caption(
+            f"Showing {offset + 1}-{min(offset + page_size, total_rows)} "
+            f"of {total_rows}"
+        )
+    return page_size, offset
+
+
+@st.fragment
+def show_match_list(total_rows, load_page, key, event_headers=False):
+    """
+    One page of match results as cards. load_page(limit, offset) returns
+    the matches on the page. A fragment, so turning the page reruns only
+    the list and not the page around it.
+    """
+    limit, offset = page_slice(total_rows, key)
+    current_event = None
+    for _, match in load_page(limit, offset).iterrows():
+        if event_headers and match["event"] != current_event:
+            current_event = match["event"]
+            st.subheader(f"Match Results for Gameweek {current_event}")
+        display_match_result(match)
+
 
-        team_stats.columns = [
-            "Team",
+@st.fragment
+def show_team_history_table(team, total_rows):
+    """
+    One page of a team's points history.
+    """
+    limit, offset = page_slice(total_rows, f"history_page_{team}")
+    team_history = get_team_history(team, limit, offset).rename(
+        columns={"total_points": "Total Points"}
+    )
+    team_history_display = team_history[
+        [
+            "event",
             "Total Points",
-            "Games Played",
-            "Total Table Bonus",
+            "total_win_points",  # Win Points
+            "total_draw_points",  # Draw Points
+            "total_goal_points",  # Goal Points
+            "total_cs_points",  # Clean Sheet
+            "total_table_bonus",  # Table Bonus
         ]
-        team_stats["Avg Points"] = (
-            team_stats["Total Points"] / team_stats["Games Played"]
-        )
-        team_stats = team_stats.sort_values("Total Points", ascending=False)
-        team_stats["Logo"] = team_stats["Team"].apply(get_team_logo)
-
-        # Header row
+    ].reset_index(drop=True)
+    st.dataframe(team_history_display, hide_index=True, use_container_width=True)
+
+
+# -------------------------------------------------------
+# Pages
+# -------------------------------------------------------
+# Pages whose widgets only affect their own content are fragments: changing a
+# gameweek, team or optimizer input reruns that page alone, not the whole
+# script (CSS, navigation and status banner included).
+def show_overall_view():
+    st.subheader("Total Points by Club")
+
+    # Total points and other statistics for each team
+    team_stats = get_overall_totals()
+
+    team_stats.columns = [
+        "Team",
+        "Total Points",
+        "Games Played",
+        "Total Table Bonus",
+    ]
+    team_stats["Avg Points"] = team_stats["Total Points"] / team_stats["Games Played"]
+    team_stats = team_stats.sort_values("Total Points", ascending=False)
+
+    # Header row
+    st.markdown(OVERALL_HEADER_HTML, unsafe_allow_html=True)
+
+    # Display team rows inside the scrollable container
+    st.markdown('<div class="scrollable-container">', unsafe_allow_html=True)
+    team_info = get_team_info()
+    for _, row in team_stats.iterrows():
         st.markdown(
-            """
-         <div class="scrollable-container">
-        <div class="team-row header-row">
-            <div>Team</div>
-            <div>Manager</div>
-            <div>Price</div>
-            <div>Total Points</div>
-            <div>Games Played</div>
-            <div>Avg Points</div>
-            <div>Total Table Bonus</div>
-        </div>
-        </div>
-        """,
+            team_row_html(
+                row["Team"],
+                row["Total Points"],
+                row["Games Played"],
+                row["Avg Points"],
+                row["Total Table Bonus"],
+                team_info,
+            ),
             unsafe_allow_html=True,
         )
+    st.markdown("</div>", unsafe_allow_html=True)
 
-        # Display team rows
-        # Display team rows inside the scrollable container
-        st.markdown('<div class="scrollable-container">', unsafe_allow_html=True)
-        for _, row in team_stats.iterrows():
-            manager, price = get_manager_and_price(row["Team"])
-            st.markdown(
-                f"""
-            <div class="team-row">
-                <div>
-                    <img src="{row['Logo']}" class="team-logo">
-                    {row['Team']}
-                </div>
-                <div>{manager}</div>
-                <div>{price}</div>
-                <div>{int(row['Total Points'])}</div>
-                <div>{int(row['Games Played'])}</div>
-                <div>{row['Avg Points']:.1f}</div>
-                <div>{int(row['Total Table Bonus'])}</div>
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-        st.markdown("</div>", unsafe_allow_html=True)
 
-    elif page == "Gameweek Points":
-        # 1. Collect all events and allow multi-selection
-        all_events = sorted(points_df["event"].unique())
+@st.fragment
+def show_gameweek_points():
+    # 1. Collect all events and allow multi-selection
+    all_events = get_events()
 
-        # Set default selection to [1], if 1 exists in all_events
-        default_selection = all_events[-1]
+    # Set default selection to [1], if 1 exists in all_events
+    default_selection = all_events[-1]
 
-        selected_events = st.multiselect(
-            "Select Gameweek(s)", all_events, default=default_selection
-        )
+    selected_events = st.multiselect(
+        "Select Gameweek(s)", all_events, default=default_selection
+    )
 
-        # 2. Stop if no events selected
-        if not selected_events:
-            st.warning("No Gameweek selected. Please pick at least one gameweek.")
-            st.stop()
-
-        # 3. Filter the points dataframe to only the selected events
-        selected_event_points = points_df[
-            points_df["event"].isin(selected_events)
-        ].copy()
-        selected_event_points["Total Points"] = selected_event_points["total_points"]
-
-        # 4. Group by team and sum across all selected events
-        aggregated_points = (
-            selected_event_points.groupby("team", as_index=False)
-            .agg(
-                {
-                    "total_points": "sum",
-                    "total_win_points": "sum",
-                    "total_goal_points": "sum",
-                    "total_cs_points": "sum",
-                    "total_table_bonus": "sum",
-                }
+    # 2. Stop if no events selected
+    if not selected_events:
+        st.warning("No Gameweek selected. Please pick at least one gameweek.")
+        return
+
+    # 3-4. Sum each team's points across all selected events
+    aggregated_points = get_gameweek_breakdown(selected_events).rename(
+        columns={"total_points": "Total Points"}
+    )
+
+    # 5. Display a table of aggregated points
+    event_list_str = ", ".join(map(str, selected_events))
+    st.subheader(f"Assistant Points for Gameweek(s) {event_list_str}")
+    st.dataframe(
+        aggregated_points[
+            [
+                "team",
+                "Total Points",
+                "total_win_points",
+                "total_goal_points",
+                "total_cs_points",
+                "total_table_bonus",
+            ]
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    # 6. Display match results event by event, one page at a time
+    show_match_list(
+        count_event_matches(selected_events),
+        lambda limit, offset: get_event_matches(selected_events, limit, offset),
+        key=f"matches_page_{event_list_str}",
+        event_headers=True,
+    )
+
+
+@st.fragment
+def show_team_history():
+    # 1. Choose Team
+    teams = get_teams()
+    selected_team = st.selectbox("Select Team", teams)
+
+    # 2-3. Key aggregates (summed by the backend, not from the full history)
+    summary = get_team_summary(selected_team)
+    sum_total_points = int(summary["total_points"])
+    games_played = int(summary["games_played"])
+    average_points = sum_total_points / games_played if games_played else 0
+
+    sum_win_points = int(summary["total_win_points"])  # e.g. for win
+    sum_draw_points = int(summary["total_draw_points"])  # e.g. for draw
+    sum_match_points = sum_win_points + sum_draw_points
+    sum_goal_points = int(summary["total_goal_points"])
+    sum_clean_sheet_points = int(summary["total_cs_points"])
+    sum_table_bonus_points = int(summary["total_table_bonus"])
+
+    chip_standings = load_current_chip_standings()
+    current_league_position = get_league_position(chip_standings, selected_team)
+
+    # 4. Display Team Header (logo + name)
+    st.markdown(
+        team_header_html(selected_team, get_team_info()), unsafe_allow_html=True
+    )
+
+    # 5. Metrics Layout (two rows)
+    # -- First row of 4 metrics --
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Points", sum_total_points)
+    col2.metric("Avg Points", f"{average_points:.1f}")
+    col3.metric("Games Played", games_played)
+    col4.metric("Chip Position", current_league_position)
+
+    # -- Second row of 4 metrics --
+    col5, col6, col7, col8 = st.columns(4)
+    col5.metric("Match Points", sum_match_points)
+    col6.metric("Goal Points", sum_goal_points)
+    col7.metric("Clean Sheet Points", sum_clean_sheet_points)
+    col8.metric("Table Bonus", sum_table_bonus_points)
+
+    # 6. Points History Table (one row per game, so paged like the matches)
+    st.subheader(f"Points History for {selected_team}")
+    show_team_history_table(selected_team, games_played)
+
+    # 7. Chip position and form over time
+    series = team_series(chip_standings, selected_team)
+    if not series.empty:
+        st.subheader(f"Chip Position & Form for {selected_team}")
+        series = series.set_index("event")
+        rank_col, form_col = st.columns(2)
+        rank_col.markdown("**Chip position (1 = best)**")
+        rank_col.line_chart(series[["rank"]])
+        form_col.markdown("**Points over the last N gameweeks**")
+        form_col.line_chart(
+            series[[f"form_{window}" for window in FORM_WINDOWS]].rename(
+                columns={f"form_{window}": f"Last {window}" for window in FORM_WINDOWS}
             )
-            .rename(columns={"total_points": "Total Points"})
         )
 
-        # 5. Display a table of aggregated points
-        event_list_str = ", ".join(map(str, selected_events))
-        st.subheader(f"Assistant Points for Gameweek(s) {event_list_str}")
-        st.dataframe(
-            aggregated_points[
-                [
-                    "team",
-                    "Total Points",
-                    "total_win_points",
-                    "total_goal_points",
-                    "total_cs_points",
-                    "total_table_bonus",
-                ]
-            ],
-            hide_index=True,
-            use_container_width=True,
+    # 8. Match Results
+    st.subheader(f"Match Results for {selected_team}")
+    show_match_list(
+        count_team_matches(selected_team),
+        lambda limit, offset: get_team_matches(selected_team, limit, offset),
+        key=f"matches_page_{selected_team}",
+    )
+
+
+@st.fragment
+def show_chip_optimizer():
+    st.subheader("Assistant Manager Chip Optimizer")
+
+    # 1. Inputs: budget, chip length and optional projected gameweeks
+    amp_df = get_team_event_points()
+    team_info = get_team_info()
+    prices = {team: price for team, (_, price) in team_info.managers.items()}
+    last_event = int(amp_df["event"].max())
+    final_event = get_final_event(last_event)
+
+    col1, col2, col3 = st.columns(3)
+    budget = col1.select_slider(
+        "Budget",
+        options=[round(0.5 + 0.1 * i, 1) for i in range(11)],
+        value=1.5,
+        format_func=lambda b: f"£{b:.1f}m",
+    )
+    window_length = col2.selectbox(
+        "Gameweeks per pick",
+        [CHIP_WINDOW, 1],
+        format_func=lambda n: "Single gameweek" if n == 1 else f"{n}-gameweek chip",
+    )
+    projected_events = col3.number_input(
+        "Projected gameweeks",
+        min_value=0,
+        max_value=final_event - last_event,
+        value=0,
+        help="Extend the search with each team's average over its last 5 gameweeks.",
+    )
+    if projected_events:
+        future_events = range(last_event + 1, last_event + 1 + projected_events)
+        amp_df = pd.concat(
+            [amp_df, project_amp(amp_df, future_events)], ignore_index=True
         )
 
-        # 6. Display match results event by event
-        for ev in sorted(selected_events):
-            st.subheader(f"Match Results for Gameweek {ev}")
-            matches_for_this_event = results_df[results_df["event"] == ev]
-            for _, match in matches_for_this_event.iterrows():
-                display_match_result(match)
-
-    elif page == "Team History":
-        # 1. Choose Team
-        teams = sorted(points_df["team"].unique())
-        selected_team = st.selectbox("Select Team", teams)
-
-        # 2. Filter and preprocess the team data
-        team_history = points_df[points_df["team"] == selected_team].copy()
-        team_history["Total Points"] = team_history["total_points"]
-
-        # 3. Calculate key aggregates
-        sum_total_points = team_history["total_points"].sum()
-        games_played = len(team_history)
-        average_points = sum_total_points / games_played if games_played else 0
-
-        sum_win_points = team_history["total_win_points"].sum()  # e.g. for win
-        sum_draw_points = team_history["total_draw_points"].sum()  # e.g. for draw
-        sum_match_points = sum_win_points + sum_draw_points
-        sum_goal_points = team_history["total_goal_points"].sum()
-        sum_clean_sheet_points = team_history["total_cs_points"].sum()
-        sum_table_bonus_points = team_history["total_table_bonus"].sum()
-
-        current_league_position = get_league_position(points_df, selected_team)
-
-        # 4. Display Team Header (logo + name)
-        logo_url = get_team_logo(selected_team)
-        st.markdown(
-            f"""
-        <div style="display: flex; align-items: center; margin-bottom: 20px;">
-            <img src="{logo_url}" style="width: 50px; height: 50px; margin-right: 15px; object-fit: contain;">
-            <h2 style="margin: 0; color: #ffffff;">{selected_team}</h2>
-        </div>
-        """,
-            unsafe_allow_html=True,
+    # 2. Best pick for every window at this budget
+    picks = best_picks(amp_df, prices, [budget], [window_length])
+    picks = picks.sort_values(["points", "points_per_m"], ascending=False)
+    picks["Gameweeks"] = picks.apply(
+        lambda row: (
+            f"GW{row['start_event']}"
+            if row["window_length"] == 1
+            else f"GW{row['start_event']}-{row['end_event']}"
+        ),
+        axis=1,
+    )
+    picks["Manager"] = picks["team"].map(
+        lambda team: team_info.manager_and_price(team)[0]
+    )
+    picks["Projected"] = picks["end_event"] > last_event
+
+    st.markdown(f"**Best picks for £{budget:.1f}m**")
+    st.dataframe(
+        picks[
+            [
+                "Gameweeks",
+                "team",
+                "Manager",
+                "price",
+                "points",
+                "points_per_m",
+                "Projected",
+            ]
+        ].rename(
+            columns={
+                "team": "Team",
+                "price": "Price (£m)",
+                "points": "Points",
+                "points_per_m": "Points per £m",
+            }
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    # 3. Points per £m over a chosen range of gameweeks
+    first_event = int(amp_df["event"].min())
+    final_event = int(amp_df["event"].max())
+    range_start, range_end = st.slider(
+        "Value ranking gameweeks",
+        min_value=first_event,
+        max_value=final_event,
+        value=(first_event, final_event),
+    )
+    rankings = value_rankings(amp_df, prices, range_start, range_end)
+    st.markdown(f"**Points per £m, Gameweeks {range_start}-{range_end}**")
+    st.dataframe(
+        rankings.rename(
+            columns={
+                "team": "Team",
+                "total_points": "Points",
+                "price": "Price (£m)",
+                "points_per_m": "Points per £m",
+            }
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+@st.fragment
+def show_fixture_difficulty():
+    st.subheader("Upcoming Fixtures & Table Bonus")
+
+    if not os.path.exists(FIXTURE_MATRIX_FILE):
+        st.info("No upcoming fixtures yet. Run the data pipeline to build them.")
+        return
+
+    matrix = load_fixture_matrix(os.path.getmtime(FIXTURE_MATRIX_FILE))
+    if matrix.empty:
+        st.info("There are no upcoming fixtures left this season.")
+        return
+
+    # 1. Choose how far ahead to look
+    upcoming_events = sorted(matrix["event"].unique())
+    gameweeks_ahead = 1
+    if len(upcoming_events) > 1:
+        gameweeks_ahead = st.slider(
+            "Gameweeks ahead",
+            min_value=1,
+            max_value=len(upcoming_events),
+            value=min(6, len(upcoming_events)),
         )
+    window = matrix[matrix["event"].isin(upcoming_events[:gameweeks_ahead])]
+
+    # 2. Heatmap of opponents and position gaps
+    st.markdown(render_fixture_heatmap(window, get_team_info()), unsafe_allow_html=True)
+    st.caption(
+        "Gap = your position minus the opponent's in the current table. "
+        "Red: opponent higher, green: opponent lower. A gold outline marks "
+        "fixtures where the table bonus (opponent 5+ places higher) applies."
+    )
+
 
-        # 5. Metrics Layout (two rows)
-        # -- First row of 4 metrics --
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Total Points", sum_total_points)
-        col2.metric("Avg Points", f"{average_points:.1f}")
-        col3.metric("Games Played", games_played)
-        col4.metric("Chip Position", current_league_position)
-
-        # -- Second row of 4 metrics --
-        col5, col6, col7, col8 = st.columns(4)
-        col5.metric("Match Points", sum_match_points)
-        col6.metric("Goal Points", sum_goal_points)
-        col7.metric("Clean Sheet Points", sum_clean_sheet_points)
-        col8.metric("Table Bonus", sum_table_bonus_points)
-
-        # 6. Points History Table
-        st.subheader(f"Points History for {selected_team}")
-        team_history_display = team_history[
+@st.fragment
+def show_what_if():
+    st.subheader("What If?")
+    st.caption(
+        "Change match results to see how the standings and Assistant Manager "
+        "Points would have turned out. The published data is not changed."
+    )
+
+    what_if_files = [RESULTS_FILE, LEAGUE_TABLE_FILE, POINTS_FILE]
+    if not all(os.path.exists(path) for path in what_if_files):
+        st.info("No league table yet. Run the data pipeline to build it.")
+        return
+    what_if = load_what_if(max(os.path.getmtime(path) for path in what_if_files))
+
+    # (event, home, away) -> (home_score, away_score), kept for the session
+    overrides = st.session_state.setdefault("what_if_overrides", {})
+
+    # 1. Pick a match and its new score
+    col1, col2 = st.columns([1, 3])
+    event = col1.selectbox("Gameweek", what_if.events, index=len(what_if.events) - 1)
+    matches = what_if.matches_by_event[event]
+    match = matches.iloc[
+        col2.selectbox(
+            "Match",
+            range(len(matches)),
+            format_func=lambda i: (
+                f"{matches['home'][i]} {matches['home_score'][i]}-"
+                f"{matches['away_score'][i]} {matches['away'][i]}"
+            ),
+        )
+    ]
+    match_key = (event, match["home"], match["away"])
+
+    col1, col2, col3 = st.columns(3)
+    home_score = col1.number_input(
+        f"{match['home']} goals",
+        min_value=0,
+        max_value=20,
+        value=int(match["home_score"]),
+        key=f"what_if_home_{match_key}",
+    )
+    away_score = col2.number_input(
+        f"{match['away']} goals",
+        min_value=0,
+        max_value=20,
+        value=int(match["away_score"]),
+        key=f"what_if_away_{match_key}",
+    )
+    if col3.button("Add override", use_container_width=True):
+        overrides[match_key] = (int(home_score), int(away_score))
+    if col3.button("Clear overrides", use_container_width=True):
+        overrides.clear()
+
+    if not overrides:
+        st.info("Add an override to see its effect.")
+        return
+
+    # 2. The overrides in this scenario
+    st.markdown("**Overrides**")
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "Gameweek": ev,
+                    "Match": f"{home} v {away}",
+                    "What If": f"{scores[0]}-{scores[1]}",
+                }
+                for (ev, home, away), scores in sorted(overrides.items())
+            ]
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    # 3. Their effect on the final table and on AMP
+    effect = what_if.compare([key + scores for key, scores in overrides.items()])
+    recomputed = effect["recomputed_events"]
+    st.caption(
+        f"Recomputed gameweeks {recomputed[0]}-{recomputed[-1]}; "
+        "every other gameweek is as published."
+    )
+
+    col1, col2 = st.columns(2)
+    col1.markdown("**Final League Table**")
+    col1.dataframe(
+        effect["standings"][
+            ["position", "position_change", "team_name", "points", "points_change"]
+        ].rename(
+            columns={
+                "position": "Position",
+                "position_change": "Places",
+                "team_name": "Team",
+                "points": "Points",
+                "points_change": "Change",
+            }
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+    col2.markdown("**Assistant Manager Points**")
+    col2.dataframe(
+        effect["amp_totals"].rename(
+            columns={
+                "team": "Team",
+                "total_points": "Points",
+                "total_points_published": "Published",
+                "points_change": "Change",
+            }
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    st.markdown("**Changed Gameweek Points**")
+    st.dataframe(
+        effect["amp_changes"][
             [
                 "event",
-                "Total Points",
-                "total_win_points",  # Win Points
-                "total_draw_points",  # Draw Points
-                "total_goal_points",  # Goal Points
-                "total_cs_points",  # Clean Sheet
-                "total_table_bonus",  # Table Bonus
+                "team",
+                "total_points",
+                "total_points_published",
+                "total_table_bonus",
+                "total_table_bonus_published",
             ]
-        ].reset_index(drop=True)
-        st.dataframe(team_history_display, hide_index=True, use_container_width=True)
-
-        # 7. Match Results
-        st.subheader(f"Match Results for {selected_team}")
-        team_matches = results_df[
-            (results_df["home"] == selected_team)
-            | (results_df["away"] == selected_team)
-        ]
+        ].rename(
+            columns={
+                "event": "Gameweek",
+                "team": "Team",
+                "total_points": "Points",
+                "total_points_published": "Published",
+                "total_table_bonus": "Table Bonus",
+                "total_table_bonus_published": "Published Bonus",
+            }
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
 
-        for _, match in team_matches.iterrows():
-            display_match_result(match)
 
-    elif page == "About":
-        st.subheader("About Assistant Manager Points Tracker")
-        st.markdown(
-            """
-        This application helps track assistant manager points across different events in the league.
-        
-        **Features:**
-        - View overall points by club (including manager & price)
-        - View points for each event
-        - Explore a team's points history (now displayed using Streamlit's metric widgets!)
-        - See match results
-        
-        **Points are calculated based on:**
-        - Win Points
-        - Goal Points
-        - Clean Sheet Points
-        - Table Bonus Points
-        """
+def show_about():
+    st.subheader("About Assistant Manager Points Tracker")
+    st.markdown("""
+    This application helps track assistant manager points across different events in the league.
+
+    **Features:**
+    - View overall points by club (including manager & price)
+    - View points for each event
+    - Explore a team's points history (now displayed using Streamlit's metric widgets!)
+    - See match results
+
+    **Points are calculated based on:**
+    - Win Points
+    - Goal Points
+    - Clean Sheet Points
+    - Table Bonus Points
+    """)
+
+    # Memory held by the cached data (only the CSV backend keeps it loaded)
+    if DATA_BACKEND == "csv":
+        footprint = memory_footprint(
+            {
+                "assistant_manager_points": load_points_data(),
+                "results": load_results_data(),
+            }
+        )
+        with st.expander("Data memory usage"):
+            st.dataframe(
+                pd.DataFrame(
+                    {"frame": list(footprint), "bytes": list(footprint.values())}
+                ),
+                hide_index=True,
+            )
+            st.caption(
+                f"Compact dtypes are {'on' if LEAN_TYPES else 'off'} "
+                "(set AMP_LEAN_TYPES=1 to enable them)."
+            )
+
+
+PAGE_VIEWS = {
+    "Overall View": show_overall_view,
+    "Gameweek Points": show_gameweek_points,
+    "Team History": show_team_history,
+    "Chip Optimizer": show_chip_optimizer,
+    "Fixture Difficulty": show_fixture_difficulty,
+    "What If": show_what_if,
+    "About": show_about,
+}
+
+
+def main():
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.title("🏆 Assistant Manager Points Tracker")
+
+    # Warn when the last refresh had to fall back to cached fixtures
+    status = load_status()
+    if status and status.get("stale"):
+        st.warning(
+            f"The FPL API was unavailable during the last refresh. Showing data "
+            f"fetched at {status['fetched_at']}."
         )
 
+    # Sidebar for navigation. The radio's key keeps the selected page in
+    # st.session_state, so a page switch is rendered in the same run.
+    page = st.sidebar.radio("Navigate", PAGES, key="page")
+    st.sidebar.number_input(
+        "Rows per page",
+        min_value=5,
+        max_value=200,
+        value=PAGE_SIZE,
+        step=5,
+        key="page_size",
+    )
+    PAGE_VIEWS[page]()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,173 @@
+import os
+import json
+import logging
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from query_api import DATA_FILES, data_version, records
+
+logger = logging.getLogger(__name__)
+
+# One JSON object per line, appended once per pipeline run that changed data
+CHANGELOG_FILE = "changes.jsonl"
+
+# Columns identifying a row in each output
+FRAME_KEYS = {
+    "results": ["event", "home", "away"],
+    "league_table": ["event", "team_name"],
+    "assistant_manager_points": ["event", "team"],
+}
+
+# Columns naming the teams touched by a row in each output
+TEAM_COLUMNS = {
+    "results": ["home", "away"],
+    "league_table": ["team_name"],
+    "assistant_manager_points": ["team"],
+}
+
+
+def load_snapshot(data_dir):
+    """
+    Read the outputs as they are on disk *before* this run overwrites them.
+    Missing files (first run) come back as empty DataFrames.
+    """
+    snapshot = {}
+    for name, file_name in DATA_FILES.items():
+        path = os.path.join(data_dir, file_name)
+        snapshot[name] = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame()
+    return snapshot
+
+
+def _with_occurrence(df, keys):
+    # A team can play twice in one event (double gameweeks), so number
+    # repeated keys to keep every row addressable.
+    df = df.copy()
+    df["_n"] = df.groupby(keys, observed=True).cumcount()
+    return df
+
+
+def diff_frame(old_df, new_df, keys):
+    """
+    Compare two versions of an output.
+
+    Returns (added, modified, removed): the new rows whose key did not exist
+    before, the new rows whose values changed, and the keys that disappeared.
+    """
+    value_cols = [c for c in new_df.columns if c not in keys]
+    if old_df.empty:
+        return new_df, new_df.iloc[0:0], pd.DataFrame(columns=keys)
+
+    new_df = _with_occurrence(new_df, keys)
+    old_df = _with_occurrence(
+        old_df[keys + [c for c in value_cols if c in old_df.columns]], keys
+    )
+    merged = new_df.merge(
+        old_df, on=keys + ["_n"], how="outer", suffixes=("", "_old"), indicator=True
+    )
+
+    # A row is modified when any value column differs from the old file.
+    # A value missing on both sides (e.g. no kickoff time yet) is unchanged.
+    changed = pd.Series(False, index=merged.index)
+    for col in value_cols:
+        if f"{col}_old" in merged.columns:
+            new, old = merged[col], merged[f"{col}_old"]
+            changed |= ~(new.eq(old) | (new.isna() & old.isna()))
+        else:
+            changed |= True
+
+    new_cols = keys + value_cols
+    dtypes = new_df[new_cols].dtypes.to_dict()
+    added = merged.loc[merged["_merge"] == "left_only", new_cols].astype(dtypes)
+    modified = merged.loc[(merged["_merge"] == "both") & changed, new_cols].astype(
+        dtypes
+    )
+    removed = merged.loc[merged["_merge"] == "right_only", keys]
+    return added, modified, removed
+
+
+def build_entry(version, previous, current):
+    """
+    Build one changelog entry from the old and new versions of every output.
+    Returns None when nothing changed.
+    """
+    changes = {}
+    events = set()
+    teams = set()
+
+    for name, new_df in current.items():
+        keys = FRAME_KEYS[name]
+        added, modified, removed = diff_frame(previous.get(name), new_df, keys)
+        if added.empty and modified.empty and removed.empty:
+            continue
+
+        changes[name] = {
+            "added": records(added),
+            "modified": records(modified),
+            "removed": records(removed),
+        }
+        for df in (added, modified, removed):
+            events.update(int(ev) for ev in df["event"])
+            for col in TEAM_COLUMNS[name]:
+                teams.update(df[col])
+
+    if not changes:
+        return None
+
+    return {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "events": sorted(events),
+        "teams": sorted(teams),
+        "changes": changes,
+    }
+
+
+def _entries(feed_file):
+    # Entries written before seq was added are numbered by their line
+    with open(feed_file) as f:
+        for number, line in enumerate(f, start=1):
+            entry = json.loads(line)
+            entry.setdefault("seq", number)
+            yield entry
+
+
+def record_changes(data_dir, previous, current):
+    """
+    Diff this run's outputs against the previous files and append the
+    result to the change feed. Returns the entry (or None if unchanged).
+
+    Entries are numbered with an increasing seq. The version is a content
+    hash and repeats when data reverts, so consumers resume from seq.
+    """
+    paths = [os.path.join(data_dir, file_name) for file_name in DATA_FILES.values()]
+    entry = build_entry(data_version(paths), previous, current)
+
+    feed_file = os.path.join(data_dir, CHANGELOG_FILE)
+    if entry is None:
+        logger.info("No changes since the previous run")
+        return None
+
+    last_seq = max((logged["seq"] for logged in iter_changes(feed_file)), default=0)
+    entry = {"seq": last_seq + 1, **entry}
+
+    with open(feed_file, "a") as f:
+        f.write(json.dumps(entry, allow_nan=False) + "\n")
+    logger.info(
+        f"Recorded change {entry['seq']} for version {entry['version']} "
+        f"(events {entry['events']}) in {feed_file}"
+    )
+    return entry
+
+
+def iter_changes(feed_file, after_seq=None):
+    """
+    Yield changelog entries in order, optionally only those written after
+    after_seq (the seq of the last entry a consumer has applied).
+    """
+    if not os.path.exists(feed_file):
+        return
+
+    for entry in _entries(feed_file):
+        if after_seq is None or entry["seq"] > after_seq:
+            yield entry
@@ -0,0 +1,147 @@
+import re
+import numpy as np
+import pandas as pd
+
+# The assistant manager chip is active for three consecutive gameweeks
+CHIP_WINDOW = 3
+
+
+def parse_price(price):
+    """
+    Turn a display price such as "£1.5m" into a float (1.5).
+    """
+    if isinstance(price, (int, float)):
+        return float(price)
+    match = re.search(r"[\d.]+", str(price))
+    return float(match.group()) if match else np.nan
+
+
+def build_amp_matrix(amp_df):
+    """
+    Pivot AMP rows into a (teams x events) matrix.
+
+    Events run consecutively from the first to the last event in amp_df, so
+    column offsets are gameweek offsets: a team with no fixture in an event
+    (blank gameweek) scores 0 there, and double gameweeks are summed.
+
+    Returns (teams, events, matrix).
+    """
+    pivot = amp_df.pivot_table(
+        index="team",
+        columns="event",
+        values="total_points",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True,
+    )
+    events = np.arange(int(pivot.columns.min()), int(pivot.columns.max()) + 1)
+    pivot = pivot.reindex(columns=events, fill_value=0)
+    return list(pivot.index), events, pivot.to_numpy(dtype=float)
+
+
+def window_sums(matrix, length):
+    """
+    Sum of every run of `length` consecutive events, for every team at once.
+    Column j of the result covers events j..j+length-1.
+    """
+    cumulative = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+    np.cumsum(matrix, axis=1, out=cumulative[:, 1:])
+    return cumulative[:, length:] - cumulative[:, :-length]
+
+
+def project_amp(amp_df, future_events, form_window=5):
+    """
+    Projected AMP for future events: each team's average over its last
+    `form_window` events, repeated for every event in future_events.
+    """
+    per_event = (
+        amp_df.groupby(["team", "event"], as_index=False, observed=True)["total_points"]
+        .sum()
+        .sort_values("event")
+    )
+    form = per_event.groupby("team", observed=True)["total_points"].apply(
+        lambda points: points.tail(form_window).mean()
+    )
+    return pd.DataFrame(
+        [
+            {"event": event, "team": team, "total_points": points}
+            for event in future_events
+            for team, points in form.items()
+        ]
+    )
+
+
+def best_picks(amp_df, prices, budgets, window_lengths=(1, CHIP_WINDOW)):
+    """
+    Best assistant manager pick for every (window, budget) combination.
+
+    Each window length is handled with one vectorised pass: window sums are
+    (teams x windows), an affordability mask is (budgets x teams), and the
+    masked argmax over teams gives the best pick for all budgets and all
+    windows at once.
+
+    prices maps team -> price (e.g. 1.5 or "£1.5m"); teams without a price
+    are not eligible. Returns one row per window length, start event and
+    budget.
+    """
+    teams, events, matrix = build_amp_matrix(amp_df)
+    team_prices = np.array([parse_price(prices.get(team, np.nan)) for team in teams])
+    budgets = np.asarray(sorted(budgets), dtype=float)
+
+    # (budgets x teams): which managers each budget can afford
+    affordable = team_prices[None, :] <= budgets[:, None] + 1e-9
+
+    frames = []
+    for length in window_lengths:
+        if length > len(events):
+            continue
+        sums = window_sums(matrix, length)  # (teams x windows)
+        masked = np.where(affordable[:, :, None], sums[None, :, :], -np.inf)
+        best = masked.argmax(axis=1)  # (budgets x windows)
+        best_points = np.take_along_axis(masked, best[:, None, :], axis=1)[:, 0, :]
+
+        n_budgets, n_windows = best.shape
+        frame = pd.DataFrame(
+            {
+                "window_length": length,
+                "start_event": np.tile(events[:n_windows], n_budgets),
+                "end_event": np.tile(events[:n_windows] + length - 1, n_budgets),
+                "budget": np.repeat(budgets, n_windows),
+                "team": np.asarray(teams, dtype=object)[best.ravel()],
+                "points": best_points.ravel(),
+                "price": team_prices[best.ravel()],
+            }
+        )
+        # Budgets below the cheapest manager have no valid pick
+        frames.append(frame[np.isfinite(frame["points"])])
+
+    if not frames:
+        return pd.DataFrame(
+            columns=[
+                "window_length",
+                "start_event",
+                "end_event",
+                "budget",
+                "team",
+                "points",
+                "price",
+                "points_per_m",
+            ]
+        )
+    picks = pd.concat(frames, ignore_index=True)
+    picks["points_per_m"] = picks["points"] / picks["price"]
+    return picks
+
+
+def value_rankings(amp_df, prices, first_event, last_event):
+    """
+    Rank every priced manager by points per £m over first_event..last_event.
+    """
+    window = amp_df[amp_df["event"].between(first_event, last_event)]
+    totals = window.groupby("team", as_index=False, observed=True)["total_points"].sum()
+    totals["price"] = totals["team"].map(lambda team: parse_price(prices.get(team)))
+    totals = totals.dropna(subset=["price"])
+    totals["points_per_m"] = totals["total_points"] / totals["price"]
+    return totals.sort_values(
+        ["points_per_m", "total_points"], ascending=False
+    ).reset_index(drop=True)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from chip_optimizer import build_amp_matrix
+
+STANDINGS_FILE = "chip_standings.npz"
+
+# Rolling form windows (in gameweeks)
+FORM_WINDOWS = (3, 5, 10)
+
+
+def compute_chip_standings(amp_df):
+    """
+    Cumulative AMP, chip rank and rolling form for every team at every event.
+
+    All series are (teams x events) arrays over consecutive events. Ranks are
+    tie-aware: teams level on points share the best rank ("1, 2, 2, 4").
+    Form over k gameweeks is the AMP scored in the last k events up to and
+    including each event.
+    """
+    teams, events, matrix = build_amp_matrix(amp_df)
+    points = np.rint(matrix).astype(np.int32)
+    cumulative = points.cumsum(axis=1)
+
+    # rank[i, e] = 1 + number of teams with more points than team i at e
+    rank = 1 + (cumulative[None, :, :] > cumulative[:, None, :]).sum(axis=1)
+
+    standings = {
+        "teams": np.asarray(teams),
+        "events": events.astype(np.int16),
+        "cumulative": cumulative.astype(np.int32),
+        "rank": rank.astype(np.int16),
+    }
+
+    padded = np.concatenate([np.zeros((len(teams), 1), np.int32), cumulative], axis=1)
+    for window in FORM_WINDOWS:
+        start = np.maximum(np.arange(1, len(events) + 1) - window, 0)
+        standings[f"form_{window}"] = (padded[:, 1:] - padded[:, start]).astype(
+            np.int16
+        )
+    return standings
+
+
+def save_chip_standings(standings, path):
+    np.savez_compressed(path, **standings)
+
+
+def load_chip_standings(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def team_series(standings, team):
+    """
+    One row per event for a team: cumulative points, rank and form.
+    """
+    teams = list(standings["teams"])
+    if team not in teams:
+        return pd.DataFrame()
+    i = teams.index(team)
+
+    series = pd.DataFrame(
+        {
+            "event": standings["events"],
+            "cumulative_points": standings["cumulative"][i],
+            "rank": standings["rank"][i],
+        }
+    )
+    for window in FORM_WINDOWS:
+        series[f"form_{window}"] = standings[f"form_{window}"][i]
+    return series
+
+
+def current_rank(standings, team):
+    """
+    A team's chip rank after the latest event (None if unknown).
+    """
+    teams = list(standings["teams"])
+    if team not in teams or not len(standings["events"]):
+        return None
+    return int(standings["rank"][teams.index(team), -1])
@@ -0,0 +1,467 @@
+# -------------------------------------------------------
+# Styling and HTML building blocks shared by the Streamlit dashboard (app.py)
+# and the static export (app/static_export.py), so both look the same.
+# -------------------------------------------------------
+
+import pandas as pd
+
+# Team logos (using Wikipedia SVG links)
+TEAM_LOGOS = {
+    "Man Utd": "https://upload.wikimedia.org/wikipedia/en/7/7a/Manchester_United_FC_crest.svg",
+    "Liverpool": "https://upload.wikimedia.org/wikipedia/en/0/0c/Liverpool_FC.svg",
+    "Arsenal": "https://upload.wikimedia.org/wikipedia/en/5/53/Arsenal_FC.svg",
+    "Chelsea": "https://upload.wikimedia.org/wikipedia/en/c/cc/Chelsea_FC.svg",
+    "Aston Villa": "https://upload.wikimedia.org/wikipedia/en/9/9a/Aston_Villa_FC_new_crest.svg",
+    "Crystal Palace": "https://upload.wikimedia.org/wikipedia/en/a/a2/Crystal_Palace_FC_logo_%282022%29.svg",
+    "Brentford": "https://upload.wikimedia.org/wikipedia/en/2/2a/Brentford_FC_crest.svg",
+    "Leicester": "https://upload.wikimedia.org/wikipedia/en/2/2d/Leicester_City_crest.svg",
+    "Spurs": "https://upload.wikimedia.org/wikipedia/en/b/b4/Tottenham_Hotspur.svg",
+    "Nottingham Forest": "https://upload.wikimedia.org/wikipedia/en/e/e5/Nottingham_Forest_F.C._logo.svg",
+    "Man City": "https://upload.wikimedia.org/wikipedia/en/e/eb/Manchester_City_FC_badge.svg",
+    "Newcastle": "https://upload.wikimedia.org/wikipedia/en/5/56/Newcastle_United_Logo.svg",
+    "Brighton": "https://upload.wikimedia.org/wikipedia/en/f/fd/Brighton_%26_Hove_Albion_logo.svg",
+    "Fulham": "https://upload.wikimedia.org/wikipedia/en/e/eb/Fulham_FC_%28shield%29.svg",
+    "Bournemouth": "https://upload.wikimedia.org/wikipedia/en/e/e5/AFC_Bournemouth_%282013%29.svg",
+    "Ipswich": "https://upload.wikimedia.org/wikipedia/en/4/43/Ipswich_Town.svg",
+    "West Ham": "https://upload.wikimedia.org/wikipedia/en/c/c2/West_Ham_United_FC_logo.svg",
+    "Everton": "https://upload.wikimedia.org/wikipedia/en/7/7c/Everton_FC_logo.svg",
+    "Wolves": "https://upload.wikimedia.org/wikipedia/en/f/fc/Wolverhampton_Wanderers.svg",
+    "Southampton": "https://upload.wikimedia.org/wikipedia/en/c/c9/FC_Southampton.svg",
+}
+
+# Manager & price data
+TEAM_MANAGER_DATA = {
+    "Arsenal": ("Mikel Arteta", "£1.5m"),
+    "Chelsea": ("Enzo Maresca", "£1.5m"),
+    "Liverpool": ("Arne Slot", "£1.5m"),
+    "Man City": ("Pep Guardiola", "£1.5m"),
+    "Newcastle": ("Eddie Howe", "£1.5m"),
+    "Bournemouth": ("Andoni Iraola", "£1.1m"),
+    "Brighton": ("Fabian Hurzeler", "£1.1m"),
+    "Fulham": ("Marco Silva", "£1.1m"),
+    "Nottingham Forest": ("Nuno Espirito Santo", "£1.1m"),
+    "Spurs": ("Ange Postecoglou", "£1.1m"),
+    "Aston Villa": ("Unai Emery", "£0.8m"),
+    "Brentford": ("Thomas Frank", "£0.8m"),
+    "Crystal Palace": ("Oliver Glasner", "£0.8m"),
+    "Man Utd": ("Ruben Amorim", "£0.8m"),
+    "Wolves": ("Vitor Pereira", "£0.8m"),
+    "Everton": ("David Moyes", "£0.5m"),
+    "Ipswich": ("Kieran McKenna", "£0.5m"),
+    "Leicester": ("Ruud van Nistelrooy", "£0.5m"),
+    "Southampton": ("Ivan Juric", "£0.5m"),
+    "West Ham": ("Graham Potter", "£0.5m"),
+}
+
+# Custom CSS for a dark theme (including new “.stat-cards-container” and “.stat-card” classes).
+# Used by the dashboard and embedded in every statically exported page.
+CUSTOM_CSS = """
+<style>
+
+/* Global dark background and light text */
+html, body, [class*="css"] {
+    font-family: 'Helvetica Neue', Arial, sans-serif !important;
+    font-size: 15px !important;
+    background-color: #1e1e1e !important; 
+    color: #eaeaea !important;
+}
+
+.block-container {
+    padding: 1rem 2rem;
+}
+
+/* Headings in white */
+h1, h2, h3, h4, h5, h6 {
+    color: #ffffff !important;
+}
+
+/* Container for summary stat cards */
+.stat-cards-container {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 20px;
+    margin-bottom: 20px;
+}
+
+/* Individual stat card */
+.stat-card {
+    background-color: #2b2b2b;
+    border: 1px solid #3a3a3a;
+    border-radius: 8px;
+    width: 220px;
+    min-height: 120px;
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    justify-content: center;
+    padding: 15px;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.3);
+    text-align: center;
+}
+
+.stat-icon {
+    font-size: 28px;
+    margin-bottom: 8px;
+}
+
+.stat-title {
+    font-weight: bold;
+    margin-bottom: 3px;
+    color: #fff;
+}
+
+.stat-value {
+    font-size: 18px;
+    font-weight: 500;
+    color: #eaeaea;
+}
+
+/* Team row container */
+.team-row {
+    display: flex;
+    align-items: center;
+    border-radius: 6px;
+    padding: 10px;
+    margin-bottom: 5px;
+    background-color: #2b2b2b;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.4);
+    color: #eaeaea !important;
+}
+
+.team-row:nth-child(even) {
+    background-color: #3a3a3a;
+}
+
+.team-row div {
+    text-align: center;
+    flex: 1;
+}
+
+/* The first column left-aligned for the team name + logo */
+.team-row div:first-child {
+    text-align: left !important;
+    display: flex;
+    align-items: center;
+}
+
+/* Header row styling */
+.header-row {
+    font-weight: bold;
+    background-color: #444444 !important; 
+    color: #ffffff !important;
+    margin-bottom: 10px;
+    border-radius: 6px;
+}
+
+.header-row div {
+    padding: 10px 0 !important;
+}
+
+/* Team logo adjustments */
+.team-logo {
+    width: 40px;
+    height: 40px;
+    object-fit: contain;
+    margin-right: 10px;
+    vertical-align: middle;
+}
+
+/* Match result container */
+.match-result {
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    background-color: #2b2b2b;
+    padding: 10px 20px;
+    border: 1px solid #3a3a3a;
+    border-radius: 8px;
+    margin-bottom: 10px;
+    gap: 20px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.4);
+    color: #eaeaea !important;
+}
+
+.home-team {
+    display: flex;
+    align-items: center;
+    justify-content: flex-start;
+    flex: 1;
+    gap: 5px;
+}
+
+.away-team {
+    display: flex;
+    align-items: center;
+    justify-content: flex-end;
+    flex: 1;
+    gap: 5px;
+}
+
+/* Score style */
+.match-score {
+    font-size: 1.2em;
+    font-weight: bold;
+    color: #ffffff;
+    width: 80px;
+    text-align: center;
+}
+
+/* DataFrame styling override for dark background */
+[data-testid="stDataFrame"] {
+    background-color: #2b2b2b !important;
+    color: #eaeaea !important;
+    border: 1px solid #3a3a3a !important;
+}
+
+.css-1nh1x9a svg { 
+    display: none; /* Hide row index icon in dataframes */
+}
+
+/* Responsive design for mobile */
+@media (max-width: 768px) {
+    .stat-cards-container {
+        flex-direction: column;
+        align-items: center;
+    }
+    .stat-card {
+        width: 100%; /* Full width for smaller screens */
+    }
+    .team-row, .match-result {
+        flex-direction: column;
+        align-items: flex-start;
+        text-align: left;
+    }
+    .match-score {
+        width: auto;
+        text-align: left;
+    }
+    .block-container {
+        padding: 1rem;
+    }
+    h1, h2, h3 {
+        font-size: 1.5rem;
+    }
+}
+
+    .scrollable-container {
+        overflow-x: auto; /* Enable horizontal scrolling */
+        white-space: nowrap; /* Prevent wrapping of content */
+    }
+
+    .team-row, .header-row {
+        display: flex;
+        flex-wrap: nowrap; /* Prevent wrapping within rows */
+    }
+
+    .team-logo {
+        width: 40px;
+        height: 40px;
+        object-fit: contain;
+        margin-right: 10px;
+        vertical-align: middle;
+    }
+
+/* Fixture difficulty heatmap */
+.fixture-heatmap {
+    border-collapse: separate;
+    border-spacing: 3px;
+    width: 100%;
+}
+
+.fixture-heatmap th {
+    background-color: #444444;
+    color: #ffffff;
+    padding: 8px;
+    border-radius: 4px;
+    text-align: center;
+}
+
+.fixture-heatmap td {
+    padding: 6px 8px;
+    border-radius: 4px;
+    text-align: center;
+    color: #ffffff;
+    font-size: 13px;
+}
+
+.fixture-heatmap td.team-cell {
+    background-color: #2b2b2b;
+    text-align: left;
+}
+
+.fixture-heatmap td.bonus-cell {
+    box-shadow: inset 0 0 0 2px #f5c518;
+}
+
+.fixture-heatmap .team-logo {
+    width: 24px;
+    height: 24px;
+}
+</style>
+"""
+
+
+class TeamInfo:
+    """
+    Logos and managers for one season: those from the FPL metadata
+    (app/metadata.py), with the built-in values above as the fallback for
+    anything it lacks.
+
+    Build one per metadata load and pass it to the render helpers. The
+    built-in tables are never changed, so nothing from an earlier load
+    lingers.
+    """
+
+    def __init__(self, metadata=None):
+        metadata = metadata or {}
+        self.logos = {**TEAM_LOGOS, **metadata.get("logos", {})}
+        self.managers = {
+            **TEAM_MANAGER_DATA,
+            **{
+                team: tuple(manager)
+                for team, manager in metadata.get("managers", {}).items()
+            },
+        }
+
+    def logo(self, team_name):
+        return self.logos.get(team_name, "https://via.placeholder.com/50")
+
+    def manager_and_price(self, team_name):
+        return self.managers.get(team_name, ("N/A", "N/A"))
+
+
+def match_result_html(match, team_info):
+    home_logo = team_info.logo(match["home"])
+    away_logo = team_info.logo(match["away"])
+    return f"""
+    <div class="match-result">
+        <div class="home-team">
+            <img src="{home_logo}" class="team-logo" alt="{match['home']} logo">
+            <span>{match['home']}</span>
+        </div>
+        <div class="match-score">
+            {match['home_score']} - {match['away_score']}
+        </div>
+        <div class="away-team">
+            <span>{match['away']}</span>
+            <img src="{away_logo}" class="team-logo" alt="{match['away']} logo">
+        </div>
+    </div>
+    """
+
+
+OVERALL_HEADER_HTML = """
+     <div class="scrollable-container">
+    <div class="team-row header-row">
+        <div>Team</div>
+        <div>Manager</div>
+        <div>Price</div>
+        <div>Total Points</div>
+        <div>Games Played</div>
+        <div>Avg Points</div>
+        <div>Total Table Bonus</div>
+    </div>
+    </div>
+    """
+
+
+def team_row_html(team, total_points, games_played, avg_points, table_bonus, team_info):
+    """
+    One club's row in the Overall View.
+    """
+    manager, price = team_info.manager_and_price(team)
+    return f"""
+        <div class="team-row">
+            <div>
+                <img src="{team_info.logo(team)}" class="team-logo">
+                {team}
+            </div>
+            <div>{manager}</div>
+            <div>{price}</div>
+            <div>{int(total_points)}</div>
+            <div>{int(games_played)}</div>
+            <div>{avg_points:.1f}</div>
+            <div>{int(table_bonus)}</div>
+        </div>
+        """
+
+
+def team_header_html(team, team_info):
+    return f"""
+    <div style="display: flex; align-items: center; margin-bottom: 20px;">
+        <img src="{team_info.logo(team)}" style="width: 50px; height: 50px; margin-right: 15px; object-fit: contain;">
+        <h2 style="margin: 0; color: #ffffff;">{team}</h2>
+    </div>
+    """
+
+
+def stat_cards_html(stats):
+    """
+    Summary stat cards for (title, value) pairs.
+    """
+    cards = "".join(
+        f'<div class="stat-card"><div class="stat-title">{title}</div>'
+        f'<div class="stat-value">{value}</div></div>'
+        for title, value in stats
+    )
+    return f'<div class="stat-cards-container">{cards}</div>'
+
+
+def gap_colour(gap):
+    """
+    Heatmap colour for a position gap: red when the opponent sits higher
+    (harder fixture), green when it sits lower.
+    """
+    strength = min(abs(gap), 19) / 19
+    if gap > 0:
+        return f"rgba(214, 69, 65, {0.25 + 0.75 * strength:.2f})"
+    if gap < 0:
+        return f"rgba(46, 160, 67, {0.25 + 0.75 * strength:.2f})"
+    return "#3a3a3a"
+
+
+def render_fixture_heatmap(matrix, team_info):
+    """
+    HTML table of teams x upcoming gameweeks. Each cell shows the opponent,
+    venue and position gap; table bonus fixtures get a gold outline.
+    """
+    events = sorted(matrix["event"].unique())
+    cells = {
+        (team, event): group
+        for (team, event), group in matrix.groupby(["team", "event"])
+    }
+
+    header = "".join(f"<th>GW{event}</th>" for event in events)
+    rows = []
+    for team in sorted(matrix["team"].unique()):
+        row = [
+            f'<td class="team-cell"><img src="{team_info.logo(team)}" '
+            f'class="team-logo">{team}</td>'
+        ]
+        for event in events:
+            fixtures = cells.get((team, event))
+            if fixtures is None:
+                row.append('<td style="background-color: #2b2b2b;">-</td>')
+                continue
+            # Double gameweeks show both fixtures; colour by the harder one.
+            # A gap is missing when a team has no table position yet
+            gap = fixtures["position_gap"].max()
+            bonus = bool(fixtures["bonus_eligible"].any())
+            label = "<br>".join(
+                f"{opponent} ({venue}) "
+                + ("?" if pd.isna(fixture_gap) else f"{int(fixture_gap):+d}")
+                for opponent, venue, fixture_gap in zip(
+                    fixtures["opponent"], fixtures["venue"], fixtures["position_gap"]
+                )
+            )
+            css_class = ' class="bonus-cell"' if bonus else ""
+            colour = "#3a3a3a" if pd.isna(gap) else gap_colour(int(gap))
+            row.append(
+                f'<td{css_class} style="background-color: {colour};">' f"{label}</td>"
+            )
+        rows.append(f"<tr>{''.join(row)}</tr>")
+
+    return (
+        '<div class="scrollable-container"><table class="fixture-heatmap">'
+        f"<tr><th>Team</th>{header}</tr>{''.join(rows)}</table></div>"
+    )
@@ -0,0 +1,93 @@
+import os
+import pickle
+import hashlib
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default cap on the on-disk size of the cache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class EventCache:
+    """
+    Content-addressed, size-bounded disk cache for per-event blocks.
+
+    Keys are hashes of everything a block depends on (the event's fixtures,
+    the standings going into it, the rules version...), so a hit is always
+    safe to re-use and nothing ever needs invalidating. When the cache grows
+    past max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in self._entries())
+
+    def key(self, *parts):
+        """
+        Hash key parts; DataFrames are hashed by columns, dtypes and values.
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, pd.DataFrame):
+                digest.update(repr(list(zip(part.columns, part.dtypes))).encode())
+                digest.update(
+                    pd.util.hash_pandas_object(part, index=False).values.tobytes()
+                )
+            else:
+                digest.update(repr(part).encode())
+            digest.update(b"|")
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime_ns, name, stat.st_size))
+        return entries
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.total_bytes += os.path.getsize(path)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+        """
+        entries = sorted(self._entries())
+        self.total_bytes = sum(size for _, _, size in entries)
+        for _, name, size in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            self.total_bytes -= size
+            logger.debug(f"Evicted {name} from the event cache")
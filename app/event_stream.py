@@ -0,0 +1,242 @@
+import pandas as pd
+
+# Columns of a standings snapshot, in the order scoring.event_table uses
+SNAPSHOT_COLUMNS = [
+    "event",
+    "team_name",
+    "position",
+    "points",
+    "goal_difference",
+    "goals_scored",
+    "goals_conceded",
+    "wins",
+    "draws",
+    "losses",
+]
+
+
+class StandingsState:
+    """
+    Mutable league standings that take one fixture at a time.
+
+    Per-team stats live in plain lists indexed by team, and `order` keeps the
+    teams sorted best first (points, then goal difference, then goals
+    scored). Applying a fixture is O(1) for the stats; each of the two teams
+    then moves up or down `order` only as far as its new record takes it,
+    instead of re-sorting the whole table.
+    """
+
+    def __init__(self, teams):
+        self.teams = sorted(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        n = len(self.teams)
+        self.points = [0] * n
+        self.goals_scored = [0] * n
+        self.goals_conceded = [0] * n
+        self.wins = [0] * n
+        self.draws = [0] * n
+        self.losses = [0] * n
+        self.order = list(range(n))  # team indices, best first
+        self.slot = list(range(n))  # slot[i] = where team i sits in order
+
+    def _key(self, i):
+        return (
+            self.points[i],
+            self.goals_scored[i] - self.goals_conceded[i],
+            self.goals_scored[i],
+        )
+
+    def apply(self, home, away, home_score, away_score):
+        """
+        Add one result to the standings.
+        """
+        # Update and re-rank one team at a time, so each re-rank moves a
+        # single team through an otherwise sorted table
+        self._record(self.team_index[home], home_score, away_score)
+        self._record(self.team_index[away], away_score, home_score)
+
+    def _record(self, i, scored, conceded):
+        self.goals_scored[i] += scored
+        self.goals_conceded[i] += conceded
+        if scored > conceded:
+            self.points[i] += 3
+            self.wins[i] += 1
+        elif scored == conceded:
+            self.points[i] += 1
+            self.draws[i] += 1
+        else:
+            self.losses[i] += 1
+        self._rerank(i)
+
+    def _swap(self, s, t):
+        order = self.order
+        order[s], order[t] = order[t], order[s]
+        self.slot[order[s]] = s
+        self.slot[order[t]] = t
+
+    def _rerank(self, i):
+        # Move team i up past teams it now beats, or down past teams that now
+        # beat it. Teams level on every criterion keep their relative order.
+        key = self._key(i)
+        s = self.slot[i]
+        while s > 0 and self._key(self.order[s - 1]) < key:
+            self._swap(s - 1, s)
+            s -= 1
+        while s < len(self.order) - 1 and self._key(self.order[s + 1]) > key:
+            self._swap(s, s + 1)
+            s += 1
+
+    def position(self, team):
+        """
+        The team's league position; teams level on every criterion share it.
+        """
+        s = self.slot[self.team_index[team]]
+        key = self._key(self.order[s])
+        while s > 0 and self._key(self.order[s - 1]) == key:
+            s -= 1
+        return s + 1
+
+    def snapshot(self, event):
+        """
+        The current standings as a league table for `event` (best first).
+        """
+        rows = []
+        position = 1
+        previous_key = None
+        for s, i in enumerate(self.order):
+            key = self._key(i)
+            if key != previous_key:
+                position = s + 1
+                previous_key = key
+            rows.append(
+                (
+                    event,
+                    self.teams[i],
+                    position,
+                    self.points[i],
+                    key[1],
+                    self.goals_scored[i],
+                    self.goals_conceded[i],
+                    self.wins[i],
+                    self.draws[i],
+                    self.losses[i],
+                )
+            )
+        return pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+
+
+def kickoff_order(results_df):
+    """
+    Results sorted by kickoff time. Without kickoff times (e.g. older
+    results files) fixtures fall back to gameweek order.
+    """
+    if "kickoff_time" not in results_df or results_df["kickoff_time"].isna().all():
+        return results_df.sort_values("event", kind="stable")
+    kickoff = pd.to_datetime(results_df["kickoff_time"], utc=True)
+    return (
+        results_df.assign(_kickoff=kickoff)
+        .sort_values(["_kickoff", "event"], kind="stable", na_position="last")
+        .drop(columns="_kickoff")
+    )
+
+
+def gameweek_close_points(events):
+    """
+    For fixtures in kickoff order (given as their gameweeks), the index of
+    the fixture after which each gameweek's table is taken.
+
+    A fixture played after half of the next gameweek has kicked off counts
+    as postponed, and one played before half of the previous gameweek as
+    brought forward; neither decides where its own gameweek starts or ends.
+    A gameweek closes after its last other fixture, or just before the next
+    gameweek starts if that is later (so fixtures played in between count
+    towards it). Close points never go backwards, so tables are taken in
+    gameweek order.
+    """
+    positions = {}
+    for p, event in enumerate(events):
+        positions.setdefault(event, []).append(p)
+    gameweeks = sorted(positions)
+
+    def median(gameweek):
+        played = positions[gameweek]
+        return played[(len(played) - 1) // 2]
+
+    # 1) Each gameweek's fixtures that were played on schedule
+    on_time = {}
+    for n, gameweek in enumerate(gameweeks):
+        played = positions[gameweek]
+        if n > 0:
+            played = [p for p in played if p > median(gameweeks[n - 1])] or played
+        if n + 1 < len(gameweeks):
+            played = [p for p in played if p < median(gameweeks[n + 1])] or played
+        on_time[gameweek] = played
+
+    # 2) Close after the gameweek's last fixture or just before the next
+    #    one's first, whichever is later; the last gameweek takes the rest
+    close_at = {}
+    last = -1
+    for n, gameweek in enumerate(gameweeks):
+        if n + 1 < len(gameweeks):
+            end = max(on_time[gameweek][-1], on_time[gameweeks[n + 1]][0] - 1)
+        else:
+            end = len(events) - 1
+        last = max(last, end)
+        close_at[gameweek] = last
+    return close_at
+
+
+def replay(results_df, state=None):
+    """
+    Apply results one at a time in kickoff order and yield
+    (event, snapshot) as each gameweek closes (see gameweek_close_points).
+
+    A postponed match therefore counts from the week it was actually played
+    rather than being bunched into its original gameweek, and a match
+    brought forward does not close the gameweek before it early.
+    """
+    if state is None:
+        teams = set(results_df["home"]) | set(results_df["away"])
+        state = StandingsState(teams)
+
+    fixtures = kickoff_order(results_df)
+    close_at = gameweek_close_points([int(ev) for ev in fixtures["event"]])
+    pending = sorted(close_at)
+
+    for p, (home, away, home_score, away_score) in enumerate(
+        zip(
+            fixtures["home"],
+            fixtures["away"],
+            fixtures["home_score"],
+            fixtures["away_score"],
+        )
+    ):
+        state.apply(home, away, int(home_score), int(away_score))
+        while pending and close_at[pending[0]] <= p:
+            closed = pending.pop(0)
+            yield closed, state.snapshot(closed)
+
+
+def build_league_table(results_df):
+    """
+    The event-by-event league table (same layout as
+    PremierLeaguePointsCalculator.calculate_league_table, starting with an
+    "event 0" table of everyone on zero), built by replaying the results.
+    """
+    teams = sorted(set(results_df["home"]) | set(results_df["away"]))
+    initial = pd.DataFrame(
+        {
+            "event": [0] * len(teams),
+            "team_name": teams,
+            "points": 0,
+            "goals_scored": 0,
+            "goals_conceded": 0,
+            "goal_difference": 0,
+            "wins": 0,
+            "draws": 0,
+            "losses": 0,
+            "position": 1,
+        }
+    )
+    snapshots = [snapshot for _, snapshot in replay(results_df)]
+    return pd.concat([initial] + snapshots, ignore_index=True)
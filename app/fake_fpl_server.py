@@ -0,0 +1,223 @@
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class FaultConfig:
+    """
+    Faults the stand-in server injects into its responses.
+
+    - delay: seconds to wait before answering every request
+    - fail_first: number of initial requests answered with error_status
+    - error_rate: probability of answering any other request with error_status
+    - error_status: HTTP status used for injected errors
+    - truncate: send a cut-off (invalid) JSON body
+    - drop: close the connection without answering
+    """
+
+    def __init__(
+        self,
+        delay=0.0,
+        fail_first=0,
+        error_rate=0.0,
+        error_status=503,
+        truncate=False,
+        drop=False,
+    ):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.truncate = truncate
+        self.drop = drop
+
+
+def fixtures_from_results(results_file, teams_dict):
+    """
+    Build an FPL-style fixtures payload from a results.csv file.
+    """
+    team_ids = {name: team_id for team_id, name in teams_dict.items()}
+    results_df = pd.read_csv(results_file)
+    return [
+        {
+            "id": i + 1,
+            "event": int(row["event"]),
+            "team_h": team_ids.get(row["home"]),
+            "team_a": team_ids.get(row["away"]),
+            "team_h_score": int(row["home_score"]),
+            "team_a_score": int(row["away_score"]),
+            "finished": True,
+            "kickoff_time": (
+                row["kickoff_time"] if pd.notna(row.get("kickoff_time")) else None
+            ),
+        }
+        for i, row in results_df.iterrows()
+    ]
+
+
+def bootstrap_from_teams(teams_dict, managers=None):
+    """
+    Build a minimal FPL-style bootstrap-static payload: teams plus one
+    assistant manager (element_type 5) per team from managers
+    ({team: (name, "£x.xm")}).
+    """
+    elements = []
+    for team_id, name in teams_dict.items():
+        if managers and name in managers:
+            manager, price = managers[name]
+            first_name, _, second_name = manager.partition(" ")
+            elements.append(
+                {
+                    "id": 1000 + team_id,
+                    "element_type": 5,
+                    "team": team_id,
+                    "first_name": first_name,
+                    "second_name": second_name,
+                    "now_cost": round(float(price.strip("£m")) * 10),
+                }
+            )
+    return {
+        "teams": [
+            {"id": team_id, "name": name, "code": team_id}
+            for team_id, name in teams_dict.items()
+        ],
+        "elements": elements,
+        "events": [],
+    }
+
+
+class FakeFPLServer:
+    """
+    Local stand-in for the FPL API that can inject faults.
+
+    Serves the given payloads by path (e.g. {"/api/fixtures/": [...]}) on a
+    background thread. Use it as a context manager and point the pipeline at
+    server.base_url (FPL_API_BASE):
+
+        with FakeFPLServer(payloads, FaultConfig(fail_first=2)) as server:
+            ...
+    """
+
+    def __init__(self, payloads, faults=None, host="127.0.0.1", port=0):
+        self.payloads = payloads
+        self.faults = faults or FaultConfig()
+        self.requests_seen = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def _make_handler(self):
+        fake = self
+
+        class FakeFPLHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fake.lock:
+                    fake.requests_seen += 1
+                    request_number = fake.requests_seen
+                faults = fake.faults
+
+                if faults.delay:
+                    time.sleep(faults.delay)
+                if faults.drop:
+                    self.close_connection = True
+                    return
+                if request_number <= faults.fail_first or (
+                    random.random() < faults.error_rate
+                ):
+                    self.send_error(faults.error_status)
+                    return
+
+                payload = fake.payloads.get(self.path)
+                if payload is None:
+                    self.send_error(404)
+                    return
+
+                body = json.dumps(payload).encode()
+                if faults.truncate:
+                    body = body[: len(body) // 2]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. its read timeout fired first)
+                    pass
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return FakeFPLHandler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    from fetch_data import PremierLeaguePointsCalculator
+    from dashboard_html import TEAM_MANAGER_DATA
+
+    parser = argparse.ArgumentParser(
+        description="Serve data/results.csv as a fault-injecting fake FPL API."
+    )
+    parser.add_argument("--port", type=int, default=8503)
+    parser.add_argument("--results", default="data/results.csv")
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument("--drop", action="store_true")
+    args = parser.parse_args()
+
+    teams_dict = PremierLeaguePointsCalculator().teams_dict
+    payloads = {
+        "/api/fixtures/": fixtures_from_results(args.results, teams_dict),
+        "/api/bootstrap-static/": bootstrap_from_teams(teams_dict, TEAM_MANAGER_DATA),
+    }
+    faults = FaultConfig(
+        delay=args.delay,
+        fail_first=args.fail_first,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        truncate=args.truncate,
+        drop=args.drop,
+    )
+    server = FakeFPLServer(payloads, faults, port=args.port)
+    print(f"Fake FPL API on {server.base_url} (set FPL_API_BASE to use it)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
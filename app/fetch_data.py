@@ -1,13 +1,44 @@
-import requests
 import json
 import os
 import pandas as pd
 import logging
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlite_store import write_store
+from changefeed import load_snapshot, record_changes
+from fixture_matrix import MATRIX_FILE, update_fixture_matrix
+from resilient_fetch import CircuitBreaker, ResilientFetcher
+from metadata import METADATA_FILE, fetch_metadata, load_metadata
+from event_cache import EventCache
+from lean_types import LEAN_TYPES, memory_footprint, to_lean
+from event_stream import build_league_table
+from scoring import (
+    LEAGUE_TABLE_VERSION,
+    SCORING_RULES_VERSION,
+    event_points,
+    event_table,
+)
+from squad_scoring import PICKS_FILE, USER_STANDINGS_FILE, score_picks
+from static_export import export_site
+from chip_standings import (
+    STANDINGS_FILE,
+    compute_chip_standings,
+    save_chip_standings,
+)
+
+# Base URL of the FPL API (point it at app/fake_fpl_server.py for testing)
+FPL_API_BASE = os.environ.get("FPL_API_BASE", "https://fantasy.premierleague.com/api")
+
+# "batch" applies each gameweek's fixtures together; "stream" replays them one
+# at a time in kickoff order (see app/event_stream.py)
+STANDINGS_ENGINE = os.environ.get("AMP_STANDINGS_ENGINE", "batch")
 
 
 class PremierLeaguePointsCalculator:
-    def __init__(self):
+    def __init__(
+        self, lean_types=LEAN_TYPES, standings_engine=STANDINGS_ENGINE, data_dir="data"
+    ):
         # Load teams dictionary
         self.teams_dict = {
             1: "Arsenal",
@@ -32,34 +63,90 @@ class PremierLeaguePointsCalculator:
             20: "Wolves",
         }
 
+        # Directory for results, caches and the log (created if missing)
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s - %(levelname)s: %(message)s",
-            filename="data/premier_league_points.log",
+            filename=os.path.join(self.data_dir, "premier_league_points.log"),
         )
         self.logger = logging.getLogger(__name__)
 
-        # A default data directory for saving results
-        self.data_dir = "data"
+        # Fetches with timeouts, retries and a last-good-snapshot fallback
+        self.fetcher = ResilientFetcher(cache_dir=os.path.join(self.data_dir, "cache"))
+        self.fetch_status = None  # Where the last fixtures came from (live/cache)
+
+        # Teams, managers and gameweeks from bootstrap-static, fetched alongside
+        # the fixtures over the same session (with a breaker of its own)
+        self.metadata_file = os.path.join(self.data_dir, METADATA_FILE)
+        self.metadata_fetcher = ResilientFetcher(
+            cache_dir=os.path.join(self.data_dir, "cache"),
+            session=self.fetcher.session,
+            breaker=CircuitBreaker(
+                state_file=os.path.join(self.data_dir, "cache", "metadata_breaker.json")
+            ),
+        )
+        self.metadata = None
+        self.use_metadata(load_metadata(self.metadata_file))
+
+        # Per-event tables and points keyed by their inputs (None disables it)
+        self.event_cache = EventCache(os.path.join(self.data_dir, "cache", "events"))
+
+        # Keep frames in int8/int16 and categorical team columns (AMP_LEAN_TYPES=1)
+        self.lean_types = lean_types
+
+        # How the event-by-event league table is built ("batch" or "stream")
+        self.standings_engine = standings_engine
 
         # Initialize DataFrames
         self.match_results_df = pd.DataFrame()  # Raw match results
+        self.upcoming_fixtures_df = pd.DataFrame()  # Scheduled, unplayed fixtures
         self.league_positions_df = (
             pd.DataFrame()
         )  # The final event-by-event league table
 
+    def use_metadata(self, metadata):
+        """
+        Take team names from the FPL metadata; the built-in teams_dict is
+        only used until metadata has been fetched once.
+        """
+        if metadata and metadata.get("teams"):
+            self.metadata = metadata
+            self.teams_dict = {
+                int(team_id): name for team_id, name in metadata["teams"].items()
+            }
+
     def fetch_fixtures(self):
         """
         Fetch fixtures from Fantasy Premier League API and store them in self.match_results_df
+
+        Scheduled fixtures that have not been played yet are kept in
+        self.upcoming_fixtures_df (fixtures without an event are still
+        unscheduled and are skipped).
+
+        If the API is unavailable the last good payload is used instead and
+        self.fetch_status is marked as stale.
         """
         try:
-            url = "https://fantasy.premierleague.com/api/fixtures/"
-            response = requests.get(url)
-            fixtures = response.json()
+            url = f"{FPL_API_BASE}/fixtures/"
+
+            # Fetch the metadata concurrently so it adds no time to the refresh
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                metadata = pool.submit(
+                    fetch_metadata,
+                    self.metadata_fetcher,
+                    FPL_API_BASE,
+                    self.metadata_file,
+                )
+                fixtures, self.fetch_status = self.fetcher.fetch_json(url, "fixtures")
+                self.use_metadata(metadata.result())
 
             # Transform fixtures into our required format
             results = []
+            upcoming = []
             for fixture in fixtures:
                 # Only include completed matches that have a non-null score
                 if fixture.get("team_h_score") is not None:
@@ -70,11 +157,42 @@ class PremierLeaguePointsCalculator:
                             "away": self.teams_dict.get(fixture["team_a"], "Unknown"),
                             "home_score": fixture.get("team_h_score", 0),
                             "away_score": fixture.get("team_a_score", 0),
+                            "kickoff_time": fixture.get("kickoff_time"),
+                        }
+                    )
+                elif fixture.get("event") is not None:
+                    upcoming.append(
+                        {
+                            "event": fixture["event"],
+                            "home": self.teams_dict.get(fixture["team_h"], "Unknown"),
+                            "away": self.teams_dict.get(fixture["team_a"], "Unknown"),
+                            "kickoff_time": fixture.get("kickoff_time"),
                         }
                     )
 
             # Convert to DataFrame
             self.match_results_df = pd.DataFrame(results)
+            self.upcoming_fixtures_df = pd.DataFrame(
+                upcoming, columns=["event", "home", "away", "kickoff_time"]
+            )
+            if self.lean_types:
+                self.match_results_df = to_lean(self.match_results_df, "results")
+                self.upcoming_fixtures_df = to_lean(
+                    self.upcoming_fixtures_df, "upcoming_fixtures"
+                )
+
+            # New clubs missing from the metadata would otherwise merge into one
+            unknown = {
+                team_id
+                for fixture in fixtures
+                for team_id in (fixture["team_h"], fixture["team_a"])
+                if team_id not in self.teams_dict
+            }
+            if unknown:
+                self.logger.warning(
+                    f"No team names for ids {sorted(unknown)}; they are "
+                    f"listed as Unknown"
+                )
 
             # Ensure data directory exists
             os.makedirs(self.data_dir, exist_ok=True)
@@ -85,6 +203,10 @@ class PremierLeaguePointsCalculator:
             self.match_results_df.to_csv(file_path, index=False)
             self.logger.info(f"Saved results to {file_path}")
 
+            # Save upcoming fixtures to a CSV file
+            file_path = os.path.join(self.data_dir, "upcoming_fixtures.csv")
+            self.upcoming_fixtures_df.to_csv(file_path, index=False)
+
             # Log results
             self.logger.info(f"Fetched {len(results)} match results")
 
@@ -121,13 +243,26 @@ class PremierLeaguePointsCalculator:
         all_teams = set(self.match_results_df["home"]) | set(
             self.match_results_df["away"]
         )
+        if self.lean_types:
+            # Share one team categorical between results and every table
+            self.match_results_df = to_lean(self.match_results_df, "results", all_teams)
+
+        # The stream engine replays fixtures in kickoff order instead, taking
+        # a snapshot at each gameweek boundary
+        if self.standings_engine == "stream":
+            self.league_positions_df = build_league_table(self.match_results_df)
+            if self.lean_types:
+                self.league_positions_df = to_lean(
+                    self.league_positions_df, "league_table", all_teams
+                )
+            return self.league_positions_df
 
         # 4) Create the initial "event 0" standings (everyone at 0)
         #    This table will be updated cumulatively
         prev_event_df = pd.DataFrame(
             {
                 "event": [0] * len(all_teams),
-                "team_name": list(all_teams),
+                "team_name": sorted(all_teams),
                 "points": 0,
                 "goals_scored": 0,
                 "goals_conceded": 0,
@@ -138,6 +273,8 @@ class PremierLeaguePointsCalculator:
                 "position": 1,  # We can set them all to 1 or 0 for the initial snapshot
             }
         )
+        if self.lean_types:
+            prev_event_df = to_lean(prev_event_df, "league_table", all_teams)
 
         # 5) Store the "initial" snapshot in self.league_positions_df (optional)
         self.league_positions_df = prev_event_df.copy(deep=True)
@@ -147,104 +284,38 @@ class PremierLeaguePointsCalculator:
 
         # 7) Iterate over events in ascending order
         for ev in all_events:
-            # Make a copy of the previous event's table
-            current_event_df = prev_event_df.copy(deep=True)
-            current_event_df["event"] = ev
-
             # Filter matches for this event
             ev_matches = self.match_results_df[self.match_results_df["event"] == ev]
 
-            # For each match, update the relevant teams' stats in current_event_df
-            for _, row in ev_matches.iterrows():
-                home_team = row["home"]
-                away_team = row["away"]
-                home_score = row["home_score"]
-                away_score = row["away_score"]
-
-                # Locate rows for the home and away teams
-                home_idx = current_event_df.index[
-                    current_event_df["team_name"] == home_team
-                ]
-                away_idx = current_event_df.index[
-                    current_event_df["team_name"] == away_team
-                ]
-
-                # Update goals scored/conceded
-                current_event_df.loc[home_idx, "goals_scored"] += home_score
-                current_event_df.loc[home_idx, "goals_conceded"] += away_score
-                current_event_df.loc[away_idx, "goals_scored"] += away_score
-                current_event_df.loc[away_idx, "goals_conceded"] += home_score
-
-                # Update points & W-D-L
-                if home_score > away_score:
-                    # Home wins
-                    current_event_df.loc[home_idx, "points"] += 3
-                    current_event_df.loc[home_idx, "wins"] += 1
-                    current_event_df.loc[away_idx, "losses"] += 1
-                elif home_score < away_score:
-                    # Away wins
-                    current_event_df.loc[away_idx, "points"] += 3
-                    current_event_df.loc[away_idx, "wins"] += 1
-                    current_event_df.loc[home_idx, "losses"] += 1
-                else:
-                    # Draw
-                    current_event_df.loc[home_idx, "points"] += 1
-                    current_event_df.loc[away_idx, "points"] += 1
-                    current_event_df.loc[home_idx, "draws"] += 1
-                    current_event_df.loc[away_idx, "draws"] += 1
-
-            # Recompute goal_difference for all teams
-            current_event_df["goal_difference"] = (
-                current_event_df["goals_scored"] - current_event_df["goals_conceded"]
-            )
-
-            # Sort by [points desc, goal_difference desc, goals_scored desc]
-            current_event_df.sort_values(
-                by=["points", "goal_difference", "goals_scored"],
-                ascending=[False, False, False],
-                inplace=True,
-            )
-            current_event_df.reset_index(drop=True, inplace=True)
-
-            # Assign position with tie logic
-            current_event_df.loc[0, "position"] = 1
-            for i in range(1, len(current_event_df)):
-                prev_row = current_event_df.loc[i - 1]
-                curr_row = current_event_df.loc[i]
-                # If there's a tie in (points, goal_diff, goals_scored), same position
-                if (
-                    curr_row["points"] == prev_row["points"]
-                    and curr_row["goal_difference"] == prev_row["goal_difference"]
-                    and curr_row["goals_scored"] == prev_row["goals_scored"]
-                ):
-                    current_event_df.loc[i, "position"] = current_event_df.loc[
-                        i - 1, "position"
-                    ]
-                else:
-                    current_event_df.loc[i, "position"] = i + 1
+            # Re-use the cached table if these exact fixtures were already
+            # applied to these exact standings
+            current_event_df = None
+            if self.event_cache is not None:
+                cache_key = self.event_cache.key(
+                    "league_table",
+                    LEAGUE_TABLE_VERSION,
+                    ev,
+                    ev_matches,
+                    prev_event_df,
+                )
+                current_event_df = self.event_cache.get(cache_key)
+            if current_event_df is None:
+                current_event_df = event_table(prev_event_df, ev, ev_matches)
+                if self.lean_types:
+                    current_event_df = to_lean(
+                        current_event_df, "league_table", all_teams
+                    )
+                if self.event_cache is not None:
+                    self.event_cache.put(cache_key, current_event_df)
 
             # Append this event's table to our master league_positions_df
-            # final columns in order
-            final_cols = [
-                "event",
-                "team_name",
-                "position",
-                "points",
-                "goal_difference",
-                "goals_scored",
-                "goals_conceded",
-                "wins",
-                "draws",
-                "losses",
-            ]
-            # add to the final DataFrame
             self.league_positions_df = pd.concat(
-                [self.league_positions_df, current_event_df[final_cols]],
+                [self.league_positions_df, current_event_df],
                 ignore_index=True,
             )
 
             # This updated table becomes "prev_event_df" for the next iteration
-            prev_event_df = current_event_df[final_cols].copy()
+            prev_event_df = current_event_df
 
         # Return the full event-by-event table
         return self.league_positions_df
@@ -285,6 +356,11 @@ class PremierLeaguePointsCalculator:
         # Identify all unique events (e.g., 1, 2, 3, ...)
         events = sorted(self.match_results_df["event"].unique())
 
+        # Teams for the shared categorical in lean mode
+        all_teams = set(self.match_results_df["home"]) | set(
+            self.match_results_df["away"]
+        )
+
         for event in events:
             # -------------------------------------------------------
             # 1) Get the league table "before" this event starts
@@ -315,123 +391,27 @@ class PremierLeaguePointsCalculator:
             # -------------------------------------------------------
             ev_matches = self.match_results_df[self.match_results_df["event"] == event]
 
-            # A structure to hold this event's results (one row per team)
-            event_points_list = []
-
-            # We'll process each match, awarding points to home and away
-            for _, row in ev_matches.iterrows():
-                home_team = row["home"]
-                away_team = row["away"]
-                home_score = row["home_score"]
-                away_score = row["away_score"]
-
-                # ---------------------
-                # HOME TEAM
-                # ---------------------
-                # Base (win/draw/loss) points
-                if home_score > away_score:
-                    win_points = 6
-                    draw_points = 0
-                elif home_score == away_score:
-                    win_points = 0
-                    draw_points = 3
-                else:
-                    win_points = 0
-                    draw_points = 0
-
-                # Goals, clean sheet
-                goal_points = home_score
-                cs_points = 2 if away_score == 0 else 0
-
-                # Table bonus
-                table_bonus = 0
-                if home_team in team_pos_dict and away_team in team_pos_dict:
-                    home_pos = team_pos_dict[home_team]
-                    away_pos = team_pos_dict[away_team]
-                    # If the home team is facing a club "at least five places higher"
-                    # i.e. away_pos < home_pos by >= 5
-                    # (lower number = higher place, e.g. pos=1 means top)
-                    # Actually, if the away_pos is 1 and home_pos is 6 => difference = 5
-                    # => table_bonus triggered
-                    if (home_pos - away_pos) >= 5:
-                        # If it's a home team "upset" or draw
-                        if win_points == 6:
-                            table_bonus = 10  # total 16
-                        elif draw_points == 3:
-                            table_bonus = 5  # total 8
-
-                derived_points = (
-                    win_points + draw_points + goal_points + cs_points + table_bonus
-                )
-
-                event_points_list.append(
-                    {
-                        "event": event,
-                        "team": home_team,
-                        "total_points": derived_points,
-                        "total_win_points": win_points,
-                        "total_draw_points": draw_points,
-                        "total_goal_points": goal_points,
-                        "total_cs_points": cs_points,
-                        "total_table_bonus": table_bonus,
-                    }
-                )
-
-                # ---------------------
-                # AWAY TEAM
-                # ---------------------
-                if away_score > home_score:
-                    win_points = 6
-                    draw_points = 0
-                elif away_score == home_score:
-                    win_points = 0
-                    draw_points = 3
-                else:
-                    win_points = 0
-                    draw_points = 0
-
-                goal_points = away_score
-                cs_points = 2 if home_score == 0 else 0
-
-                table_bonus = 0
-                if away_team in team_pos_dict and home_team in team_pos_dict:
-                    away_pos = team_pos_dict[away_team]
-                    home_pos = team_pos_dict[home_team]
-                    # If the away team is facing a club at least 5 places higher
-                    # => (away_pos - home_pos) >= 5
-                    if (away_pos - home_pos) >= 5:
-                        if win_points == 6:
-                            table_bonus = 10
-                        elif draw_points == 3:
-                            table_bonus = 5
-
-                derived_points = (
-                    win_points + draw_points + goal_points + cs_points + table_bonus
-                )
-
-                event_points_list.append(
-                    {
-                        "event": event,
-                        "team": away_team,
-                        "total_points": derived_points,
-                        "total_win_points": win_points,
-                        "total_draw_points": draw_points,
-                        "total_goal_points": goal_points,
-                        "total_cs_points": cs_points,
-                        "total_table_bonus": table_bonus,
-                    }
-                )
-
             # -------------------------------------------------------
-            # 3) Convert this event's data into a DataFrame and store
+            # 3) Score this event's matches (or re-use a cached block)
             # -------------------------------------------------------
-            event_points_df = pd.DataFrame(event_points_list)
-
-            # If a team had multiple matches in the same event, you might want
-            # to group by team and sum. But in standard FPL logic, there's usually
-            # only one match per team per gameweek. We'll assume so. If not:
-            # event_points_df = event_points_df.groupby("team", as_index=False).sum(numeric_only=True)
-            # event_points_df["event"] = event
+            event_points_df = None
+            if self.event_cache is not None:
+                cache_key = self.event_cache.key(
+                    "assistant_manager_points",
+                    SCORING_RULES_VERSION,
+                    event,
+                    ev_matches,
+                    sorted(team_pos_dict.items()),
+                )
+                event_points_df = self.event_cache.get(cache_key)
+            if event_points_df is None:
+                event_points_df = event_points(event, team_pos_dict, ev_matches)
+                if self.lean_types:
+                    event_points_df = to_lean(
+                        event_points_df, "assistant_manager_points", all_teams
+                    )
+                if self.event_cache is not None:
+                    self.event_cache.put(cache_key, event_points_df)
 
             all_events_amp.append(event_points_df)
 
@@ -447,7 +427,11 @@ class PremierLeaguePointsCalculator:
           - fetch fixtures
           - calculate league table
           - print or save the final data
+          - append what changed since the last run to the change feed
         """
+        # Keep the previous outputs around so we can diff against them
+        previous_outputs = load_snapshot(self.data_dir)
+
         self.fetch_fixtures()  # ensure we have data
         league_df = self.calculate_league_table()
         assistant_manager_df = self.calculate_assistant_manager_points()
@@ -460,6 +444,78 @@ class PremierLeaguePointsCalculator:
         out_file = os.path.join(self.data_dir, "assistant_manager_points.csv")
         assistant_manager_df.to_csv(out_file, index=False)
 
+        # Populate the SQLite store the dashboard can query instead of the CSVs
+        write_store(
+            self.match_results_df,
+            league_df,
+            assistant_manager_df,
+            db_file=os.path.join(self.data_dir, "assistant_manager_points.sqlite"),
+        )
+
+        # Precompute chip rank and form per team per event for the dashboard
+        save_chip_standings(
+            compute_chip_standings(assistant_manager_df),
+            os.path.join(self.data_dir, STANDINGS_FILE),
+        )
+
+        # Score the private league's picks against the new AMP, if we have them
+        picks_file = os.path.join(self.data_dir, PICKS_FILE)
+        if os.path.exists(picks_file):
+            score_picks(
+                picks_file,
+                assistant_manager_df,
+                output_file=os.path.join(self.data_dir, USER_STANDINGS_FILE),
+            )
+
+        # Refresh the upcoming fixture / table bonus matrix for the dashboard
+        update_fixture_matrix(
+            self.upcoming_fixtures_df,
+            league_df,
+            os.path.join(self.data_dir, MATRIX_FILE),
+        )
+
+        # Tell consumers whether this run used live or cached fixtures
+        status_file = os.path.join(self.data_dir, "status.json")
+        with open(status_file, "w") as f:
+            json.dump(
+                {
+                    **self.fetch_status,
+                    "updated_at": datetime.now().isoformat(timespec="seconds"),
+                },
+                f,
+            )
+        if self.fetch_status["stale"]:
+            self.logger.warning(
+                f"Outputs are stale: using fixtures fetched at "
+                f"{self.fetch_status['fetched_at']}"
+            )
+
+        # Report how much memory each frame takes (compare with AMP_LEAN_TYPES=1)
+        footprint = memory_footprint(
+            {
+                "results": self.match_results_df,
+                "upcoming_fixtures": self.upcoming_fixtures_df,
+                "league_table": league_df,
+                "assistant_manager_points": assistant_manager_df,
+            }
+        )
+        for name, size in footprint.items():
+            self.logger.info(f"Memory used by {name}: {size} bytes")
+
+        # Record the rows that were added or modified by this run
+        record_changes(
+            self.data_dir,
+            previous_outputs,
+            {
+                "results": self.match_results_df,
+                "league_table": league_df,
+                "assistant_manager_points": assistant_manager_df,
+            },
+        )
+
+        # Pre-render static dashboard pages for this data version
+        export_site(self.data_dir)
+
         print("\n===== Final League Table =====")
         print(league_df.tail(20))  # show last 20 rows just for display
 
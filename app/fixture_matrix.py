@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MATRIX_FILE = "fixture_matrix.csv"
+
+# Same rule as calculate_assistant_manager_points: a team earns the table
+# bonus when its opponent is at least this many places higher
+TABLE_BONUS_GAP = 5
+
+# Positions and gaps are missing for a team with no table position yet
+MATRIX_DTYPES = {
+    "team_position": "Int64",
+    "opponent_position": "Int64",
+    "position_gap": "Int64",
+}
+
+MATRIX_COLUMNS = [
+    "event",
+    "team",
+    "opponent",
+    "venue",
+    "kickoff_time",
+    "team_position",
+    "opponent_position",
+    "position_gap",
+    "bonus_eligible",
+]
+
+
+def current_positions(league_df):
+    """
+    Positions from the latest event in the cumulative league table.
+    """
+    latest = league_df[league_df["event"] == league_df["event"].max()]
+    return dict(zip(latest["team_name"], latest["position"]))
+
+
+def _signature(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _moved(cached, positions):
+    # Missing on both sides (no position then or now) is not a move
+    cached = cached.to_numpy(dtype=float, na_value=np.nan)
+    return (cached != positions) & ~(np.isnan(cached) & np.isnan(positions))
+
+
+def _team_fixtures(upcoming_df):
+    """
+    Expand each upcoming fixture into one row per team (home and away view).
+    """
+    columns = ["event", "team", "opponent", "venue", "kickoff_time"]
+    if upcoming_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    home = pd.DataFrame(
+        {
+            "event": upcoming_df["event"],
+            "team": upcoming_df["home"],
+            "opponent": upcoming_df["away"],
+            "venue": "H",
+            "kickoff_time": upcoming_df["kickoff_time"],
+        }
+    )
+    away = pd.DataFrame(
+        {
+            "event": upcoming_df["event"],
+            "team": upcoming_df["away"],
+            "opponent": upcoming_df["home"],
+            "venue": "A",
+            "kickoff_time": upcoming_df["kickoff_time"],
+        }
+    )
+    return pd.concat([home, away], ignore_index=True)[columns]
+
+
+def update_fixture_matrix(upcoming_df, league_df, matrix_file):
+    """
+    Bring the cached fixture matrix in line with the upcoming fixtures and
+    the current standings, and save it to matrix_file.
+
+    For upcoming events we only know today's table, so the gap (and the
+    table bonus it implies) is based on the latest positions.
+
+    Nothing is recomputed when neither the fixtures nor the standings changed
+    since the last run; otherwise only rows for new fixtures or for teams
+    whose position moved are recomputed.
+    """
+    positions = {team: int(pos) for team, pos in current_positions(league_df).items()}
+    rows = _team_fixtures(upcoming_df)
+    signature = {
+        "fixtures": _signature(rows.astype(str).values.tolist()),
+        "standings": _signature(positions),
+    }
+
+    # 1) Re-use the cached matrix as-is when nothing changed
+    meta_file = f"{matrix_file}.json"
+    cached = pd.DataFrame(columns=MATRIX_COLUMNS)
+    if os.path.exists(matrix_file) and os.path.exists(meta_file):
+        with open(meta_file) as f:
+            if json.load(f) == signature:
+                logger.info("Fixture matrix is up to date")
+                return pd.read_csv(matrix_file, dtype=MATRIX_DTYPES)
+        cached = pd.read_csv(matrix_file, dtype=MATRIX_DTYPES)
+
+    # 2) Start from the cached rows of fixtures that are still upcoming;
+    #    new fixtures come in as empty rows, played ones drop out
+    keys = ["event", "team", "opponent", "venue"]
+    rows = rows.set_index(keys)
+    matrix = cached.set_index(keys).reindex(rows.index)
+    matrix["kickoff_time"] = rows["kickoff_time"]
+
+    # 3) Recompute only rows where either team's position moved (or new rows).
+    #    A team with no table row yet (e.g. a promoted side before its first
+    #    game) has no position: its gap is left missing and earns no bonus
+    team_position = (
+        rows.index.get_level_values("team").map(positions).to_numpy(dtype=float)
+    )
+    opponent_position = (
+        rows.index.get_level_values("opponent").map(positions).to_numpy(dtype=float)
+    )
+    stale = (
+        matrix["bonus_eligible"].isna().to_numpy()
+        | _moved(matrix["team_position"], team_position)
+        | _moved(matrix["opponent_position"], opponent_position)
+    )
+    gap = team_position[stale] - opponent_position[stale]
+    matrix.loc[stale, "team_position"] = team_position[stale]
+    matrix.loc[stale, "opponent_position"] = opponent_position[stale]
+    # A positive gap means the opponent sits higher in the table
+    matrix.loc[stale, "position_gap"] = gap
+    matrix.loc[stale, "bonus_eligible"] = gap >= TABLE_BONUS_GAP
+
+    matrix = (
+        matrix.reset_index()[MATRIX_COLUMNS]
+        .astype({**MATRIX_DTYPES, "bonus_eligible": bool})
+        .sort_values(["event", "kickoff_time", "team"])
+        .reset_index(drop=True)
+    )
+    matrix.to_csv(matrix_file, index=False)
+    with open(meta_file, "w") as f:
+        json.dump(signature, f)
+    logger.info(
+        f"Saved fixture matrix to {matrix_file} "
+        f"({int(stale.sum())} of {len(matrix)} rows recomputed)"
+    )
+    return matrix
@@ -0,0 +1,397 @@
+import os
+import json
+import logging
+import argparse
+import pandas as pd
+
+from fetch_data import PremierLeaguePointsCalculator
+from sqlite_store import write_store
+from metadata import TEAM_ALIASES
+
+logger = logging.getLogger(__name__)
+
+# Rows handled per chunk while streaming an archive
+DEFAULT_CHUNK_ROWS = 5000
+
+
+class TeamRegistry:
+    """
+    Maps club names (in any known spelling) to small, stable integer ids.
+
+    Chunks are stored with ids instead of repeated name strings; names are
+    only looked up again when a season is handed to the calculator.
+    """
+
+    def __init__(self, teams_dict=None):
+        self.ids = {}
+        self.names = []
+        for _, name in sorted((teams_dict or {}).items()):
+            self.id_for(name)
+
+    def normalize(self, name):
+        name = str(name).strip()
+        return TEAM_ALIASES.get(name, name)
+
+    def id_for(self, name):
+        name = self.normalize(name)
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+    def ids_for(self, names):
+        # Map the distinct names once, then broadcast back to the column
+        names = pd.Series(names)
+        mapping = {name: self.id_for(name) for name in names.unique()}
+        return names.map(mapping).to_numpy(dtype="int16")
+
+
+def iter_json_array(fp, chunk_size=1 << 16):
+    """
+    Yield the items of a top-level JSON array one at a time, reading the
+    file in chunk_size pieces instead of loading it whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer = fp.read(chunk_size)
+    pos = 0
+    started = False
+
+    while True:
+        # 1) Skip whitespace and separators, pulling in text as needed
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            buffer, pos = fp.read(chunk_size), 0
+            if not buffer:
+                raise ValueError("Unexpected end of JSON array")
+            continue
+
+        # 2) Array brackets
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+
+        # 3) Decode the next item, reading more when it spans chunks
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                raise
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+
+
+def iter_json_lines(fp):
+    for line in fp:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _team_names(team_ids, teams_by_id):
+    # Keep ids we cannot name distinct instead of merging them into one team
+    return team_ids.map(lambda team_id: teams_by_id.get(team_id, f"Unknown {team_id}"))
+
+
+def _season_teams(teams_by_season, season):
+    # FPL numbers the clubs alphabetically each season, so an id names a
+    # different club from one season to the next
+    if season not in teams_by_season:
+        raise ValueError(
+            f"No FPL teams map for season {season}; " f"pass --teams {season}=teams.csv"
+        )
+    return teams_by_season[season]
+
+
+def _fpl_frame(columns, registry, teams_by_season):
+    """
+    Build one compact chunk from column lists of FPL fixture fields, naming
+    the teams with each row's own season's map.
+    """
+    chunk = pd.DataFrame(columns)
+    chunk = chunk[chunk["team_h_score"].notna() & chunk["event"].notna()]
+    chunk["season"] = chunk["season"].astype(str)
+
+    home_ids = pd.Series(0, index=chunk.index, dtype="int16")
+    away_ids = pd.Series(0, index=chunk.index, dtype="int16")
+    for season, part in chunk.groupby("season", sort=False):
+        teams_by_id = _season_teams(teams_by_season, season)
+        home_ids[part.index] = registry.ids_for(
+            _team_names(part["team_h"], teams_by_id)
+        )
+        away_ids[part.index] = registry.ids_for(
+            _team_names(part["team_a"], teams_by_id)
+        )
+
+    return pd.DataFrame(
+        {
+            "season": chunk["season"].to_numpy(),
+            "event": chunk["event"].to_numpy(dtype="int16"),
+            "home_id": home_ids.to_numpy(),
+            "away_id": away_ids.to_numpy(),
+            "home_score": chunk["team_h_score"].to_numpy(dtype="int16"),
+            "away_score": chunk["team_a_score"].to_numpy(dtype="int16"),
+        }
+    )
+
+
+def iter_fpl_json_chunks(path, registry, teams_by_season, season, chunk_rows):
+    """
+    Stream an FPL fixtures dump (a JSON array or JSON Lines file, possibly
+    covering several seasons via a "season" field) as compact chunks.
+    """
+    fields = ["season", "event", "team_h", "team_a", "team_h_score", "team_a_score"]
+    columns = {field: [] for field in fields}
+
+    with open(path) as fp:
+        items = iter_json_lines(fp) if path.endswith(".jsonl") else iter_json_array(fp)
+        for fixture in items:
+            columns["season"].append(fixture.get("season", season))
+            for field in fields[1:]:
+                columns[field].append(fixture.get(field))
+            if len(columns["event"]) >= chunk_rows:
+                yield _fpl_frame(columns, registry, teams_by_season)
+                columns = {field: [] for field in fields}
+
+    if columns["event"]:
+        yield _fpl_frame(columns, registry, teams_by_season)
+
+
+def iter_fpl_csv_chunks(path, registry, teams_by_season, season, chunk_rows):
+    """
+    Stream an FPL-style fixtures.csv (event, team_h, team_a, scores).
+    """
+    usecols = ["event", "team_h", "team_a", "team_h_score", "team_a_score"]
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows):
+        chunk["season"] = season
+        yield _fpl_frame(chunk, registry, teams_by_season)
+
+
+def iter_football_data_chunks(path, registry, season, chunk_rows):
+    """
+    Stream a football-data.co.uk style CSV (HomeTeam, AwayTeam, FTHG, FTAG).
+
+    Those files have no gameweek column, so each match gets the next round
+    of whichever of its two teams has played more games so far.
+    """
+    usecols = ["HomeTeam", "AwayTeam", "FTHG", "FTAG"]
+    games_played = {}
+
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows):
+        chunk = chunk.dropna()
+        home_ids = registry.ids_for(chunk["HomeTeam"])
+        away_ids = registry.ids_for(chunk["AwayTeam"])
+
+        events = []
+        for home_id, away_id in zip(home_ids, away_ids):
+            event = max(games_played.get(home_id, 0), games_played.get(away_id, 0)) + 1
+            games_played[home_id] = event
+            games_played[away_id] = event
+            events.append(event)
+
+        yield pd.DataFrame(
+            {
+                "season": season,
+                "event": pd.array(events, dtype="int16"),
+                "home_id": home_ids,
+                "away_id": away_ids,
+                "home_score": chunk["FTHG"].to_numpy(dtype="int16"),
+                "away_score": chunk["FTAG"].to_numpy(dtype="int16"),
+            }
+        )
+
+
+class HistoricalImporter:
+    """
+    Import archived fixtures season by season and run the league table and
+    assistant manager points stages on each.
+
+    Archives are read in chunks and each chunk is reduced straight away to
+    a compact frame (team ids and small integer scores), so the raw payload
+    is never held in memory as a whole. Only one season's frames are kept
+    at a time: a season is imported as soon as the archive moves on to the
+    next one.
+
+    FPL archives name teams by id, and the ids change every season, so
+    teams_by_season needs a {id: name} map for each season they cover.
+    """
+
+    def __init__(
+        self, output_dir=os.path.join("data", "archive"), teams_by_season=None
+    ):
+        self.output_dir = output_dir
+        self.teams_by_season = teams_by_season or {}
+        self.registry = TeamRegistry()
+
+    def iter_seasons(self, path, fmt, season=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Yield (season, compact results DataFrame) for each season of an
+        archive, in the order they appear.
+
+        Archives are expected to list each season's fixtures together; a
+        season that turns up again after another one raises ValueError.
+        """
+        season = season or os.path.splitext(os.path.basename(path))[0]
+
+        if fmt == "fpl-json":
+            chunks = iter_fpl_json_chunks(
+                path, self.registry, self.teams_by_season, season, chunk_rows
+            )
+        elif fmt == "fpl-csv":
+            chunks = iter_fpl_csv_chunks(
+                path, self.registry, self.teams_by_season, season, chunk_rows
+            )
+        elif fmt == "football-data":
+            chunks = iter_football_data_chunks(path, self.registry, season, chunk_rows)
+        else:
+            raise ValueError(f"Unknown archive format: {fmt}")
+
+        current, parts, done = None, [], set()
+        rows = 0
+        for chunk in chunks:
+            rows += len(chunk)
+            # Consecutive runs of one season within the chunk
+            runs = (chunk["season"] != chunk["season"].shift()).cumsum()
+            for _, part in chunk.groupby(runs):
+                chunk_season = part["season"].iat[0]
+                if chunk_season != current:
+                    if parts:
+                        yield current, pd.concat(parts, ignore_index=True)
+                        done.add(current)
+                    if chunk_season in done:
+                        raise ValueError(
+                            f"{path} is not grouped by season: "
+                            f"{chunk_season} appears again after {current}"
+                        )
+                    current, parts = chunk_season, []
+                parts.append(part.drop(columns="season"))
+        if parts:
+            yield current, pd.concat(parts, ignore_index=True)
+
+        logger.info(f"Read {rows} completed matches from {path}")
+
+    def to_results(self, compact_df):
+        """
+        Turn a compact season frame back into the results.csv layout.
+        """
+        names = pd.Series(self.registry.names)
+        return pd.DataFrame(
+            {
+                "event": compact_df["event"].astype(int),
+                "home": names[compact_df["home_id"]].to_numpy(),
+                "away": names[compact_df["away_id"]].to_numpy(),
+                "home_score": compact_df["home_score"].astype(int),
+                "away_score": compact_df["away_score"].astype(int),
+            }
+        )
+
+    def import_file(self, path, fmt, league="premier-league", season=None, **kwargs):
+        """
+        Import one archive and write results, league table, AMP and a SQLite
+        store for every season it contains under output_dir/league/season.
+        """
+        imported = []
+        for season_name, compact_df in self.iter_seasons(
+            path, fmt, season=season, **kwargs
+        ):
+            calculator = PremierLeaguePointsCalculator(
+                data_dir=os.path.join(self.output_dir, league, season_name)
+            )
+            calculator.match_results_df = self.to_results(compact_df)
+
+            league_df = calculator.calculate_league_table()
+            amp_df = calculator.calculate_assistant_manager_points()
+
+            outputs = {
+                "results.csv": calculator.match_results_df,
+                "final_league_table.csv": league_df,
+                "assistant_manager_points.csv": amp_df,
+            }
+            for file_name, df in outputs.items():
+                df.to_csv(os.path.join(calculator.data_dir, file_name), index=False)
+            write_store(
+                calculator.match_results_df,
+                league_df,
+                amp_df,
+                db_file=os.path.join(
+                    calculator.data_dir, "assistant_manager_points.sqlite"
+                ),
+            )
+            logger.info(f"Imported {league} {season_name} into {calculator.data_dir}")
+            imported.append(calculator.data_dir)
+        return imported
+
+
+def load_teams_file(path):
+    """
+    Read an FPL teams.csv / teams.json (id, name), or that season's saved
+    bootstrap-static response, into {id: name}.
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            teams = json.load(f)
+        if isinstance(teams, dict):
+            teams = teams["teams"]
+    else:
+        teams = pd.read_csv(path, usecols=["id", "name"]).to_dict("records")
+    return {int(team["id"]): team["name"] for team in teams}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import archived fixtures and compute tables and AMP."
+    )
+    parser.add_argument("paths", nargs="+", help="Archive files to import")
+    parser.add_argument(
+        "--format",
+        required=True,
+        choices=["fpl-json", "fpl-csv", "football-data"],
+    )
+    parser.add_argument("--league", default="premier-league")
+    parser.add_argument("--season", help="Season label (default: file name)")
+    parser.add_argument(
+        "--teams",
+        action="append",
+        default=[],
+        metavar="[SEASON=]PATH",
+        help="FPL teams file (or bootstrap-static JSON) mapping that season's "
+        "ids to names. Give one per season; a bare PATH is for --season",
+    )
+    parser.add_argument("--output-dir", default=os.path.join("data", "archive"))
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    # Log to the console; otherwise the first season's calculator would send
+    # every season's log to its own directory
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s: %(message)s"
+    )
+
+    teams_by_season = {}
+    for item in args.teams:
+        season, _, path = item.rpartition("=")
+        if not season:
+            if not args.season:
+                parser.error(f"--teams {item} needs a season: SEASON={item}")
+            season = args.season
+        teams_by_season[season] = load_teams_file(path)
+
+    importer = HistoricalImporter(args.output_dir, teams_by_season)
+    for path in args.paths:
+        importer.import_file(
+            path,
+            args.format,
+            league=args.league,
+            season=args.season,
+            chunk_rows=args.chunk_rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Set AMP_LEAN_TYPES=1 to use compact dtypes in the pipeline and dashboard
+LEAN_TYPES = os.environ.get("AMP_LEAN_TYPES", "0") == "1"
+
+# Compact dtypes per output. Per-match and per-event values fit in int8;
+# season totals (points, goals) need int16. Team columns are categorical.
+LEAN_DTYPES = {
+    "results": {
+        "event": "int8",
+        "home": "category",
+        "away": "category",
+        "home_score": "int8",
+        "away_score": "int8",
+    },
+    "upcoming_fixtures": {
+        "event": "int8",
+        "home": "category",
+        "away": "category",
+    },
+    "league_table": {
+        "event": "int8",
+        "team_name": "category",
+        "position": "int8",
+        "points": "int16",
+        "goal_difference": "int16",
+        "goals_scored": "int16",
+        "goals_conceded": "int16",
+        "wins": "int8",
+        "draws": "int8",
+        "losses": "int8",
+    },
+    "assistant_manager_points": {
+        "event": "int8",
+        "team": "category",
+        "total_points": "int16",
+        "total_win_points": "int8",
+        "total_draw_points": "int8",
+        "total_goal_points": "int8",
+        "total_cs_points": "int8",
+        "total_table_bonus": "int8",
+    },
+}
+
+
+def lean_dtypes(kind, teams=None):
+    """
+    The compact dtypes for one kind of frame (applied by to_lean).
+
+    Passing the list of teams gives every team column the same categorical
+    dtype, so frames built separately can still be concatenated as categories.
+    """
+    team_dtype = pd.CategoricalDtype(sorted(teams)) if teams is not None else "category"
+    return {
+        column: team_dtype if dtype == "category" else dtype
+        for column, dtype in LEAN_DTYPES[kind].items()
+    }
+
+
+def _fits(values, dtype):
+    # An empty or all-missing column has no range to check
+    info = np.iinfo(dtype)
+    low, high = values.min(), values.max()
+    return pd.isna(low) or (low >= info.min and high <= info.max)
+
+
+def to_lean(df, kind, teams=None):
+    """
+    Convert the columns of df that have a compact dtype; others are kept.
+
+    Casting to int8/int16 wraps out-of-range values around silently, so an
+    integer column with a value outside its compact dtype keeps its current
+    (wider) dtype instead.
+    """
+    dtypes = {}
+    for col, dtype in lean_dtypes(kind, teams).items():
+        if col not in df:
+            continue
+        if (
+            isinstance(dtype, str)
+            and dtype.startswith("int")
+            and pd.api.types.is_numeric_dtype(df[col])
+            and not _fits(df[col], dtype)
+        ):
+            logger.warning(
+                f"{kind}.{col} has values outside {dtype}; keeping {df[col].dtype}"
+            )
+            continue
+        dtypes[col] = dtype
+    return df.astype(dtypes)
+
+
+def read_lean_csv(path, kind):
+    """
+    Read a CSV output into compact dtypes: team names are parsed straight
+    into categories, integer columns go through to_lean's range check
+    (read_csv would wrap them around like astype).
+    """
+    categories = {
+        column: "category"
+        for column, dtype in LEAN_DTYPES[kind].items()
+        if dtype == "category"
+    }
+    return to_lean(pd.read_csv(path, dtype=categories), kind)
+
+
+def memory_footprint(frames):
+    """
+    Bytes used by each frame (including string contents), by name.
+    """
+    return {name: int(df.memory_usage(deep=True).sum()) for name, df in frames.items()}
@@ -0,0 +1,142 @@
+import os
+import json
+import hashlib
+import logging
+
+from resilient_fetch import UpstreamUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Derived season metadata, rewritten only when its version changes
+METADATA_FILE = "metadata.json"
+
+# Club badges by FPL team code
+BADGE_URL = "https://resources.premierleague.com/premierleague/badges/70/t{code}.png"
+
+# FPL element_type of assistant managers
+MANAGER_ELEMENT_TYPE = 5
+
+# Other spellings of club names (FPL, archives) -> the names used here
+TEAM_ALIASES = {
+    "AFC Bournemouth": "Bournemouth",
+    "Brighton & Hove Albion": "Brighton",
+    "Brighton and Hove Albion": "Brighton",
+    "Ipswich Town": "Ipswich",
+    "Leeds United": "Leeds",
+    "Leicester City": "Leicester",
+    "Luton Town": "Luton",
+    "Man United": "Man Utd",
+    "Manchester City": "Man City",
+    "Manchester United": "Man Utd",
+    "Newcastle United": "Newcastle",
+    "Nott'm Forest": "Nottingham Forest",
+    "Nottingham": "Nottingham Forest",
+    "Sheffield United": "Sheffield Utd",
+    "Tottenham": "Spurs",
+    "Tottenham Hotspur": "Spurs",
+    "West Brom": "West Brom",
+    "West Bromwich Albion": "West Brom",
+    "West Ham United": "West Ham",
+    "Wolverhampton": "Wolves",
+    "Wolverhampton Wanderers": "Wolves",
+}
+
+
+def normalize_team(name):
+    return TEAM_ALIASES.get(name, name)
+
+
+def parse_bootstrap(payload):
+    """
+    Pull what we use out of an FPL bootstrap-static payload:
+
+    - teams: {team id: name} (replaces the hard-coded teams_dict)
+    - logos: {name: badge url}
+    - managers: {name: [manager, "£x.xm"]} from the assistant managers
+    - events: id, deadline and status of every gameweek
+    """
+    teams = {}
+    logos = {}
+    for team in payload.get("teams", []):
+        name = normalize_team(team["name"])
+        teams[str(team["id"])] = name
+        if team.get("code") is not None:
+            logos[name] = BADGE_URL.format(code=team["code"])
+
+    managers = {}
+    for element in payload.get("elements", []):
+        if element.get("element_type") != MANAGER_ELEMENT_TYPE:
+            continue
+        team = teams.get(str(element.get("team")))
+        if team is None:
+            continue
+        manager = f"{element.get('first_name', '')} {element.get('second_name', '')}"
+        price = f"£{element.get('now_cost', 0) / 10:.1f}m"
+        managers[team] = [manager.strip() or element.get("web_name", "N/A"), price]
+
+    events = [
+        {
+            "id": event["id"],
+            "deadline_time": event.get("deadline_time"),
+            "finished": event.get("finished", False),
+            "is_current": event.get("is_current", False),
+        }
+        for event in payload.get("events", [])
+    ]
+    return {"teams": teams, "logos": logos, "managers": managers, "events": events}
+
+
+def metadata_version(metadata):
+    content = {key: value for key, value in metadata.items() if key != "version"}
+    encoded = json.dumps(content, sort_keys=True).encode()
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def load_metadata(path):
+    """
+    The saved metadata, or None if there is none yet.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_metadata(metadata, path):
+    """
+    Write metadata stamped with its version. If the saved file already has
+    that version it is left untouched (so readers keyed on the file do not
+    reload). Returns True when the file was written.
+    """
+    metadata = {**metadata, "version": metadata_version(metadata)}
+    saved = load_metadata(path)
+    if saved is not None and saved.get("version") == metadata["version"]:
+        return False
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved metadata version {metadata['version']} to {path}")
+    return True
+
+
+def fetch_metadata(fetcher, base_url, path):
+    """
+    Fetch bootstrap-static and refresh the saved metadata.
+
+    Falls back to the saved metadata (or None) when the upstream and the
+    fetcher's cached snapshot are both unavailable.
+    """
+    try:
+        payload, _ = fetcher.fetch_json(f"{base_url}/bootstrap-static/", "bootstrap")
+    except UpstreamUnavailable as e:
+        logger.warning(f"No metadata from the API, using the saved copy: {e}")
+        return load_metadata(path)
+
+    metadata = parse_bootstrap(payload)
+    if not metadata["teams"]:
+        logger.warning("bootstrap-static had no teams, using the saved metadata")
+        return load_metadata(path)
+    save_metadata(metadata, path)
+    return load_metadata(path)
@@ -0,0 +1,299 @@
+import os
+import json
+import bisect
+import hashlib
+import logging
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# The pipeline outputs this service reads (all relative to data_dir)
+DATA_FILES = {
+    "results": "results.csv",
+    "league_table": "final_league_table.csv",
+    "assistant_manager_points": "assistant_manager_points.csv",
+}
+
+
+def data_version(paths):
+    """
+    Short content hash of the given files; changes whenever any of them does.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def records(df):
+    """
+    df.to_dict("records") with missing values (e.g. no kickoff time yet) as
+    None, since NaN is not valid JSON.
+    """
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _files_signature(paths):
+    return tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+
+
+class LeagueIndex:
+    """
+    Read-only, in-memory index over the computed outputs.
+
+    Everything is grouped once at load time so each endpoint is a dict lookup
+    (plus a bisect for AMP ranges) instead of a DataFrame filter.
+    """
+
+    def __init__(self, data_dir="data"):
+        self.paths = [os.path.join(data_dir, name) for name in DATA_FILES.values()]
+        self.signature = _files_signature(self.paths)
+        self.version = data_version(self.paths)
+
+        results_df = pd.read_csv(self.paths[0])
+        league_df = pd.read_csv(self.paths[1])
+        amp_df = pd.read_csv(self.paths[2])
+
+        # Kept for what-if scenarios, which are set up on first use
+        self.frames = (results_df, league_df, amp_df)
+        self._what_if = None
+
+        # 1) League table: event -> rows ordered by position
+        league_df = league_df.sort_values(["event", "position", "team_name"])
+        self.standings_by_event = {
+            int(ev): records(group) for ev, group in league_df.groupby("event")
+        }
+
+        # 2) Matches: event -> rows
+        self.matches_by_event = {
+            int(ev): records(group) for ev, group in results_df.groupby("event")
+        }
+
+        # 3) AMP per team, with running totals for O(log n) range sums
+        amp_df = amp_df.sort_values(["team", "event"])
+        self.amp_by_team = {}
+        for team, group in amp_df.groupby("team"):
+            self.amp_by_team[team] = {
+                "events": group["event"].tolist(),
+                "cumulative": group["total_points"].cumsum().tolist(),
+                "rows": records(group),
+            }
+
+        self.events = sorted(self.standings_by_event)
+        logger.info(f"Loaded query index version {self.version} from {data_dir}")
+
+    def standings(self, event=None):
+        if event is None:
+            event = self.events[-1]
+        return self.standings_by_event.get(event)
+
+    def matches(self, event):
+        return self.matches_by_event.get(event, [])
+
+    def team_amp(self, team):
+        entry = self.amp_by_team.get(team)
+        if entry is None:
+            return None
+        return {
+            "team": team,
+            "total_points": entry["cumulative"][-1] if entry["cumulative"] else 0,
+            "events": entry["rows"],
+        }
+
+    def what_if(self, overrides):
+        """
+        The effect of "event:home:away:h-a,..." score overrides on the
+        standings and AMP (see app/what_if.py).
+        """
+        # Imported here: what_if takes DATA_FILES from this module
+        from what_if import WhatIf, parse_overrides
+
+        if self._what_if is None:
+            self._what_if = WhatIf(*self.frames)
+        return self._what_if.compare(parse_overrides(overrides))
+
+    def amp_range(self, first_event, last_event):
+        """
+        Total AMP per team for events first_event..last_event (inclusive).
+        """
+        totals = []
+        for team, entry in self.amp_by_team.items():
+            events, cumulative = entry["events"], entry["cumulative"]
+            lo = bisect.bisect_left(events, first_event)
+            hi = bisect.bisect_right(events, last_event)
+            points = (cumulative[hi - 1] if hi else 0) - (
+                cumulative[lo - 1] if lo else 0
+            )
+            totals.append({"team": team, "total_points": points, "games": hi - lo})
+        totals.sort(key=lambda row: (-row["total_points"], row["team"]))
+        return totals
+
+
+class QueryAPI:
+    """
+    Routes requests to the current LeagueIndex and caches rendered bodies.
+
+    The index is reloaded (at most every reload_interval seconds) when the
+    output files change. Cache entries and ETags are keyed on the data
+    version, so a reload invalidates them.
+    """
+
+    def __init__(self, data_dir="data", reload_interval=5.0, cache_size=1024):
+        self.data_dir = data_dir
+        self.reload_interval = reload_interval
+        self.cache_size = cache_size
+        self.index = LeagueIndex(data_dir)
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.last_check = time.monotonic()
+
+    def current_index(self):
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_check >= self.reload_interval:
+                self.last_check = now
+                if _files_signature(self.index.paths) != self.index.signature:
+                    self.index = LeagueIndex(self.data_dir)
+                    self.cache.clear()
+            return self.index
+
+    def etag(self, index, key):
+        digest = hashlib.sha1(f"{index.version}|{key}".encode()).hexdigest()[:16]
+        return f'"{digest}"'
+
+    def handle(self, raw_path, if_none_match=None):
+        """
+        Return (status, body_bytes, etag) for a GET request path.
+        """
+        parsed = urlparse(raw_path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        key = f"{parsed.path}?{sorted(params.items())}"
+
+        index = self.current_index()
+        etag = self.etag(index, key)
+        if if_none_match is not None and etag in if_none_match:
+            return 304, b"", etag
+
+        with self.lock:
+            cached = self.cache.get((index.version, key))
+            if cached is not None:
+                self.cache.move_to_end((index.version, key))
+                return cached[0], cached[1], etag
+
+        try:
+            status, payload = self.route(index, parsed.path, params)
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+
+        body = json.dumps(
+            {"version": index.version, "data": payload}, allow_nan=False
+        ).encode()
+        if status == 200:
+            with self.lock:
+                self.cache[(index.version, key)] = (status, body)
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return status, body, etag
+
+    def route(self, index, path, params):
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+
+        if parts == ["standings"]:
+            event = int(params["event"]) if "event" in params else None
+            rows = index.standings(event)
+            if rows is None:
+                return 404, {"error": f"Unknown event {event}"}
+            return 200, rows
+
+        if parts == ["matches"]:
+            if "event" not in params:
+                raise ValueError("Missing 'event' parameter")
+            return 200, index.matches(int(params["event"]))
+
+        if len(parts) == 3 and parts[:2] == ["amp", "team"]:
+            team_amp = index.team_amp(parts[2])
+            if team_amp is None:
+                return 404, {"error": f"Unknown team {parts[2]}"}
+            return 200, team_amp
+
+        if parts == ["amp", "range"]:
+            first_event = int(params.get("from", index.events[0]))
+            last_event = int(params.get("to", index.events[-1]))
+            if first_event > last_event:
+                raise ValueError("'from' must not be after 'to'")
+            return 200, index.amp_range(first_event, last_event)
+
+        if parts == ["whatif"]:
+            if "overrides" not in params:
+                raise ValueError("Missing 'overrides' parameter")
+            effect = index.what_if(params["overrides"])
+            return 200, {
+                "recomputed_events": effect["recomputed_events"],
+                "standings": records(effect["standings"]),
+                "amp_totals": records(effect["amp_totals"]),
+                "amp_changes": records(effect["amp_changes"]),
+            }
+
+        if parts == ["version"]:
+            return 200, {"events": index.events}
+
+        return 404, {"error": f"Unknown endpoint {path}"}
+
+
+def make_handler(api):
+    class QueryRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, body, etag = api.handle(
+                self.path, self.headers.get("If-None-Match")
+            )
+            self.send_response(status)
+            if status in (200, 304):
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            if status != 304:
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return QueryRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve standings and assistant manager points as JSON."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s: %(message)s"
+    )
+    api = QueryAPI(args.data_dir)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(api))
+    logger.info(f"Serving query API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
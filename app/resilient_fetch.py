@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import random
+import logging
+from datetime import datetime, timezone
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamUnavailable(Exception):
+    """
+    Raised when the upstream failed and there is no cached payload to use.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing.
+
+    After failure_threshold consecutive failures the breaker opens and
+    requests are refused until reset_timeout seconds have passed. Then one
+    trial request is let through (half-open): success closes the breaker,
+    failure opens it again.
+
+    When state_file is given the state survives between pipeline runs, so a
+    scheduled refresh does not keep hammering an upstream that is down.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0, state_file=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state_file = state_file
+        self.failures = 0
+        self.opened_at = None
+        self._load()
+
+    def _load(self):
+        if self.state_file and os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                state = json.load(f)
+            self.failures = state.get("failures", 0)
+            self.opened_at = state.get("opened_at")
+
+    def _save(self):
+        if self.state_file:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with open(self.state_file, "w") as f:
+                json.dump({"failures": self.failures, "opened_at": self.opened_at}, f)
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self):
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._save()
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.state == "half-open":
+            self.opened_at = time.time()
+        self._save()
+
+
+class ResilientFetcher:
+    """
+    GET JSON from an upstream with bounded latency.
+
+    - every request has a connect and read timeout
+    - failed attempts are retried with exponential backoff and full jitter
+    - the whole fetch (attempts plus waits) stays within `deadline` seconds
+    - a circuit breaker skips the upstream while it is known to be down
+    - each good payload is saved as a snapshot; when the upstream fails the
+      last good snapshot is returned instead and marked as stale
+    """
+
+    def __init__(
+        self,
+        cache_dir=os.path.join("data", "cache"),
+        session=None,
+        connect_timeout=3.05,
+        read_timeout=10.0,
+        max_attempts=4,
+        backoff_base=0.5,
+        backoff_cap=8.0,
+        deadline=30.0,
+        breaker=None,
+    ):
+        self.cache_dir = cache_dir
+        self.session = session or requests.Session()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.deadline = deadline
+        self.breaker = breaker or CircuitBreaker(
+            state_file=os.path.join(cache_dir, "circuit_breaker.json")
+        )
+
+    def snapshot_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def fetch_json(self, url, name):
+        """
+        Fetch url and return (payload, status).
+
+        status describes where the payload came from:
+        {"source": "live" | "cache", "stale": bool, "fetched_at": ..., "error": ...}
+        """
+        started = time.monotonic()
+        error = None
+
+        if not self.breaker.allow_request():
+            error = "circuit breaker open"
+            logger.warning(f"Skipping {url}: {error}")
+        else:
+            for attempt in range(self.max_attempts):
+                remaining = self.deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                try:
+                    response = self.session.get(
+                        url,
+                        timeout=(
+                            min(self.connect_timeout, remaining),
+                            min(self.read_timeout, remaining),
+                        ),
+                    )
+                    response.raise_for_status()
+                    payload = response.json()
+                except (requests.RequestException, ValueError) as e:
+                    error = str(e)
+                    self.breaker.record_failure()
+                    logger.warning(f"Attempt {attempt + 1} for {url} failed: {e}")
+
+                    # Client errors (other than rate limiting) will not heal
+                    status_code = getattr(
+                        getattr(e, "response", None), "status_code", None
+                    )
+                    if (
+                        status_code is not None
+                        and 400 <= status_code < 500
+                        and status_code != 429
+                    ):
+                        break
+                    if not self.breaker.allow_request():
+                        break
+
+                    delay = random.uniform(
+                        0, min(self.backoff_cap, self.backoff_base * 2**attempt)
+                    )
+                    if time.monotonic() - started + delay >= self.deadline:
+                        break
+                    if attempt + 1 < self.max_attempts:
+                        time.sleep(delay)
+                    continue
+
+                self.breaker.record_success()
+                fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                self._save_snapshot(name, payload, fetched_at)
+                return payload, {
+                    "source": "live",
+                    "stale": False,
+                    "fetched_at": fetched_at,
+                    "error": None,
+                }
+
+        return self._fallback(name, error)
+
+    def _save_snapshot(self, name, payload, fetched_at):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.snapshot_path(name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fetched_at": fetched_at, "payload": payload}, f)
+        os.replace(tmp_path, path)
+
+    def _fallback(self, name, error):
+        path = self.snapshot_path(name)
+        if not os.path.exists(path):
+            raise UpstreamUnavailable(f"{name}: {error} (no cached snapshot)")
+
+        with open(path) as f:
+            snapshot = json.load(f)
+        logger.warning(
+            f"Using cached {name} from {snapshot['fetched_at']} after error: {error}"
+        )
+        return snapshot["payload"], {
+            "source": "cache",
+            "stale": True,
+            "fetched_at": snapshot["fetched_at"],
+            "error": error,
+        }
@@ -0,0 +1,217 @@
+import pandas as pd
+
+# Bump whenever the Assistant Manager Points rules change, so cached
+# per-event points computed under the old rules are not re-used
+SCORING_RULES_VERSION = 1
+
+# Bump whenever event_table changes, so cached per-event league tables
+# built by the old code are not re-used
+LEAGUE_TABLE_VERSION = 2
+
+
+def event_table(prev_event_df, ev, ev_matches):
+    """
+    Apply one event's matches to the previous event's standings and
+    return the new standings (sorted, with positions assigned).
+    """
+    # Make a copy of the previous event's table
+    current_event_df = prev_event_df.copy(deep=True)
+    current_event_df["event"] = ev
+
+    # One row per team per match (home and away sides), so every stat can
+    # be summed per team at once instead of updating row by row
+    scored = pd.concat(
+        [ev_matches["home_score"], ev_matches["away_score"]], ignore_index=True
+    ).astype(int)
+    conceded = pd.concat(
+        [ev_matches["away_score"], ev_matches["home_score"]], ignore_index=True
+    ).astype(int)
+    sides = pd.DataFrame(
+        {
+            "team_name": pd.concat(
+                [ev_matches["home"], ev_matches["away"]], ignore_index=True
+            ).astype(str),
+            "goals_scored": scored,
+            "goals_conceded": conceded,
+            "wins": (scored > conceded).astype(int),
+            "draws": (scored == conceded).astype(int),
+            "losses": (scored < conceded).astype(int),
+        }
+    )
+    # Win = 3 points, draw = 1
+    sides["points"] = 3 * sides["wins"] + sides["draws"]
+    totals = sides.groupby("team_name").sum()
+
+    # Add this event's totals to each team's stats
+    team_names = current_event_df["team_name"].astype(str)
+    for col in ["points", "goals_scored", "goals_conceded", "wins", "draws", "losses"]:
+        current_event_df[col] = (
+            current_event_df[col]
+            + team_names.map(totals[col]).fillna(0).astype(int).to_numpy()
+        )
+
+    # Recompute goal_difference for all teams
+    current_event_df["goal_difference"] = (
+        current_event_df["goals_scored"] - current_event_df["goals_conceded"]
+    )
+
+    # Sort by [points desc, goal_difference desc, goals_scored desc]
+    current_event_df.sort_values(
+        by=["points", "goal_difference", "goals_scored"],
+        ascending=[False, False, False],
+        inplace=True,
+    )
+    current_event_df.reset_index(drop=True, inplace=True)
+
+    # Assign position with tie logic: a team tied with the one above it on
+    # (points, goal_diff, goals_scored) shares its position, otherwise it
+    # takes its row number
+    tie_keys = current_event_df[["points", "goal_difference", "goals_scored"]]
+    new_group = (tie_keys != tie_keys.shift()).any(axis=1)
+    current_event_df["position"] = (
+        pd.Series(range(1, len(current_event_df) + 1))
+        .where(new_group)
+        .ffill()
+        .astype(int)
+    )
+
+    # final columns in order
+    final_cols = [
+        "event",
+        "team_name",
+        "position",
+        "points",
+        "goal_difference",
+        "goals_scored",
+        "goals_conceded",
+        "wins",
+        "draws",
+        "losses",
+    ]
+    return current_event_df[final_cols].copy()
+
+
+def event_points(event, team_pos_dict, ev_matches):
+    """
+    Assistant Manager Points for one event's matches, given each team's
+    position before the event (team_pos_dict).
+    """
+    # A structure to hold this event's results (one row per team)
+    event_points_list = []
+
+    # We'll process each match, awarding points to home and away
+    for _, row in ev_matches.iterrows():
+        home_team = row["home"]
+        away_team = row["away"]
+        home_score = row["home_score"]
+        away_score = row["away_score"]
+
+        # ---------------------
+        # HOME TEAM
+        # ---------------------
+        # Base (win/draw/loss) points
+        if home_score > away_score:
+            win_points = 6
+            draw_points = 0
+        elif home_score == away_score:
+            win_points = 0
+            draw_points = 3
+        else:
+            win_points = 0
+            draw_points = 0
+
+        # Goals, clean sheet
+        goal_points = home_score
+        cs_points = 2 if away_score == 0 else 0
+
+        # Table bonus
+        table_bonus = 0
+        if home_team in team_pos_dict and away_team in team_pos_dict:
+            home_pos = team_pos_dict[home_team]
+            away_pos = team_pos_dict[away_team]
+            # If the home team is facing a club "at least five places higher"
+            # i.e. away_pos < home_pos by >= 5
+            # (lower number = higher place, e.g. pos=1 means top)
+            # Actually, if the away_pos is 1 and home_pos is 6 => difference = 5
+            # => table_bonus triggered
+            if (home_pos - away_pos) >= 5:
+                # If it's a home team "upset" or draw
+                if win_points == 6:
+                    table_bonus = 10  # total 16
+                elif draw_points == 3:
+                    table_bonus = 5  # total 8
+
+        derived_points = (
+            win_points + draw_points + goal_points + cs_points + table_bonus
+        )
+
+        event_points_list.append(
+            {
+                "event": event,
+                "team": home_team,
+                "total_points": derived_points,
+                "total_win_points": win_points,
+                "total_draw_points": draw_points,
+                "total_goal_points": goal_points,
+                "total_cs_points": cs_points,
+                "total_table_bonus": table_bonus,
+            }
+        )
+
+        # ---------------------
+        # AWAY TEAM
+        # ---------------------
+        if away_score > home_score:
+            win_points = 6
+            draw_points = 0
+        elif away_score == home_score:
+            win_points = 0
+            draw_points = 3
+        else:
+            win_points = 0
+            draw_points = 0
+
+        goal_points = away_score
+        cs_points = 2 if home_score == 0 else 0
+
+        table_bonus = 0
+        if away_team in team_pos_dict and home_team in team_pos_dict:
+            away_pos = team_pos_dict[away_team]
+            home_pos = team_pos_dict[home_team]
+            # If the away team is facing a club at least 5 places higher
+            # => (away_pos - home_pos) >= 5
+            if (away_pos - home_pos) >= 5:
+                if win_points == 6:
+                    table_bonus = 10
+                elif draw_points == 3:
+                    table_bonus = 5
+
+        derived_points = (
+            win_points + draw_points + goal_points + cs_points + table_bonus
+        )
+
+        event_points_list.append(
+            {
+                "event": event,
+                "team": away_team,
+                "total_points": derived_points,
+                "total_win_points": win_points,
+                "total_draw_points": draw_points,
+                "total_goal_points": goal_points,
+                "total_cs_points": cs_points,
+                "total_table_bonus": table_bonus,
+            }
+        )
+
+    # -------------------------------------------------------
+    # 3) Convert this event's data into a DataFrame and store
+    # -------------------------------------------------------
+    event_points_df = pd.DataFrame(event_points_list)
+
+    # If a team had multiple matches in the same event, you might want
+    # to group by team and sum. But in standard FPL logic, there's usually
+    # only one match per team per gameweek. We'll assume so. If not:
+    # event_points_df = event_points_df.groupby("team", as_index=False).sum(numeric_only=True)
+    # event_points_df["event"] = event
+
+    return event_points_df
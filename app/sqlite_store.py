@@ -0,0 +1,325 @@
+import os
+import sqlite3
+import threading
+import logging
+import pandas as pd
+
+# Default location of the SQLite data file, next to the CSV outputs
+DEFAULT_DB_FILE = os.path.join("data", "assistant_manager_points.sqlite")
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------
+# Schema
+# -------------------------------------------------------
+# Table name -> the columns we persist (in order)
+TABLE_COLUMNS = {
+    "results": ["event", "home", "away", "home_score", "away_score"],
+    "league_table": [
+        "event",
+        "team_name",
+        "position",
+        "points",
+        "goal_difference",
+        "goals_scored",
+        "goals_conceded",
+        "wins",
+        "draws",
+        "losses",
+    ],
+    "assistant_manager_points": [
+        "event",
+        "team",
+        "total_points",
+        "total_win_points",
+        "total_draw_points",
+        "total_goal_points",
+        "total_cs_points",
+        "total_table_bonus",
+    ],
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_amp_team_event ON assistant_manager_points (team, event)",
+    "CREATE INDEX IF NOT EXISTS idx_amp_event ON assistant_manager_points (event)",
+    "CREATE INDEX IF NOT EXISTS idx_league_team_event ON league_table (team_name, event)",
+    "CREATE INDEX IF NOT EXISTS idx_league_event ON league_table (event)",
+    "CREATE INDEX IF NOT EXISTS idx_results_event ON results (event)",
+    "CREATE INDEX IF NOT EXISTS idx_results_home_event ON results (home, event)",
+    "CREATE INDEX IF NOT EXISTS idx_results_away_event ON results (away, event)",
+]
+
+
+# -------------------------------------------------------
+# Queries (one per dashboard page)
+# -------------------------------------------------------
+# These are module constants on purpose: sqlite3 keeps a per-connection cache
+# of prepared statements keyed by the SQL text, so re-using the exact same
+# string with different parameters re-uses the compiled statement.
+OVERALL_TOTALS_SQL = """
+SELECT team,
+       SUM(total_points) AS total_points,
+       COUNT(event) AS games_played,
+       SUM(total_table_bonus) AS total_table_bonus
+FROM assistant_manager_points
+GROUP BY team
+ORDER BY total_points DESC
+"""
+
+# Events are passed as a JSON array so that any selection of gameweeks
+# maps onto the same prepared statement.
+GAMEWEEK_BREAKDOWN_SQL = """
+SELECT team,
+       SUM(total_points) AS total_points,
+       SUM(total_win_points) AS total_win_points,
+       SUM(total_goal_points) AS total_goal_points,
+       SUM(total_cs_points) AS total_cs_points,
+       SUM(total_table_bonus) AS total_table_bonus
+FROM assistant_manager_points
+WHERE event IN (SELECT value FROM json_each(?))
+GROUP BY team
+ORDER BY team
+"""
+
+EVENT_MATCHES_SQL = """
+SELECT event, home, away, home_score, away_score
+FROM results
+WHERE event IN (SELECT value FROM json_each(?))
+ORDER BY event
+"""
+
+TEAM_HISTORY_SQL = """
+SELECT event, team, total_points, total_win_points, total_draw_points,
+       total_goal_points, total_cs_points, total_table_bonus
+FROM assistant_manager_points
+WHERE team = ?
+ORDER BY event
+"""
+
+TEAM_MATCHES_SQL = """
+SELECT event, home, away, home_score, away_score
+FROM results
+WHERE home = ? OR away = ?
+ORDER BY event
+"""
+
+# Paged variants: only the visible slice of a list is read. rowid breaks ties
+# within an event so consecutive pages never overlap or skip rows.
+EVENT_MATCHES_PAGE_SQL = """
+SELECT event, home, away, home_score, away_score
+FROM results
+WHERE event IN (SELECT value FROM json_each(?))
+ORDER BY event, rowid
+LIMIT ? OFFSET ?
+"""
+
+EVENT_MATCHES_COUNT_SQL = """
+SELECT COUNT(*) AS n
+FROM results
+WHERE event IN (SELECT value FROM json_each(?))
+"""
+
+TEAM_HISTORY_PAGE_SQL = """
+SELECT event, team, total_points, total_win_points, total_draw_points,
+       total_goal_points, total_cs_points, total_table_bonus
+FROM assistant_manager_points
+WHERE team = ?
+ORDER BY event, rowid
+LIMIT ? OFFSET ?
+"""
+
+TEAM_MATCHES_PAGE_SQL = """
+SELECT event, home, away, home_score, away_score
+FROM results
+WHERE home = ? OR away = ?
+ORDER BY event, rowid
+LIMIT ? OFFSET ?
+"""
+
+TEAM_MATCHES_COUNT_SQL = """
+SELECT COUNT(*) AS n
+FROM results
+WHERE home = ? OR away = ?
+"""
+
+# A team's totals, so the metrics do not need its full history
+TEAM_SUMMARY_SQL = """
+SELECT COUNT(event) AS games_played,
+       COALESCE(SUM(total_points), 0) AS total_points,
+       COALESCE(SUM(total_win_points), 0) AS total_win_points,
+       COALESCE(SUM(total_draw_points), 0) AS total_draw_points,
+       COALESCE(SUM(total_goal_points), 0) AS total_goal_points,
+       COALESCE(SUM(total_cs_points), 0) AS total_cs_points,
+       COALESCE(SUM(total_table_bonus), 0) AS total_table_bonus
+FROM assistant_manager_points
+WHERE team = ?
+"""
+
+TEAM_EVENT_POINTS_SQL = """
+SELECT event, team, SUM(total_points) AS total_points
+FROM assistant_manager_points
+GROUP BY team, event
+"""
+
+EVENTS_SQL = "SELECT DISTINCT event FROM assistant_manager_points ORDER BY event"
+
+TEAMS_SQL = "SELECT DISTINCT team FROM assistant_manager_points ORDER BY team"
+
+
+def write_store(results_df, league_df, amp_df, db_file=DEFAULT_DB_FILE):
+    """
+    Write the pipeline outputs into a fresh SQLite file and build the indexes.
+
+    The database is built next to the target and then swapped in with
+    os.replace, so readers never see a half-written file.
+    """
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    tmp_file = f"{db_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    frames = {
+        "results": results_df,
+        "league_table": league_df,
+        "assistant_manager_points": amp_df,
+    }
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        for table, df in frames.items():
+            df[TABLE_COLUMNS[table]].to_sql(
+                table, conn, if_exists="replace", index=False
+            )
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, db_file)
+    logger.info(f"Saved SQLite store to {db_file}")
+    return db_file
+
+
+# -------------------------------------------------------
+# Read side: one pooled read-only connection per process
+# -------------------------------------------------------
+_pool = {}
+_pool_lock = threading.Lock()
+
+
+def _file_signature(db_file):
+    stat = os.stat(db_file)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def get_connection(db_file=DEFAULT_DB_FILE):
+    """
+    Return the process-wide read-only connection for db_file.
+
+    The connection is re-opened when the pipeline swaps in a new file,
+    otherwise the same connection (and its statement cache) is re-used.
+    """
+    db_file = os.path.abspath(db_file)
+    signature = _file_signature(db_file)
+
+    with _pool_lock:
+        entry = _pool.get(db_file)
+        if (
+            entry is not None
+            and entry["pid"] == os.getpid()
+            and entry["signature"] == signature
+        ):
+            return entry["conn"], entry["lock"]
+
+        if entry is not None and entry["pid"] == os.getpid():
+            entry["conn"].close()
+
+        conn = sqlite3.connect(
+            f"file:{db_file}?mode=ro", uri=True, check_same_thread=False
+        )
+        entry = {
+            "conn": conn,
+            "lock": threading.Lock(),
+            "pid": os.getpid(),
+            "signature": signature,
+        }
+        _pool[db_file] = entry
+        return conn, entry["lock"]
+
+
+def query(sql, params=(), db_file=DEFAULT_DB_FILE):
+    """
+    Run one of the prepared queries above and return a DataFrame.
+    """
+    conn, lock = get_connection(db_file)
+    with lock:
+        cursor = conn.execute(sql, params)
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def overall_totals(db_file=DEFAULT_DB_FILE):
+    return query(OVERALL_TOTALS_SQL, db_file=db_file)
+
+
+def gameweek_breakdown(events, db_file=DEFAULT_DB_FILE):
+    return query(GAMEWEEK_BREAKDOWN_SQL, (_json_list(events),), db_file=db_file)
+
+
+def event_matches(events, db_file=DEFAULT_DB_FILE, limit=None, offset=0):
+    if limit is None:
+        return query(EVENT_MATCHES_SQL, (_json_list(events),), db_file=db_file)
+    return query(
+        EVENT_MATCHES_PAGE_SQL, (_json_list(events), limit, offset), db_file=db_file
+    )
+
+
+def count_event_matches(events, db_file=DEFAULT_DB_FILE):
+    return _count(EVENT_MATCHES_COUNT_SQL, (_json_list(events),), db_file)
+
+
+def team_history(team, db_file=DEFAULT_DB_FILE, limit=None, offset=0):
+    if limit is None:
+        return query(TEAM_HISTORY_SQL, (team,), db_file=db_file)
+    return query(TEAM_HISTORY_PAGE_SQL, (team, limit, offset), db_file=db_file)
+
+
+def team_matches(team, db_file=DEFAULT_DB_FILE, limit=None, offset=0):
+    if limit is None:
+        return query(TEAM_MATCHES_SQL, (team, team), db_file=db_file)
+    return query(TEAM_MATCHES_PAGE_SQL, (team, team, limit, offset), db_file=db_file)
+
+
+def count_team_matches(team, db_file=DEFAULT_DB_FILE):
+    return _count(TEAM_MATCHES_COUNT_SQL, (team, team), db_file)
+
+
+def team_summary(team, db_file=DEFAULT_DB_FILE):
+    """
+    Games played and summed points columns for a team, as a dict.
+    """
+    return query(TEAM_SUMMARY_SQL, (team,), db_file=db_file).iloc[0].to_dict()
+
+
+def team_event_points(db_file=DEFAULT_DB_FILE):
+    return query(TEAM_EVENT_POINTS_SQL, db_file=db_file)
+
+
+def list_events(db_file=DEFAULT_DB_FILE):
+    return query(EVENTS_SQL, db_file=db_file)["event"].tolist()
+
+
+def list_teams(db_file=DEFAULT_DB_FILE):
+    return query(TEAMS_SQL, db_file=db_file)["team"].tolist()
+
+
+def _count(sql, params, db_file):
+    return int(query(sql, params, db_file=db_file)["n"].iloc[0])
+
+
+def _json_list(values):
+    return "[" + ",".join(str(int(v)) for v in values) + "]"
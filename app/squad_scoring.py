@@ -0,0 +1,197 @@
+import os
+import logging
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from chip_optimizer import build_amp_matrix
+
+logger = logging.getLogger(__name__)
+
+# Private-league picks (one row per user pick) and the standings we write
+PICKS_FILE = "picks.csv"
+USER_STANDINGS_FILE = "user_standings.csv"
+
+PICK_DTYPES = {
+    "user": "string",
+    "start_event": "int16",
+    "end_event": "int16",
+    "team": "string",
+}
+
+# Picks read per chunk while streaming the picks file
+DEFAULT_CHUNK_ROWS = 50000
+
+# Per-user partial sums kept before they are folded together
+MAX_PARTIALS = 32
+
+
+def amp_prefix_sums(amp_df):
+    """
+    (team_index, first_event, cumulative) for scoring picks.
+
+    cumulative[t, j] is team t's AMP over the first j events, so the points
+    for events s..e are cumulative[t, e + 1] - cumulative[t, s] (with events
+    counted from first_event).
+    """
+    teams, events, matrix = build_amp_matrix(amp_df)
+    cumulative = np.zeros((len(teams), len(events) + 1), dtype=np.int32)
+    np.cumsum(np.rint(matrix).astype(np.int32), axis=1, out=cumulative[:, 1:])
+    team_index = {team: i for i, team in enumerate(teams)}
+    return team_index, int(events[0]), cumulative
+
+
+def score_entries(picks, team_index, first_event, cumulative):
+    """
+    AMP scored by every pick, gathered from the prefix sums in one go.
+
+    Event ranges are clipped to the events played so far; picks of teams
+    without any AMP score 0.
+    """
+    n_events = cumulative.shape[1] - 1
+    rows = picks["team"].map(team_index)
+    known = rows.notna().to_numpy()
+    rows = rows.fillna(0).to_numpy(dtype=np.int64)
+
+    start = np.clip(picks["start_event"].to_numpy(np.int64) - first_event, 0, n_events)
+    end = np.clip(picks["end_event"].to_numpy(np.int64) - first_event + 1, 0, n_events)
+    end = np.maximum(end, start)
+
+    points = cumulative[rows, end] - cumulative[rows, start]
+    return np.where(known, points, 0)
+
+
+# Set in each worker process by _init_worker, so the AMP table is sent to a
+# worker once instead of with every chunk
+_worker_state = {}
+
+
+def _init_worker(team_index, first_event, cumulative):
+    _worker_state["team_index"] = team_index
+    _worker_state["first_event"] = first_event
+    _worker_state["cumulative"] = cumulative
+
+
+def _score_chunk(picks):
+    points = score_entries(
+        picks,
+        _worker_state["team_index"],
+        _worker_state["first_event"],
+        _worker_state["cumulative"],
+    )
+    return (
+        pd.DataFrame({"user": picks["user"].to_numpy(), "total_points": points})
+        .groupby("user", sort=False)["total_points"]
+        .agg(["sum", "count"])
+    )
+
+
+def _combine(partials):
+    return pd.concat(partials).groupby(level=0).sum()
+
+
+def rank_users(totals):
+    """
+    Standings from per-user totals: best first, with tied users sharing
+    the best rank ("1, 2, 2, 4").
+    """
+    standings = totals.rename(
+        columns={"sum": "total_points", "count": "picks"}
+    ).reset_index(names="user")
+    standings = standings.sort_values(
+        ["total_points", "user"], ascending=[False, True], ignore_index=True
+    )
+    standings.insert(
+        0,
+        "rank",
+        standings["total_points"].rank(method="min", ascending=False).astype(int),
+    )
+    return standings
+
+
+def score_picks(
+    picks_file,
+    amp_df,
+    output_file=None,
+    chunk_rows=DEFAULT_CHUNK_ROWS,
+    workers=None,
+):
+    """
+    Score every pick in picks_file (columns user, start_event, end_event,
+    team) against amp_df and return the user standings.
+
+    The picks file is streamed in chunks. With workers > 1 the chunks are
+    scored in a process pool, with at most two chunks per worker in flight so
+    memory stays bounded however large the file is.
+    """
+    workers = workers or os.cpu_count() or 1
+    state = amp_prefix_sums(amp_df)
+    reader = pd.read_csv(
+        picks_file,
+        usecols=list(PICK_DTYPES),
+        dtype=PICK_DTYPES,
+        chunksize=chunk_rows,
+    )
+
+    partials = []
+
+    def collect(result):
+        partials.append(result)
+        if len(partials) >= MAX_PARTIALS:
+            partials[:] = [_combine(partials)]
+
+    if workers == 1:
+        _init_worker(*state)
+        for chunk in reader:
+            collect(_score_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=state
+        ) as pool:
+            in_flight = set()
+            for chunk in reader:
+                if len(in_flight) >= 2 * workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                in_flight.add(pool.submit(_score_chunk, chunk))
+            for future in in_flight:
+                collect(future.result())
+
+    if partials:
+        standings = rank_users(_combine(partials))
+    else:
+        standings = pd.DataFrame(columns=["rank", "user", "total_points", "picks"])
+
+    if output_file:
+        standings.to_csv(output_file, index=False)
+        logger.info(f"Saved standings for {len(standings)} users to {output_file}")
+    return standings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score private-league picks against Assistant Manager Points."
+    )
+    parser.add_argument("picks", help="CSV of user, start_event, end_event, team")
+    parser.add_argument(
+        "--amp", default=os.path.join("data", "assistant_manager_points.csv")
+    )
+    parser.add_argument("--output", default=os.path.join("data", USER_STANDINGS_FILE))
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, help="Processes (default: CPUs)")
+    args = parser.parse_args()
+
+    score_picks(
+        args.picks,
+        pd.read_csv(args.amp),
+        output_file=args.output,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
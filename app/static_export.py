@@ -0,0 +1,297 @@
+import os
+import re
+import json
+import shutil
+import logging
+import argparse
+
+import pandas as pd
+
+from query_api import DATA_FILES, data_version, records
+from chip_standings import (
+    STANDINGS_FILE,
+    compute_chip_standings,
+    current_rank,
+    load_chip_standings,
+)
+from dashboard_html import (
+    CUSTOM_CSS,
+    OVERALL_HEADER_HTML,
+    TeamInfo,
+    match_result_html,
+    stat_cards_html,
+    team_header_html,
+    team_row_html,
+)
+from metadata import METADATA_FILE, load_metadata
+
+logger = logging.getLogger(__name__)
+
+# Exports go to <export_dir>/<version>/; latest.json names the live one
+LATEST_FILE = "latest.json"
+
+# Number of exported versions kept on disk
+DEFAULT_KEEP = 3
+
+HISTORY_COLUMNS = {
+    "event": "Gameweek",
+    "total_points": "Total Points",
+    "total_win_points": "Win Points",
+    "total_draw_points": "Draw Points",
+    "total_goal_points": "Goal Points",
+    "total_cs_points": "Clean Sheet",
+    "total_table_bonus": "Table Bonus",
+}
+
+
+def team_slug(team):
+    return re.sub(r"[^a-z0-9]+", "-", team.lower()).strip("-")
+
+
+def page_html(title, body, root):
+    """
+    A complete page: the dashboard's CSS, a link bar and the body.
+    root is the relative path back to the export's top level.
+    """
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{CUSTOM_CSS}
+</head>
+<body>
+<div class="block-container">
+<h1>🏆 Assistant Manager Points Tracker</h1>
+<p><a href="{root}index.html">Overall View</a></p>
+{body}
+</div>
+</body>
+</html>
+"""
+
+
+def table_html(df):
+    return df.to_html(index=False, classes="dataframe", border=0)
+
+
+def overall_totals(amp_df):
+    totals = (
+        amp_df.groupby("team", observed=True)
+        .agg(
+            total_points=("total_points", "sum"),
+            games_played=("event", "count"),
+            total_table_bonus=("total_table_bonus", "sum"),
+        )
+        .reset_index()
+    )
+    totals["avg_points"] = totals["total_points"] / totals["games_played"]
+    return totals.sort_values("total_points", ascending=False, ignore_index=True)
+
+
+def render_overall(amp_df, events, teams, team_info):
+    totals = overall_totals(amp_df)
+    rows = "".join(
+        team_row_html(
+            row.team,
+            row.total_points,
+            row.games_played,
+            row.avg_points,
+            row.total_table_bonus,
+            team_info,
+        )
+        for row in totals.itertuples()
+    )
+    gameweek_links = " ".join(
+        f'<a href="gameweek/{event}.html">GW{event}</a>' for event in events
+    )
+    team_links = " ".join(
+        f'<a href="team/{team_slug(team)}.html">{team}</a>' for team in teams
+    )
+    body = (
+        "<h3>Total Points by Club</h3>"
+        f'{OVERALL_HEADER_HTML}<div class="scrollable-container">{rows}</div>'
+        f"<p>{gameweek_links}</p><p>{team_links}</p>"
+    )
+    return page_html("Overall View", body, ""), {"teams": records(totals)}
+
+
+def render_gameweek(event, amp_df, results_df, team_info):
+    points = (
+        amp_df[amp_df["event"] == event]
+        .groupby("team", as_index=False, observed=True)[
+            [
+                "total_points",
+                "total_win_points",
+                "total_goal_points",
+                "total_cs_points",
+                "total_table_bonus",
+            ]
+        ]
+        .sum()
+        .sort_values("total_points", ascending=False)
+    )
+    matches = results_df[results_df["event"] == event]
+    body = (
+        f"<h3>Assistant Points for Gameweek {event}</h3>"
+        f"{table_html(points.rename(columns={'team': 'Team', **HISTORY_COLUMNS}))}"
+        f"<h3>Match Results for Gameweek {event}</h3>"
+        + "".join(
+            match_result_html(match, team_info) for _, match in matches.iterrows()
+        )
+    )
+    return page_html(f"Gameweek {event}", body, "../"), {
+        "event": int(event),
+        "points": records(points),
+        "matches": records(matches),
+    }
+
+
+def render_team(team, amp_df, results_df, chip_standings, team_info):
+    history = amp_df[amp_df["team"] == team][list(HISTORY_COLUMNS)]
+    matches = results_df[(results_df["home"] == team) | (results_df["away"] == team)]
+
+    games_played = len(history)
+    total_points = int(history["total_points"].sum())
+    rank = current_rank(chip_standings, team)
+    summary = {
+        "Total Points": total_points,
+        "Avg Points": f"{total_points / games_played if games_played else 0:.1f}",
+        "Games Played": games_played,
+        "Chip Position": "N/A" if rank is None else rank,
+        "Match Points": int(
+            history["total_win_points"].sum() + history["total_draw_points"].sum()
+        ),
+        "Goal Points": int(history["total_goal_points"].sum()),
+        "Clean Sheet Points": int(history["total_cs_points"].sum()),
+        "Table Bonus": int(history["total_table_bonus"].sum()),
+    }
+    body = (
+        team_header_html(team, team_info)
+        + stat_cards_html(summary.items())
+        + f"<h3>Points History for {team}</h3>"
+        + table_html(history.rename(columns=HISTORY_COLUMNS))
+        + f"<h3>Match Results for {team}</h3>"
+        + "".join(
+            match_result_html(match, team_info) for _, match in matches.iterrows()
+        )
+    )
+    return page_html(team, body, "../"), {
+        "team": team,
+        "summary": summary,
+        "history": records(history),
+        "matches": records(matches),
+    }
+
+
+def _write_page(directory, name, html, data):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{name}.html"), "w") as f:
+        f.write(html)
+    with open(os.path.join(directory, f"{name}.json"), "w") as f:
+        json.dump(data, f)
+
+
+def export_site(data_dir="data", export_dir=None, force=False, keep=DEFAULT_KEEP):
+    """
+    Pre-render the Overall View, every gameweek and every team page for the
+    current data into <export_dir>/<version>/ (HTML plus JSON).
+
+    The version hashes the outputs and the metadata (the pages show its
+    logos and managers). A version that was already exported is reused
+    (unless force), so this is cheap to run after every pipeline run. Pages
+    are built in a temporary directory and renamed into place before
+    latest.json is pointed at them, so a static server never sees a
+    half-written export. latest.json is rewritten on every run, so it
+    follows the data back if it reverts to an earlier version.
+    """
+    export_dir = export_dir or os.path.join(data_dir, "export")
+    paths = [os.path.join(data_dir, name) for name in DATA_FILES.values()]
+    metadata_file = os.path.join(data_dir, METADATA_FILE)
+    if os.path.exists(metadata_file):
+        paths.append(metadata_file)
+    version = data_version(paths)
+    version_dir = os.path.join(export_dir, version)
+
+    if os.path.exists(version_dir) and not force:
+        # Mark it as the newest export again, so pruning keeps it
+        os.utime(version_dir)
+        logger.info(f"Static export for version {version} already exists")
+    else:
+        pages = _render_version(data_dir, version_dir)
+        logger.info(f"Exported {pages} pages for version {version} to {version_dir}")
+
+    latest_file = os.path.join(export_dir, LATEST_FILE)
+    with open(f"{latest_file}.tmp", "w") as f:
+        json.dump({"version": version, "path": version}, f)
+    os.replace(f"{latest_file}.tmp", latest_file)
+
+    _prune(export_dir, keep, version)
+    return version_dir
+
+
+def _render_version(data_dir, version_dir):
+    # Render every page into version_dir; returns the number of pages
+    amp_df = pd.read_csv(os.path.join(data_dir, DATA_FILES["assistant_manager_points"]))
+    results_df = pd.read_csv(os.path.join(data_dir, DATA_FILES["results"]))
+    standings_file = os.path.join(data_dir, STANDINGS_FILE)
+    if os.path.exists(standings_file):
+        chip_standings = load_chip_standings(standings_file)
+    else:
+        chip_standings = compute_chip_standings(amp_df)
+
+    team_info = TeamInfo(load_metadata(os.path.join(data_dir, METADATA_FILE)))
+
+    events = sorted(amp_df["event"].unique())
+    teams = sorted(amp_df["team"].unique())
+
+    tmp_dir = f"{version_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    html, data = render_overall(amp_df, events, teams, team_info)
+    _write_page(
+        tmp_dir, "index", html, {"version": os.path.basename(version_dir), **data}
+    )
+    for event in events:
+        html, data = render_gameweek(event, amp_df, results_df, team_info)
+        _write_page(os.path.join(tmp_dir, "gameweek"), str(event), html, data)
+    for team in teams:
+        html, data = render_team(team, amp_df, results_df, chip_standings, team_info)
+        _write_page(os.path.join(tmp_dir, "team"), team_slug(team), html, data)
+
+    shutil.rmtree(version_dir, ignore_errors=True)
+    os.replace(tmp_dir, version_dir)
+    return 1 + len(events) + len(teams)
+
+
+def _prune(export_dir, keep, live_version):
+    # Remove all but the `keep` most recently exported versions, never
+    # removing the one latest.json points at
+    versions = [
+        entry
+        for entry in os.scandir(export_dir)
+        if entry.is_dir()
+        and not entry.name.endswith(".tmp")
+        and entry.name != live_version
+    ]
+    versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[max(keep - 1, 0) :]:
+        shutil.rmtree(entry.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-render the dashboard to static HTML/JSON files."
+    )
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--export-dir", help="Default: <data-dir>/export")
+    parser.add_argument("--force", action="store_true", help="Re-export")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP)
+    args = parser.parse_args()
+
+    version_dir = export_site(args.data_dir, args.export_dir, args.force, args.keep)
+    print(f"Static pages in {version_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from query_api import DATA_FILES
+from scoring import event_points, event_table
+
+logger = logging.getLogger(__name__)
+
+# Recomputed (event, overrides so far) steps kept in memory
+DEFAULT_CACHE_SIZE = 512
+
+TABLE_COLUMNS = [
+    "event",
+    "team_name",
+    "position",
+    "points",
+    "goal_difference",
+    "goals_scored",
+    "goals_conceded",
+    "wins",
+    "draws",
+    "losses",
+]
+
+AMP_COLUMNS = [
+    "total_points",
+    "total_win_points",
+    "total_draw_points",
+    "total_goal_points",
+    "total_cs_points",
+    "total_table_bonus",
+]
+
+
+def parse_overrides(text):
+    """
+    Parse "20:Arsenal:Wolves:1-1,21:Spurs:Chelsea:0-2" into a list of
+    (event, home, away, home_score, away_score) overrides.
+    """
+    overrides = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        try:
+            event, home, away, score = item.split(":")
+            home_score, away_score = score.split("-")
+            overrides.append((int(event), home, away, int(home_score), int(away_score)))
+        except ValueError:
+            raise ValueError(
+                f"Bad override '{item}', expected event:home:away:home-away"
+            )
+    return overrides
+
+
+def _same_table(table, published):
+    # Row order within ties depends on the order teams were updated in, so
+    # compare by team
+    return (
+        table.set_index("team_name")[TABLE_COLUMNS[2:]]
+        .sort_index()
+        .equals(published.set_index("team_name")[TABLE_COLUMNS[2:]].sort_index())
+    )
+
+
+def _event_totals(points):
+    return points.groupby(["event", "team"], as_index=False, observed=True)[
+        AMP_COLUMNS
+    ].sum()
+
+
+class WhatIf:
+    """
+    Re-scores the season with some match results overridden, without
+    touching the published files.
+
+    The published league table and AMP are kept per event. A scenario only
+    recomputes from the first overridden gameweek onwards, starting from
+    the published standings before it, and stops as soon as the standings
+    after a gameweek (past the last override) match the published ones
+    again; every other event is reused as published. Recomputed gameweeks
+    are cached by (event, overrides up to that event), so scenarios that
+    share their earlier overrides share that work too.
+
+    Tables are rebuilt the way the batch standings engine builds them.
+    """
+
+    def __init__(self, results_df, league_df, amp_df, cache_size=DEFAULT_CACHE_SIZE):
+        self.events = sorted(int(event) for event in results_df["event"].unique())
+        self.matches_by_event = {
+            int(event): matches.reset_index(drop=True)
+            for event, matches in results_df.groupby("event")
+        }
+        self.tables = {
+            int(event): table[TABLE_COLUMNS].reset_index(drop=True)
+            for event, table in league_df.groupby("event")
+        }
+        self.amp_by_event = {
+            int(event): points.reset_index(drop=True)
+            for event, points in amp_df.groupby("event")
+        }
+        self.teams = sorted(set(results_df["home"]) | set(results_df["away"]))
+        self.published_amp = amp_df
+        self.cache_size = cache_size
+        self.steps = OrderedDict()
+        self.lock = threading.Lock()
+
+        if 0 not in self.tables:
+            self.tables[0] = pd.DataFrame(
+                {
+                    "event": 0,
+                    "team_name": self.teams,
+                    "position": 1,
+                    "points": 0,
+                    "goal_difference": 0,
+                    "goals_scored": 0,
+                    "goals_conceded": 0,
+                    "wins": 0,
+                    "draws": 0,
+                    "losses": 0,
+                }
+            )[TABLE_COLUMNS]
+
+    @classmethod
+    def from_dir(cls, data_dir="data", **kwargs):
+        return cls(
+            *(
+                pd.read_csv(os.path.join(data_dir, DATA_FILES[name]))
+                for name in ("results", "league_table", "assistant_manager_points")
+            ),
+            **kwargs,
+        )
+
+    def normalize(self, overrides):
+        """
+        Check every override names a played match and return them as a
+        sorted tuple (one per match, the last one given wins).
+        """
+        by_match = {}
+        for event, home, away, home_score, away_score in overrides:
+            matches = self.matches_by_event.get(event)
+            if (
+                matches is None
+                or not ((matches["home"] == home) & (matches["away"] == away)).any()
+            ):
+                raise ValueError(f"No result for {home} v {away} in gameweek {event}")
+            if home_score < 0 or away_score < 0:
+                raise ValueError("Scores cannot be negative")
+            by_match[(event, home, away)] = (home_score, away_score)
+        return tuple(sorted(key + score for key, score in by_match.items()))
+
+    def _matches(self, event, overrides):
+        matches = self.matches_by_event[event]
+        event_overrides = [o for o in overrides if o[0] == event]
+        if not event_overrides:
+            return matches
+        matches = matches.copy()
+        for _, home, away, home_score, away_score in event_overrides:
+            match = (matches["home"] == home) & (matches["away"] == away)
+            matches.loc[match, "home_score"] = home_score
+            matches.loc[match, "away_score"] = away_score
+        return matches
+
+    def _positions(self, event, tables):
+        # Positions going into an event, as calculate_assistant_manager_points
+        # takes them (every team level if the previous event has no table)
+        table = tables.get(event - 1, self.tables.get(event - 1))
+        if table is None:
+            return {team: 1 for team in self.teams}
+        return dict(zip(table["team_name"], table["position"]))
+
+    def _step(self, event, applied, prev_table, team_pos_dict):
+        """
+        (table, points) for one event under the overrides applied so far.
+        """
+        key = (event, applied)
+        with self.lock:
+            cached = self.steps.get(key)
+            if cached is not None:
+                self.steps.move_to_end(key)
+                return cached
+
+        matches = self._matches(event, applied)
+        step = (
+            event_table(prev_table, event, matches),
+            event_points(event, team_pos_dict, matches),
+        )
+        with self.lock:
+            self.steps[key] = step
+            if len(self.steps) > self.cache_size:
+                self.steps.popitem(last=False)
+        return step
+
+    def scenario(self, overrides):
+        """
+        Recompute the events the overrides affect.
+
+        Returns (tables, amp): {event: league table} and {event: AMP rows}
+        for the recomputed events only; all other events are as published.
+        """
+        overrides = self.normalize(overrides)
+        tables, amp = {}, {}
+        if not overrides:
+            return tables, amp
+
+        first_event, last_event = overrides[0][0], overrides[-1][0]
+        earlier = [event for event in self.events if event < first_event]
+        prev_table = self.tables[earlier[-1] if earlier else 0]
+
+        for event in self.events:
+            if event < first_event:
+                continue
+            applied = tuple(o for o in overrides if o[0] <= event)
+            table, points = self._step(
+                event, applied, prev_table, self._positions(event, tables)
+            )
+            tables[event] = table
+            amp[event] = points
+            prev_table = table
+
+            # From here on nothing differs from the published season
+            if event >= last_event and _same_table(table, self.tables[event]):
+                break
+
+        logger.info(
+            f"What-if with {len(overrides)} override(s) recomputed "
+            f"gameweeks {min(tables)}-{max(tables)}"
+        )
+        return tables, amp
+
+    def compare(self, overrides):
+        """
+        The effect of the overrides as three frames:
+
+        - standings: final table vs the published one
+        - amp_totals: season AMP per team vs the published totals
+        - amp_changes: every (event, team) whose AMP changed (summed over
+          both matches in a double gameweek)
+        """
+        tables, amp = self.scenario(overrides)
+        final_event = self.events[-1]
+
+        published = self.tables[final_event][["team_name", "position", "points"]]
+        final_table = tables.get(final_event, self.tables[final_event])
+        standings = final_table[["team_name", "position", "points"]].merge(
+            published, on="team_name", suffixes=("", "_published")
+        )
+        standings["position_change"] = (
+            standings["position_published"] - standings["position"]
+        )
+        standings["points_change"] = standings["points"] - standings["points_published"]
+
+        published_columns = [f"{c}_published" for c in AMP_COLUMNS]
+        changed = []
+        for event, points in amp.items():
+            # A team plays twice in a double gameweek, so compare its summed
+            # points for the event rather than pairing up individual rows
+            merged = (
+                _event_totals(points)
+                .merge(
+                    _event_totals(self.amp_by_event[event]),
+                    on=["event", "team"],
+                    how="outer",
+                    suffixes=("", "_published"),
+                )
+                .fillna(0)
+                .astype({c: int for c in AMP_COLUMNS + published_columns})
+            )
+            differs = (
+                merged[AMP_COLUMNS].to_numpy() != merged[published_columns].to_numpy()
+            ).any(axis=1)
+            changed.append(merged[differs])
+        amp_changes = (
+            pd.concat(changed, ignore_index=True)
+            if changed
+            else pd.DataFrame(
+                columns=["event", "team"] + AMP_COLUMNS + published_columns
+            )
+        )
+        amp_changes["points_change"] = (
+            amp_changes["total_points"] - amp_changes["total_points_published"]
+        )
+
+        totals = (
+            self.published_amp.groupby("team", observed=True)["total_points"]
+            .sum()
+            .rename("total_points_published")
+            .reset_index()
+        )
+        change = amp_changes.groupby("team")["points_change"].sum()
+        totals["points_change"] = totals["team"].map(change).fillna(0).astype(int)
+        totals["total_points"] = (
+            totals["total_points_published"] + totals["points_change"]
+        )
+        totals = totals.sort_values(
+            ["total_points", "team"], ascending=[False, True], ignore_index=True
+        )[["team", "total_points", "total_points_published", "points_change"]]
+
+        return {
+            "recomputed_events": sorted(tables),
+            "standings": standings,
+            "amp_totals": totals,
+            "amp_changes": amp_changes.sort_values(
+                ["event", "team"], ignore_index=True
+            ),
+        }
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The pipeline modules import each other by bare name, as app.py loads them
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+)
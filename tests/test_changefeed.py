@@ -0,0 +1,75 @@
+import pandas as pd
+
+from changefeed import (
+    CHANGELOG_FILE,
+    diff_frame,
+    iter_changes,
+    load_snapshot,
+    record_changes,
+)
+from query_api import DATA_FILES
+
+RESULTS = pd.DataFrame(
+    {
+        "event": [1, 1],
+        "home": ["A", "C"],
+        "away": ["B", "D"],
+        "home_score": [2, 0],
+        "away_score": [1, 0],
+        "kickoff_time": ["2024-08-17T12:00:00Z", None],
+    }
+)
+
+
+def test_missing_values_on_both_sides_are_not_changes():
+    added, modified, removed = diff_frame(
+        RESULTS.copy(), RESULTS.copy(), ["event", "home", "away"]
+    )
+    assert added.empty and modified.empty and removed.empty
+
+
+def test_a_value_becoming_missing_is_a_change():
+    new = RESULTS.copy()
+    new.loc[0, "kickoff_time"] = None
+    _, modified, _ = diff_frame(RESULTS, new, ["event", "home", "away"])
+    assert modified[["home", "away"]].values.tolist() == [["A", "B"]]
+
+
+def write_outputs(data_dir, results_df):
+    outputs = {
+        "results": results_df,
+        "league_table": pd.DataFrame({"event": [1], "team_name": ["A"]}),
+        "assistant_manager_points": pd.DataFrame({"event": [1], "team": ["A"]}),
+    }
+    for name, df in outputs.items():
+        df.to_csv(data_dir / DATA_FILES[name], index=False)
+    return outputs
+
+
+def test_feed_resumes_by_seq_when_data_reverts(tmp_path):
+    changed = RESULTS.assign(home_score=[3, 0])
+
+    # Three runs: first data, a correction, then back to the first data
+    for results_df in (RESULTS, changed, RESULTS):
+        previous = load_snapshot(str(tmp_path))
+        current = write_outputs(tmp_path, results_df)
+        record_changes(str(tmp_path), previous, current)
+
+    feed_file = str(tmp_path / CHANGELOG_FILE)
+    entries = list(iter_changes(feed_file))
+    assert [entry["seq"] for entry in entries] == [1, 2, 3]
+    # The reverted data has the same version as the first run...
+    assert entries[0]["version"] == entries[2]["version"]
+    # ...but a consumer that applied entry 1 still gets both later entries
+    assert [entry["seq"] for entry in iter_changes(feed_file, after_seq=1)] == [2, 3]
+    # Unscheduled fixtures are never reported as modified
+    assert entries[1]["changes"]["results"]["modified"] == [
+        {
+            "event": 1,
+            "home": "A",
+            "away": "B",
+            "home_score": 3,
+            "away_score": 1,
+            "kickoff_time": "2024-08-17T12:00:00Z",
+        }
+    ]
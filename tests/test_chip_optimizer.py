@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from chip_optimizer import best_picks, build_amp_matrix, value_rankings, window_sums
+
+# Wolves blank in GW2 and play twice in GW4; nobody plays in GW3
+AMP = pd.DataFrame(
+    {
+        "event": [1, 1, 1, 2, 2, 4, 4, 4, 4],
+        "team": [
+            "Arsenal",
+            "Chelsea",
+            "Wolves",
+            "Arsenal",
+            "Chelsea",
+            "Arsenal",
+            "Chelsea",
+            "Wolves",
+            "Wolves",
+        ],
+        "total_points": [10, 4, 2, 3, 12, 6, 5, 7, 8],
+    }
+)
+PRICES = {"Arsenal": "£1.5m", "Chelsea": "£1.0m", "Wolves": 0.5}
+
+
+def test_matrix_has_a_column_per_gameweek():
+    teams, events, matrix = build_amp_matrix(AMP)
+
+    assert teams == ["Arsenal", "Chelsea", "Wolves"]
+    assert events.tolist() == [1, 2, 3, 4]
+    np.testing.assert_array_equal(matrix, [[10, 3, 0, 6], [4, 12, 0, 5], [2, 0, 0, 15]])
+
+
+def test_window_sums_cover_blank_and_double_gameweeks():
+    _, _, matrix = build_amp_matrix(AMP)
+
+    np.testing.assert_array_equal(window_sums(matrix, 1), matrix)
+    np.testing.assert_array_equal(window_sums(matrix, 3), [[13, 9], [16, 17], [2, 15]])
+
+
+def test_best_picks_respect_the_budget():
+    picks = best_picks(AMP, PRICES, [0.4, 0.5, 1.0, 1.5], [3])
+    best = {
+        (row.budget, row.start_event): (row.team, row.points)
+        for row in picks.itertuples()
+    }
+
+    # Nobody is affordable at £0.4m
+    assert 0.4 not in set(picks["budget"])
+    assert best[(0.5, 1)] == ("Wolves", 2)
+    assert best[(1.0, 1)] == ("Chelsea", 16)
+    assert best[(1.5, 1)] == ("Chelsea", 16)
+    assert best[(1.0, 2)] == ("Chelsea", 17)
+    assert (picks["price"] <= picks["budget"]).all()
+    assert picks["end_event"].tolist() == (picks["start_event"] + 2).tolist()
+
+
+def test_teams_without_a_price_are_not_picked():
+    picks = best_picks(AMP, {"Wolves": 0.5}, [5.0], [1])
+
+    assert set(picks["team"]) == {"Wolves"}
+
+
+def test_windows_longer_than_the_season_give_no_picks():
+    assert best_picks(AMP, PRICES, [1.5], [5]).empty
+
+
+def test_value_rankings_order_by_points_per_m():
+    rankings = value_rankings(AMP, {**PRICES, "Wolves": "£0.5m"}, 1, 2)
+
+    # Wolves: 2 / 0.5 = 4, Chelsea: 16 / 1.0 = 16, Arsenal: 13 / 1.5 = 8.7
+    assert rankings["team"].tolist() == ["Chelsea", "Arsenal", "Wolves"]
+    assert rankings["points_per_m"].round(2).tolist() == [16.0, 8.67, 4.0]
+
+
+def test_value_rankings_break_ties_on_total_points():
+    amp_df = pd.DataFrame(
+        {"event": [1, 1], "team": ["Arsenal", "Wolves"], "total_points": [6, 2]}
+    )
+    rankings = value_rankings(amp_df, {"Arsenal": 1.5, "Wolves": 0.5}, 1, 1)
+
+    assert rankings["team"].tolist() == ["Arsenal", "Wolves"]
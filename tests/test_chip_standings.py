@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from chip_standings import (
+    FORM_WINDOWS,
+    compute_chip_standings,
+    current_rank,
+    load_chip_standings,
+    save_chip_standings,
+    team_series,
+)
+
+POINTS = {
+    "Arsenal": [5, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+    "Chelsea": [5, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 0],
+    "Fulham": [2, 4, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    "Wolves": [5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+}
+
+
+def amp_df():
+    return pd.DataFrame(
+        [
+            {"event": event, "team": team, "total_points": points}
+            for team, season in POINTS.items()
+            for event, points in enumerate(season, start=1)
+        ]
+    )
+
+
+def test_tied_teams_share_the_best_rank():
+    standings = compute_chip_standings(amp_df())
+    rank = dict(zip(standings["teams"], standings["rank"][:, 0]))
+
+    # After GW1 three teams share 5 points
+    assert rank == {"Arsenal": 1, "Chelsea": 1, "Fulham": 4, "Wolves": 1}
+    # After GW2 Arsenal, Chelsea and Fulham are level on 6, Wolves has 5
+    assert standings["rank"][:, 1].tolist() == [1, 1, 1, 4]
+    assert current_rank(standings, "Arsenal") == 1
+    assert current_rank(standings, "Chelsea") == 2
+    assert current_rank(standings, "Everton") is None
+
+
+def test_form_windows_near_the_start_of_the_season():
+    series = team_series(compute_chip_standings(amp_df()), "Arsenal")
+    season = np.array(POINTS["Arsenal"])
+
+    assert series["cumulative_points"].tolist() == season.cumsum().tolist()
+    for window in FORM_WINDOWS:
+        # Before `window` events have been played, form is everything so far
+        expected = [season[max(e + 1 - window, 0) : e + 1].sum() for e in range(12)]
+        assert series[f"form_{window}"].tolist() == expected, window
+    assert series["form_3"].tolist()[:3] == [5, 6, 8]
+    assert series["form_10"].iloc[-1] == season[2:].sum()
+
+
+def test_save_and_load_round_trip(tmp_path):
+    standings = compute_chip_standings(amp_df())
+    path = str(tmp_path / "chip_standings.npz")
+
+    save_chip_standings(standings, path)
+    loaded = load_chip_standings(path)
+
+    assert loaded.keys() == standings.keys()
+    for key, values in standings.items():
+        np.testing.assert_array_equal(loaded[key], values)
+        assert loaded[key].dtype == values.dtype
+    assert team_series(loaded, "Wolves").equals(team_series(standings, "Wolves"))
+    assert team_series(loaded, "Everton").empty
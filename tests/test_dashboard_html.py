@@ -0,0 +1,35 @@
+from dashboard_html import TEAM_LOGOS, TEAM_MANAGER_DATA, TeamInfo, team_header_html
+
+
+def test_metadata_overrides_builtin_values():
+    team_info = TeamInfo(
+        {
+            "logos": {"Arsenal": "https://example.com/ars.png"},
+            "managers": {"Arsenal": ["Someone Else", "£1.2m"]},
+        }
+    )
+
+    assert team_info.logo("Arsenal") == "https://example.com/ars.png"
+    assert team_info.manager_and_price("Arsenal") == ("Someone Else", "£1.2m")
+    assert "https://example.com/ars.png" in team_header_html("Arsenal", team_info)
+    # Teams the metadata does not cover keep their built-in values
+    assert team_info.logo("Chelsea") == TEAM_LOGOS["Chelsea"]
+
+
+def test_loads_do_not_leak_into_each_other():
+    builtin_logo = TEAM_LOGOS["Arsenal"]
+    builtin_manager = TEAM_MANAGER_DATA["Arsenal"]
+    TeamInfo(
+        {
+            "logos": {"Arsenal": "https://example.com/old.png", "Old FC": "x"},
+            "managers": {"Arsenal": ["Someone Else", "£1.2m"]},
+        }
+    )
+
+    later = TeamInfo({"logos": {}, "managers": {}})
+    assert later.logo("Arsenal") == builtin_logo
+    assert later.manager_and_price("Arsenal") == builtin_manager
+    assert "Old FC" not in later.logos
+    assert TEAM_LOGOS["Arsenal"] == builtin_logo
+    assert TEAM_MANAGER_DATA["Arsenal"] == builtin_manager
+    assert TeamInfo().logo("Old FC") == "https://via.placeholder.com/50"
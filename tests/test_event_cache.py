@@ -0,0 +1,80 @@
+import os
+
+import pandas as pd
+
+import fetch_data
+from event_cache import EventCache
+from fetch_data import PremierLeaguePointsCalculator
+
+RESULTS = pd.DataFrame(
+    {
+        "event": [1, 1, 2, 2],
+        "home": ["Arsenal", "Chelsea", "Arsenal", "Fulham"],
+        "away": ["Wolves", "Fulham", "Chelsea", "Wolves"],
+        "home_score": [2, 0, 1, 3],
+        "away_score": [0, 0, 1, 1],
+    }
+)
+
+
+def test_get_misses_until_put(tmp_path):
+    cache = EventCache(str(tmp_path))
+    key = cache.key("league_table", 1, RESULTS)
+
+    assert cache.get(key) is None
+    cache.put(key, RESULTS)
+
+    assert cache.get(key).equals(RESULTS)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # A fresh instance over the same directory sees the entry too
+    assert EventCache(str(tmp_path)).get(key).equals(RESULTS)
+
+
+def test_key_covers_every_part(tmp_path):
+    cache = EventCache(str(tmp_path))
+    key = cache.key("league_table", 1, 1, RESULTS)
+
+    assert key == cache.key("league_table", 1, 1, RESULTS.copy())
+    assert key != cache.key("league_table", 2, 1, RESULTS)
+    assert key != cache.key("league_table", 1, 1, RESULTS.assign(home_score=9))
+    assert key != cache.key("league_table", 1, 1, RESULTS.astype({"event": "int8"}))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = EventCache(str(tmp_path))
+    for name in ["a", "b"]:
+        cache.put(name, RESULTS)
+    # Make "a" the older entry, then read it so "b" becomes the least recent
+    os.utime(tmp_path / "a.pkl", ns=(1_000_000_000, 1_000_000_000))
+    os.utime(tmp_path / "b.pkl", ns=(2_000_000_000, 2_000_000_000))
+    cache.get("a")
+
+    cache.max_bytes = 2 * os.path.getsize(tmp_path / "a.pkl")
+    cache.put("c", RESULTS)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.pkl", "c.pkl"]
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def league_table(tmp_path):
+    calculator = PremierLeaguePointsCalculator(
+        lean_types=False, standings_engine="batch", data_dir=str(tmp_path)
+    )
+    calculator.event_cache = EventCache(str(tmp_path / "events"))
+    calculator.match_results_df = RESULTS.copy()
+    return calculator.calculate_league_table(), calculator.event_cache
+
+
+def test_league_tables_are_reused_until_the_version_changes(tmp_path, monkeypatch):
+    first, cache = league_table(tmp_path)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    again, cache = league_table(tmp_path)
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert again.equals(first)
+
+    monkeypatch.setattr(
+        fetch_data, "LEAGUE_TABLE_VERSION", fetch_data.LEAGUE_TABLE_VERSION + 1
+    )
+    _, cache = league_table(tmp_path)
+    assert (cache.hits, cache.misses) == (0, 2)
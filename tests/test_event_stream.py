@@ -0,0 +1,114 @@
+import pandas as pd
+
+from event_stream import (
+    SNAPSHOT_COLUMNS,
+    build_league_table,
+    gameweek_close_points,
+    replay,
+)
+from scoring import event_table
+
+TEAMS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+# Four fixtures per gameweek, kicking off hourly on Saturdays a week apart
+PAIRINGS = {
+    1: [("A", "B", 1, 0), ("C", "D", 2, 2), ("E", "F", 0, 1), ("G", "H", 3, 1)],
+    2: [("A", "C", 0, 1), ("B", "D", 3, 0), ("E", "G", 1, 1), ("F", "H", 2, 0)],
+    3: [("A", "D", 2, 1), ("B", "C", 1, 1), ("E", "H", 0, 0), ("F", "G", 1, 2)],
+}
+
+
+def results(kickoffs=None):
+    rows = []
+    for event, fixtures in PAIRINGS.items():
+        saturday = pd.Timestamp("2024-08-17T12:00:00Z") + pd.Timedelta(weeks=event - 1)
+        for hour, (home, away, home_score, away_score) in enumerate(fixtures):
+            kickoff = (kickoffs or {}).get(
+                (event, home), saturday + pd.Timedelta(hours=hour)
+            )
+            rows.append(
+                (event, home, away, home_score, away_score, pd.Timestamp(kickoff))
+            )
+    return pd.DataFrame(
+        rows,
+        columns=["event", "home", "away", "home_score", "away_score", "kickoff_time"],
+    )
+
+
+def points_after(results_df, played):
+    # Points once the given (event, home) fixtures have been played
+    matches = results_df[
+        [
+            (event, home) in played
+            for event, home in zip(results_df["event"], results_df["home"])
+        ]
+    ]
+    table = event_table(initial_table(), 0, matches)
+    return dict(zip(table["team_name"], table["points"]))
+
+
+def initial_table():
+    return pd.DataFrame(
+        {
+            "event": 0,
+            "team_name": TEAMS,
+            "position": 1,
+            "points": 0,
+            "goal_difference": 0,
+            "goals_scored": 0,
+            "goals_conceded": 0,
+            "wins": 0,
+            "draws": 0,
+            "losses": 0,
+        }
+    )
+
+
+def fixtures_of(*events):
+    return {(event, fixture[0]) for event in events for fixture in PAIRINGS[event]}
+
+
+def points(snapshots, event):
+    table = snapshots[event]
+    return dict(zip(table["team_name"], table["points"]))
+
+
+def test_without_kickoff_times_matches_the_batch_table():
+    results_df = results().drop(columns="kickoff_time")
+    table = build_league_table(results_df)
+
+    expected = initial_table()
+    for event, matches in results_df.groupby("event"):
+        expected = event_table(expected, event, matches)
+        # Teams level on every criterion may be listed in either order
+        got = table[table["event"] == event][SNAPSHOT_COLUMNS]
+        assert got.sort_values("team_name", ignore_index=True).equals(
+            expected[SNAPSHOT_COLUMNS].sort_values("team_name", ignore_index=True)
+        )
+
+
+def test_fixture_brought_forward_does_not_close_the_open_gameweek():
+    # B v D (gameweek 2) is played just after gameweek 1's first fixture
+    results_df = results({(2, "B"): "2024-08-17T12:30:00Z"})
+    snapshots = dict(replay(results_df))
+
+    # Gameweek 1 closes after all of its own fixtures (plus the early one)
+    assert points(snapshots, 1) == points_after(results_df, fixtures_of(1) | {(2, "B")})
+    # Gameweek 2 holds every gameweek 1 and 2 result
+    assert points(snapshots, 2) == points_after(results_df, fixtures_of(1, 2))
+    assert points(snapshots, 3) == points_after(results_df, fixtures_of(1, 2, 3))
+
+
+def test_postponed_fixture_counts_from_the_week_it_was_played():
+    # C v D (gameweek 1) is played on the Tuesday after gameweek 2
+    results_df = results({(1, "C"): "2024-08-27T19:00:00Z"})
+    snapshots = dict(replay(results_df))
+
+    assert points(snapshots, 1) == points_after(results_df, fixtures_of(1) - {(1, "C")})
+    assert points(snapshots, 2) == points_after(results_df, fixtures_of(1, 2))
+
+
+def test_fixtures_after_the_last_gameweek_count_towards_it():
+    # Gameweek 2's last fixture is postponed past gameweek 3
+    close_at = gameweek_close_points([1, 1, 1, 2, 2, 2, 3, 3, 3, 2])
+    assert close_at == {1: 2, 2: 5, 3: 9}
@@ -0,0 +1,102 @@
+import logging
+
+import pandas as pd
+
+from dashboard_html import TeamInfo, render_fixture_heatmap
+from fixture_matrix import update_fixture_matrix
+
+UPCOMING = pd.DataFrame(
+    {
+        "event": [2, 2, 3, 3],
+        "home": ["Arsenal", "Chelsea", "Arsenal", "Wolves"],
+        "away": ["Wolves", "Fulham", "Chelsea", "Fulham"],
+        "kickoff_time": [
+            "2024-08-24T14:00:00Z",
+            "2024-08-24T16:30:00Z",
+            "2024-08-31T14:00:00Z",
+            "2024-08-31T16:30:00Z",
+        ],
+    }
+)
+
+
+def table(positions):
+    return pd.DataFrame(
+        {
+            "event": 1,
+            "team_name": list(positions),
+            "position": list(positions.values()),
+        }
+    )
+
+
+def recomputed(caplog):
+    message = [r.getMessage() for r in caplog.records if "recomputed" in r.getMessage()]
+    return message[-1].split("(")[1] if message else None
+
+
+def gaps(matrix):
+    return {
+        (row.event, row.team): (row.position_gap, row.bonus_eligible)
+        for row in matrix.itertuples()
+    }
+
+
+def test_unchanged_inputs_reuse_the_saved_matrix(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    matrix_file = str(tmp_path / "fixture_matrix.csv")
+    league_df = table({"Arsenal": 1, "Chelsea": 2, "Fulham": 3, "Wolves": 6})
+
+    first = update_fixture_matrix(UPCOMING, league_df, matrix_file)
+    assert recomputed(caplog) == "8 of 8 rows recomputed)"
+    assert gaps(first)[(2, "Wolves")] == (5, True)
+    assert gaps(first)[(2, "Arsenal")] == (-5, False)
+
+    caplog.clear()
+    again = update_fixture_matrix(UPCOMING, league_df, matrix_file)
+    assert "Fixture matrix is up to date" in caplog.text
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_only_rows_with_moved_teams_are_recomputed(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    matrix_file = str(tmp_path / "fixture_matrix.csv")
+    update_fixture_matrix(
+        UPCOMING,
+        table({"Arsenal": 1, "Chelsea": 2, "Fulham": 3, "Wolves": 6}),
+        matrix_file,
+    )
+
+    # Chelsea and Fulham swap places: their four rows change, the two
+    # Arsenal v Wolves rows do not
+    matrix = update_fixture_matrix(
+        UPCOMING,
+        table({"Arsenal": 1, "Chelsea": 3, "Fulham": 2, "Wolves": 6}),
+        matrix_file,
+    )
+    assert recomputed(caplog) == "6 of 8 rows recomputed)"
+    assert gaps(matrix)[(2, "Chelsea")] == (1, False)
+    assert gaps(matrix)[(3, "Wolves")] == (4, False)
+
+
+def test_team_without_a_position(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    matrix_file = str(tmp_path / "fixture_matrix.csv")
+    # Wolves have no table row yet
+    league_df = table({"Arsenal": 1, "Chelsea": 2, "Fulham": 3})
+
+    matrix = update_fixture_matrix(UPCOMING, league_df, matrix_file)
+    wolves = matrix[(matrix["team"] == "Wolves") | (matrix["opponent"] == "Wolves")]
+    assert wolves["position_gap"].isna().all()
+    assert not wolves["bonus_eligible"].any()
+
+    html = render_fixture_heatmap(matrix, TeamInfo())
+    assert "Wolves (H) ?" in html and "Arsenal (A) ?" in html
+
+    # Chelsea and Fulham swap places: the Arsenal v Wolves rows, still
+    # without a Wolves position, are not mistaken for a change
+    caplog.clear()
+    update_fixture_matrix(
+        UPCOMING, table({"Arsenal": 1, "Chelsea": 3, "Fulham": 2}), matrix_file
+    )
+    assert recomputed(caplog) == "6 of 8 rows recomputed)"
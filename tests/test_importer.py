@@ -0,0 +1,135 @@
+import json
+
+import pandas as pd
+import pytest
+
+from importer import HistoricalImporter, load_teams_file
+
+# FPL numbers the clubs alphabetically, so id 1 is a different club once
+# the promoted and relegated sides change
+TEAMS_BY_SEASON = {
+    "2022-23": {1: "Arsenal", 2: "Fulham", 3: "Leeds"},
+    "2023-24": {1: "Arsenal", 2: "Burnley", 3: "Fulham"},
+}
+
+
+def fixture(season, event, home, away, home_score, away_score):
+    return {
+        "season": season,
+        "event": event,
+        "team_h": home,
+        "team_a": away,
+        "team_h_score": home_score,
+        "team_a_score": away_score,
+    }
+
+
+def write_dump(path, fixtures):
+    with open(path, "w") as f:
+        for item in fixtures:
+            f.write(json.dumps(item) + "\n")
+    return str(path)
+
+
+def test_each_season_uses_its_own_teams_map(tmp_path):
+    dump = write_dump(
+        tmp_path / "dump.jsonl",
+        [
+            fixture("2022-23", 1, 2, 3, 1, 0),
+            fixture("2022-23", 2, 3, 1, 0, 2),
+            fixture("2023-24", 1, 2, 3, 2, 2),
+            fixture("2023-24", 2, 1, 2, 3, 0),
+        ],
+    )
+    importer = HistoricalImporter(str(tmp_path / "archive"), TEAMS_BY_SEASON)
+
+    seasons = {
+        season: importer.to_results(compact_df)
+        for season, compact_df in importer.iter_seasons(dump, "fpl-json", chunk_rows=3)
+    }
+
+    assert list(seasons) == ["2022-23", "2023-24"]
+    assert seasons["2022-23"][["home", "away"]].values.tolist() == [
+        ["Fulham", "Leeds"],
+        ["Leeds", "Arsenal"],
+    ]
+    assert seasons["2023-24"][["home", "away"]].values.tolist() == [
+        ["Burnley", "Fulham"],
+        ["Arsenal", "Burnley"],
+    ]
+
+
+def test_import_writes_every_season(tmp_path):
+    dump = write_dump(
+        tmp_path / "dump.jsonl",
+        [fixture("2022-23", 1, 2, 3, 1, 0), fixture("2023-24", 1, 2, 3, 2, 2)],
+    )
+    importer = HistoricalImporter(str(tmp_path / "archive"), TEAMS_BY_SEASON)
+
+    imported = importer.import_file(dump, "fpl-json")
+
+    assert [path.rsplit("/", 1)[-1] for path in imported] == ["2022-23", "2023-24"]
+    results = pd.read_csv(tmp_path / "archive/premier-league/2023-24/results.csv")
+    assert results[["home", "away"]].values.tolist() == [["Burnley", "Fulham"]]
+
+
+def test_import_stays_within_the_output_dir(tmp_path, monkeypatch):
+    dump = write_dump(tmp_path / "dump.jsonl", [fixture("2022-23", 1, 2, 3, 1, 0)])
+    workdir = tmp_path / "elsewhere"
+    workdir.mkdir()
+    # No ./data here: nothing may be read from or written to it
+    monkeypatch.chdir(workdir)
+
+    importer = HistoricalImporter(str(tmp_path / "archive"), TEAMS_BY_SEASON)
+    importer.import_file(dump, "fpl-json")
+
+    assert list(workdir.iterdir()) == []
+    assert (tmp_path / "archive/premier-league/2022-23/results.csv").exists()
+
+
+def test_season_without_teams_map_is_refused(tmp_path):
+    dump = write_dump(
+        tmp_path / "dump.jsonl",
+        [fixture("2022-23", 1, 2, 3, 1, 0), fixture("2021-22", 1, 2, 3, 1, 0)],
+    )
+    importer = HistoricalImporter(str(tmp_path / "archive"), TEAMS_BY_SEASON)
+
+    with pytest.raises(ValueError, match="2021-22"):
+        list(importer.iter_seasons(dump, "fpl-json"))
+
+
+def test_seasons_are_yielded_before_the_rest_is_read(tmp_path):
+    dump = write_dump(
+        tmp_path / "dump.jsonl",
+        [fixture("2022-23", 1, 2, 3, 1, 0), fixture("2023-24", 1, 2, 3, 2, 2)],
+    )
+    with open(dump, "a") as f:
+        f.write("not json\n")
+    importer = HistoricalImporter(str(tmp_path / "archive"), TEAMS_BY_SEASON)
+
+    seasons = importer.iter_seasons(dump, "fpl-json", chunk_rows=1)
+    assert next(seasons)[0] == "2022-23"
+    with pytest.raises(json.JSONDecodeError):
+        list(seasons)
+
+
+def test_interleaved_seasons_are_refused(tmp_path):
+    dump = write_dump(
+        tmp_path / "dump.jsonl",
+        [
+            fixture("2022-23", 1, 2, 3, 1, 0),
+            fixture("2023-24", 1, 2, 3, 2, 2),
+            fixture("2022-23", 2, 3, 1, 0, 2),
+        ],
+    )
+    importer = HistoricalImporter(str(tmp_path / "archive"), TEAMS_BY_SEASON)
+
+    with pytest.raises(ValueError, match="not grouped by season"):
+        list(importer.iter_seasons(dump, "fpl-json"))
+
+
+def test_teams_from_bootstrap(tmp_path):
+    path = tmp_path / "bootstrap-static.json"
+    path.write_text(json.dumps({"teams": [{"id": 1, "name": "Arsenal"}]}))
+
+    assert load_teams_file(str(path)) == {1: "Arsenal"}
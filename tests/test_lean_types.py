@@ -0,0 +1,80 @@
+import pandas as pd
+
+from fetch_data import PremierLeaguePointsCalculator
+from lean_types import read_lean_csv, to_lean
+
+RESULTS = pd.DataFrame(
+    {
+        "event": [1, 1, 2, 2, 3, 3],
+        "home": ["Arsenal", "Chelsea", "Arsenal", "Fulham", "Wolves", "Chelsea"],
+        "away": ["Wolves", "Fulham", "Chelsea", "Wolves", "Arsenal", "Fulham"],
+        "home_score": [2, 0, 1, 3, 0, 4],
+        "away_score": [0, 0, 1, 1, 0, 2],
+    }
+)
+
+
+def run(lean_types, data_dir):
+    calculator = PremierLeaguePointsCalculator(
+        lean_types=lean_types, standings_engine="batch", data_dir=data_dir
+    )
+    calculator.event_cache = None
+    calculator.match_results_df = RESULTS.copy()
+    return (
+        calculator.calculate_league_table(),
+        calculator.calculate_assistant_manager_points(),
+    )
+
+
+def plain(df):
+    # Compare values only: lean frames hold the same numbers in int8/int16
+    # and team names as categories
+    return df.astype(
+        {
+            col: "int64" if pd.api.types.is_integer_dtype(dtype) else str
+            for col, dtype in df.dtypes.items()
+        }
+    )
+
+
+def test_lean_and_normal_modes_agree(tmp_path):
+    league_df, amp_df = run(lean_types=False, data_dir=str(tmp_path))
+    lean_league_df, lean_amp_df = run(lean_types=True, data_dir=str(tmp_path))
+
+    assert lean_amp_df["total_points"].dtype == "int16"
+    assert lean_league_df["team_name"].dtype == "category"
+    pd.testing.assert_frame_equal(plain(lean_league_df), plain(league_df))
+    pd.testing.assert_frame_equal(plain(lean_amp_df), plain(amp_df))
+
+
+def test_lean_csv_round_trip(tmp_path):
+    path = tmp_path / "results.csv"
+    RESULTS.to_csv(path, index=False)
+
+    results_df = read_lean_csv(str(path), "results")
+
+    assert results_df["home_score"].dtype == "int8"
+    assert results_df["home"].dtype == "category"
+    pd.testing.assert_frame_equal(plain(results_df), RESULTS)
+
+
+def test_out_of_range_values_keep_the_wider_dtype(tmp_path):
+    amp_df = pd.DataFrame(
+        {
+            "event": [1, 2],
+            "team": ["Arsenal", "Arsenal"],
+            "total_points": [40000, 5],
+            "total_win_points": [300, -200],
+        }
+    )
+
+    lean_df = to_lean(amp_df, "assistant_manager_points")
+    assert lean_df["event"].dtype == "int8"
+    assert lean_df["total_points"].tolist() == [40000, 5]
+    assert lean_df["total_win_points"].tolist() == [300, -200]
+
+    path = tmp_path / "assistant_manager_points.csv"
+    amp_df.to_csv(path, index=False)
+    assert read_lean_csv(str(path), "assistant_manager_points")[
+        "total_win_points"
+    ].tolist() == [300, -200]
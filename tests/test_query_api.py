@@ -0,0 +1,76 @@
+import json
+
+import pandas as pd
+import pytest
+
+from query_api import DATA_FILES, QueryAPI
+
+
+def reject_constant(name):
+    # json.loads accepts NaN/Infinity by default; strict clients do not
+    raise ValueError(f"{name} is not valid JSON")
+
+
+@pytest.fixture
+def api(tmp_path):
+    pd.DataFrame(
+        {
+            "event": [1, 1],
+            "home": ["A", "C"],
+            "away": ["B", "D"],
+            "home_score": [2, 0],
+            "away_score": [1, 0],
+            "kickoff_time": ["2024-08-17T12:00:00Z", None],
+        }
+    ).to_csv(tmp_path / DATA_FILES["results"], index=False)
+    pd.DataFrame(
+        {
+            "event": [1, 1, 1, 1],
+            "team_name": ["A", "C", "D", "B"],
+            "position": [1, 2, 2, 4],
+            "points": [3, 1, 1, 0],
+            "goal_difference": [1, 0, 0, -1],
+            "goals_scored": [2, 0, 0, 1],
+            "goals_conceded": [1, 0, 0, 2],
+            "wins": [1, 0, 0, 0],
+            "draws": [0, 1, 1, 0],
+            "losses": [0, 0, 0, 1],
+        }
+    ).to_csv(tmp_path / DATA_FILES["league_table"], index=False)
+    pd.DataFrame(
+        {
+            "event": [1, 1, 1, 1],
+            "team": ["A", "B", "C", "D"],
+            "total_points": [8, 1, 5, 5],
+            "total_win_points": [6, 0, 0, 0],
+            "total_draw_points": [0, 0, 3, 3],
+            "total_goal_points": [2, 1, 0, 0],
+            "total_cs_points": [0, 0, 2, 2],
+            "total_table_bonus": [0, 0, 0, 0],
+        }
+    ).to_csv(tmp_path / DATA_FILES["assistant_manager_points"], index=False)
+    return QueryAPI(str(tmp_path))
+
+
+def test_missing_kickoff_time_is_null_in_strict_json(api):
+    status, body, _ = api.handle("/matches?event=1")
+
+    assert status == 200
+    matches = json.loads(body, parse_constant=reject_constant)["data"]
+    assert [match["kickoff_time"] for match in matches] == [
+        "2024-08-17T12:00:00Z",
+        None,
+    ]
+
+
+def test_every_endpoint_returns_strict_json(api):
+    for path in ["/standings", "/amp/team/A", "/amp/range?from=1&to=1", "/version"]:
+        status, body, _ = api.handle(path)
+        assert status == 200
+        json.loads(body, parse_constant=reject_constant)
+
+
+def test_unchanged_data_revalidates_with_the_etag(api):
+    _, _, etag = api.handle("/standings")
+    status, body, _ = api.handle("/standings", if_none_match=etag)
+    assert (status, body) == (304, b"")
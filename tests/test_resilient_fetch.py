@@ -0,0 +1,147 @@
+import time
+
+import pytest
+
+from fake_fpl_server import FakeFPLServer, FaultConfig
+from resilient_fetch import CircuitBreaker, ResilientFetcher, UpstreamUnavailable
+
+FIXTURES = [{"id": 1, "event": 1, "team_h": 1, "team_a": 2}]
+
+
+@pytest.fixture
+def server():
+    with FakeFPLServer({"/api/fixtures/": FIXTURES}) as server:
+        yield server
+
+
+def make_fetcher(tmp_path, **kwargs):
+    breaker = CircuitBreaker(
+        failure_threshold=kwargs.pop("failure_threshold", 3),
+        reset_timeout=kwargs.pop("reset_timeout", 60.0),
+        state_file=str(tmp_path / "circuit_breaker.json"),
+    )
+    options = {"backoff_base": 0.01, "backoff_cap": 0.05, "deadline": 5.0}
+    options.update(kwargs)
+    return ResilientFetcher(cache_dir=str(tmp_path), breaker=breaker, **options)
+
+
+def fetch(fetcher, server):
+    return fetcher.fetch_json(f"{server.base_url}/fixtures/", "fixtures")
+
+
+def prime_cache(fetcher, server):
+    # One good fetch, so later failures have a snapshot to fall back on
+    _, status = fetch(fetcher, server)
+    assert status["source"] == "live"
+    return status
+
+
+def test_retries_until_the_upstream_recovers(tmp_path, server):
+    server.faults = FaultConfig(fail_first=2)
+    fetcher = make_fetcher(tmp_path)
+
+    payload, status = fetch(fetcher, server)
+
+    assert payload == FIXTURES
+    assert status["source"] == "live" and not status["stale"]
+    assert server.requests_seen == 3
+    assert fetcher.breaker.state == "closed" and fetcher.breaker.failures == 0
+
+
+def test_client_errors_are_not_retried(tmp_path, server):
+    fetcher = make_fetcher(tmp_path)
+
+    with pytest.raises(UpstreamUnavailable):
+        fetcher.fetch_json(f"{server.base_url}/missing/", "missing")
+    assert server.requests_seen == 1
+
+
+def test_failures_without_a_snapshot_raise(tmp_path, server):
+    server.faults = FaultConfig(error_rate=1.0)
+    fetcher = make_fetcher(tmp_path, max_attempts=2, failure_threshold=5)
+
+    with pytest.raises(UpstreamUnavailable, match="no cached snapshot"):
+        fetch(fetcher, server)
+    assert server.requests_seen == 2
+
+
+@pytest.mark.parametrize(
+    "faults",
+    [
+        FaultConfig(error_rate=1.0, error_status=503),
+        FaultConfig(error_rate=1.0, error_status=429),
+        FaultConfig(truncate=True),
+        FaultConfig(drop=True),
+    ],
+    ids=["server-error", "rate-limited", "truncated", "dropped"],
+)
+def test_failed_fetch_returns_the_last_good_snapshot(tmp_path, server, faults):
+    fetcher = make_fetcher(tmp_path, max_attempts=2, failure_threshold=5)
+    live = prime_cache(fetcher, server)
+
+    server.faults = faults
+    payload, status = fetch(fetcher, server)
+
+    assert payload == FIXTURES
+    assert status["source"] == "cache" and status["stale"]
+    assert status["fetched_at"] == live["fetched_at"]
+    assert status["error"]
+    assert server.requests_seen == 1 + 2
+
+
+def test_slow_upstream_times_out_within_the_deadline(tmp_path, server):
+    fetcher = make_fetcher(
+        tmp_path, read_timeout=0.2, deadline=0.5, max_attempts=10, failure_threshold=20
+    )
+    prime_cache(fetcher, server)
+
+    server.faults = FaultConfig(delay=1.0)
+    started = time.monotonic()
+    payload, status = fetch(fetcher, server)
+
+    assert time.monotonic() - started < 1.0
+    assert payload == FIXTURES
+    assert status["stale"] and "timed out" in status["error"].lower()
+
+
+def test_breaker_opens_and_skips_the_upstream(tmp_path, server):
+    server.faults = FaultConfig(error_rate=1.0)
+    fetcher = make_fetcher(tmp_path, max_attempts=10, failure_threshold=3)
+
+    with pytest.raises(UpstreamUnavailable):
+        fetch(fetcher, server)
+    # The breaker stops the retries once it opens
+    assert server.requests_seen == 3
+    assert fetcher.breaker.state == "open"
+
+    # A later run reads the open breaker from its state file and does not
+    # call the upstream at all
+    server.faults = FaultConfig()
+    with pytest.raises(UpstreamUnavailable, match="circuit breaker open"):
+        fetch(make_fetcher(tmp_path), server)
+    assert server.requests_seen == 3
+
+
+def test_breaker_lets_a_trial_request_through_after_the_timeout(tmp_path, server):
+    fetcher = make_fetcher(tmp_path, failure_threshold=1, reset_timeout=0.2)
+    prime_cache(fetcher, server)
+
+    server.faults = FaultConfig(error_rate=1.0)
+    _, status = fetch(fetcher, server)
+    assert status["stale"] and fetcher.breaker.state == "open"
+    assert server.requests_seen == 2
+
+    # Half-open: one failed trial opens the breaker again
+    time.sleep(0.25)
+    assert fetcher.breaker.state == "half-open"
+    _, status = fetch(fetcher, server)
+    assert status["stale"] and fetcher.breaker.state == "open"
+    assert server.requests_seen == 3
+
+    # A successful trial closes it
+    server.faults = FaultConfig()
+    time.sleep(0.25)
+    payload, status = fetch(fetcher, server)
+    assert payload == FIXTURES and status["source"] == "live"
+    assert fetcher.breaker.state == "closed"
+    assert server.requests_seen == 4
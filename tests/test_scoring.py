@@ -0,0 +1,64 @@
+import pandas as pd
+
+from scoring import event_points, event_table
+
+
+def initial_table(teams):
+    return pd.DataFrame(
+        {
+            "event": 0,
+            "team_name": teams,
+            "position": 1,
+            "points": 0,
+            "goal_difference": 0,
+            "goals_scored": 0,
+            "goals_conceded": 0,
+            "wins": 0,
+            "draws": 0,
+            "losses": 0,
+        }
+    )
+
+
+def matches(rows):
+    return pd.DataFrame(
+        rows, columns=["event", "home", "away", "home_score", "away_score"]
+    )
+
+
+def test_event_table_applies_results_and_shares_tied_positions():
+    table = event_table(
+        initial_table(["A", "B", "C", "D"]),
+        1,
+        matches([(1, "A", "B", 2, 0), (1, "C", "D", 1, 1)]),
+    )
+
+    rows = table.set_index("team_name")
+    assert list(table["team_name"]) == ["A", "C", "D", "B"]
+    assert rows.loc["A", ["points", "wins", "goal_difference"]].tolist() == [3, 1, 2]
+    assert rows.loc["B", ["points", "losses", "goals_conceded"]].tolist() == [0, 1, 2]
+    # C and D are level on points, goal difference and goals scored
+    assert rows.loc["C", "position"] == rows.loc["D", "position"] == 2
+    assert rows.loc["B", "position"] == 4
+    assert (table["event"] == 1).all()
+
+
+def test_event_table_sums_double_gameweek_matches():
+    table = event_table(
+        initial_table(["A", "B", "C"]),
+        1,
+        matches([(1, "A", "B", 1, 0), (1, "C", "A", 2, 2)]),
+    )
+
+    a = table.set_index("team_name").loc["A"]
+    assert [a["points"], a["wins"], a["draws"], a["goals_scored"]] == [4, 1, 1, 3]
+
+
+def test_event_points_table_bonus_for_beating_a_higher_team():
+    positions = {"Top": 1, "Bottom": 6}
+    points = event_points(3, positions, matches([(3, "Bottom", "Top", 1, 0)]))
+
+    bottom = points.set_index("team").loc["Bottom"]
+    assert bottom["total_table_bonus"] == 10
+    # 6 for the win, 1 goal, 2 for the clean sheet, 10 table bonus
+    assert bottom["total_points"] == 19
@@ -0,0 +1,167 @@
+import importlib.util
+import os
+
+import pandas as pd
+import pytest
+
+import sqlite_store
+from sqlite_store import write_store
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS = pd.DataFrame(
+    {
+        "event": [1, 1, 2, 2, 3, 3],
+        "home": ["Arsenal", "Chelsea", "Arsenal", "Fulham", "Wolves", "Chelsea"],
+        "away": ["Wolves", "Fulham", "Chelsea", "Wolves", "Arsenal", "Fulham"],
+        "home_score": [2, 0, 1, 3, 0, 4],
+        "away_score": [0, 0, 1, 1, 0, 2],
+    }
+)
+
+LEAGUE = pd.DataFrame(
+    {
+        "event": [1, 1],
+        "team_name": ["Arsenal", "Chelsea"],
+        "position": [1, 2],
+        "points": [3, 1],
+        "goal_difference": [2, 0],
+        "goals_scored": [2, 0],
+        "goals_conceded": [0, 0],
+        "wins": [1, 0],
+        "draws": [0, 1],
+        "losses": [0, 0],
+    }
+)
+
+AMP = pd.DataFrame(
+    {
+        "event": [1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3],
+        "team": ["Arsenal", "Wolves", "Chelsea", "Fulham"] * 3,
+        "total_points": [10, 0, 5, 5, 4, 1, 4, 9, 3, 3, 12, 1],
+        "total_win_points": [6, 0, 0, 0, 0, 0, 0, 6, 0, 0, 6, 0],
+        "total_draw_points": [0, 0, 3, 3, 3, 0, 3, 0, 3, 3, 0, 0],
+        "total_goal_points": [2, 0, 0, 0, 1, 1, 1, 3, 0, 0, 4, 1],
+        "total_cs_points": [2, 0, 2, 2, 0, 0, 0, 0, 0, 0, 2, 0],
+        "total_table_bonus": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    }
+)
+
+
+@pytest.fixture(scope="module")
+def dashboard():
+    # app.py only renders when run as a script, so it can be imported here
+    spec = importlib.util.spec_from_file_location("dashboard", f"{ROOT}/app.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def backends(dashboard, tmp_path, monkeypatch):
+    """
+    Run a dashboard query against the CSV backend and the SQLite backend.
+    """
+    RESULTS.to_csv(tmp_path / "results.csv", index=False)
+    AMP.to_csv(tmp_path / "assistant_manager_points.csv", index=False)
+    db_file = write_store(RESULTS, LEAGUE, AMP, str(tmp_path / "amp.sqlite"))
+
+    monkeypatch.setattr(dashboard, "RESULTS_FILE", str(tmp_path / "results.csv"))
+    monkeypatch.setattr(
+        dashboard, "POINTS_FILE", str(tmp_path / "assistant_manager_points.csv")
+    )
+    monkeypatch.setattr(dashboard, "DB_FILE", db_file)
+    dashboard.load_points_data.clear()
+    dashboard.load_results_data.clear()
+
+    def run(name, *args, **kwargs):
+        outputs = []
+        for backend in ["csv", "sqlite"]:
+            monkeypatch.setattr(dashboard, "DATA_BACKEND", backend)
+            outputs.append(getattr(dashboard, name)(*args, **kwargs))
+        return outputs
+
+    yield run
+    dashboard.load_points_data.clear()
+    dashboard.load_results_data.clear()
+
+
+def same_rows(csv_df, sqlite_df, sort_by=None):
+    if sort_by:
+        csv_df = csv_df.sort_values(sort_by)
+        sqlite_df = sqlite_df.sort_values(sort_by)
+    pd.testing.assert_frame_equal(
+        csv_df.reset_index(drop=True)[list(sqlite_df.columns)],
+        sqlite_df.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_write_store_swaps_in_a_complete_file(tmp_path):
+    db_file = write_store(RESULTS, LEAGUE, AMP, str(tmp_path / "amp.sqlite"))
+
+    assert not os.path.exists(f"{db_file}.tmp")
+    assert sqlite_store.list_events(db_file) == [1, 2, 3]
+    assert len(sqlite_store.query("SELECT * FROM league_table", db_file=db_file)) == 2
+
+
+def test_connection_is_pooled_until_the_file_is_replaced(tmp_path):
+    db_file = write_store(RESULTS, LEAGUE, AMP, str(tmp_path / "amp.sqlite"))
+    conn, _ = sqlite_store.get_connection(db_file)
+    assert sqlite_store.get_connection(db_file)[0] is conn
+
+    write_store(RESULTS, LEAGUE, AMP.assign(total_points=0), db_file)
+    assert sqlite_store.get_connection(db_file)[0] is not conn
+    assert sqlite_store.overall_totals(db_file)["total_points"].sum() == 0
+
+
+def test_page_queries_match_the_csv_backend(backends):
+    csv_df, sqlite_df = backends("get_overall_totals")
+    same_rows(csv_df, sqlite_df, sort_by=["total_points", "team"])
+
+    assert backends("get_events") == [[1, 2, 3]] * 2
+    assert backends("get_teams") == [["Arsenal", "Chelsea", "Fulham", "Wolves"]] * 2
+
+    same_rows(*backends("get_gameweek_breakdown", [1, 3]), sort_by="team")
+    same_rows(*backends("get_team_event_points"), sort_by=["event", "team"])
+
+    csv_summary, sqlite_summary = backends("get_team_summary", "Chelsea")
+    assert csv_summary == pytest.approx(sqlite_summary)
+
+
+@pytest.mark.parametrize("limit, offset", [(None, 0), (2, 0), (2, 2), (5, 1)])
+def test_paged_lists_match_the_csv_backend(backends, limit, offset):
+    same_rows(*backends("get_event_matches", [1, 2, 3], limit, offset))
+    same_rows(*backends("get_team_history", "Arsenal", limit, offset))
+    same_rows(*backends("get_team_matches", "Fulham", limit, offset))
+
+    assert backends("count_event_matches", [2, 3]) == [4, 4]
+    assert backends("count_team_matches", "Fulham") == [3, 3]
+
+
+def test_team_matches_are_paged_in_event_order(dashboard, tmp_path, monkeypatch):
+    # A postponed GW1 match played after GW3 comes last in results.csv
+    results_df = pd.concat(
+        [
+            RESULTS,
+            pd.DataFrame([(1, "Fulham", "Arsenal", 2, 2)], columns=RESULTS.columns),
+        ],
+        ignore_index=True,
+    )
+    results_df.to_csv(tmp_path / "results.csv", index=False)
+    db_file = write_store(results_df, LEAGUE, AMP, str(tmp_path / "amp.sqlite"))
+    monkeypatch.setattr(dashboard, "RESULTS_FILE", str(tmp_path / "results.csv"))
+    monkeypatch.setattr(dashboard, "DB_FILE", db_file)
+    dashboard.load_results_data.clear()
+
+    pages = {}
+    for backend in ["csv", "sqlite"]:
+        monkeypatch.setattr(dashboard, "DATA_BACKEND", backend)
+        pages[backend] = [
+            dashboard.get_team_matches("Fulham", 2, offset) for offset in (0, 2)
+        ]
+    dashboard.load_results_data.clear()
+
+    assert pages["csv"][0]["event"].tolist() == [1, 1]
+    for csv_df, sqlite_df in zip(pages["csv"], pages["sqlite"]):
+        same_rows(csv_df, sqlite_df)
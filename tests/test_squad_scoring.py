@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from squad_scoring import score_picks
+
+# Wolves blank in GW2 and play twice in GW3
+AMP = pd.DataFrame(
+    {
+        "event": [1, 1, 1, 2, 2, 3, 3, 3, 3],
+        "team": [
+            "Arsenal",
+            "Chelsea",
+            "Wolves",
+            "Arsenal",
+            "Chelsea",
+            "Arsenal",
+            "Chelsea",
+            "Wolves",
+            "Wolves",
+        ],
+        "total_points": [10, 4, 2, 3, 12, 6, 5, 7, 8],
+    }
+)
+
+PICKS = pd.DataFrame(
+    [
+        ("ann", 1, 3, "Arsenal"),  # 10 + 3 + 6
+        ("ann", 3, 5, "Wolves"),  # double gameweek, clipped to GW3: 7 + 8
+        ("bob", 1, 2, "Chelsea"),  # 4 + 12
+        ("bob", 2, 2, "Wolves"),  # blank: 0
+        ("bob", 3, 3, "Everton"),  # no AMP at all: 0
+        ("cat", 2, 3, "Chelsea"),  # 12 + 5
+        ("dan", 1, 1, "Wolves"),  # 2
+    ],
+    columns=["user", "start_event", "end_event", "team"],
+)
+
+
+def write_picks(tmp_path, picks):
+    path = tmp_path / "picks.csv"
+    picks.to_csv(path, index=False)
+    return str(path)
+
+
+def test_picks_score_their_teams_amp(tmp_path):
+    standings = score_picks(
+        write_picks(tmp_path, PICKS),
+        AMP,
+        output_file=str(tmp_path / "user_standings.csv"),
+        workers=1,
+    )
+
+    assert standings.values.tolist() == [
+        [1, "ann", 34, 2],
+        [2, "cat", 17, 1],
+        [3, "bob", 16, 3],
+        [4, "dan", 2, 1],
+    ]
+    saved = pd.read_csv(tmp_path / "user_standings.csv")
+    assert saved.values.tolist() == standings.values.tolist()
+
+
+def test_tied_users_share_a_rank(tmp_path):
+    picks = PICKS[PICKS["user"] != "bob"]
+    picks = pd.concat(
+        [picks, pd.DataFrame([("eve", 2, 3, "Chelsea")], columns=picks.columns)]
+    )
+
+    standings = score_picks(write_picks(tmp_path, picks), AMP, workers=1)
+
+    assert standings[["rank", "user"]].values.tolist() == [
+        [1, "ann"],
+        [2, "cat"],
+        [2, "eve"],
+        [4, "dan"],
+    ]
+
+
+def test_process_pool_matches_the_serial_path(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 2000
+    start = rng.integers(1, 4, n)
+    picks = pd.DataFrame(
+        {
+            "user": [f"user{i}" for i in rng.integers(0, 150, n)],
+            "start_event": start,
+            "end_event": start + rng.integers(0, 3, n),
+            "team": rng.choice(["Arsenal", "Chelsea", "Wolves", "Everton"], n),
+        }
+    )
+    picks_file = write_picks(tmp_path, picks)
+
+    serial = score_picks(picks_file, AMP, chunk_rows=97, workers=1)
+    parallel = score_picks(picks_file, AMP, chunk_rows=97, workers=2)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert serial["picks"].sum() == n
@@ -0,0 +1,84 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from metadata import METADATA_FILE
+from query_api import DATA_FILES
+from static_export import LATEST_FILE, export_site
+
+RESULTS = pd.DataFrame(
+    {
+        "event": [1, 1],
+        "home": ["Arsenal", "Chelsea"],
+        "away": ["Wolves", "Fulham"],
+        "home_score": [2, 0],
+        "away_score": [0, 0],
+        "kickoff_time": ["2024-08-17T12:00:00Z", None],
+    }
+)
+
+
+def write_outputs(data_dir, home_score):
+    results_df = RESULTS.assign(home_score=[home_score, 0])
+    results_df.to_csv(data_dir / DATA_FILES["results"], index=False)
+    pd.DataFrame({"event": [1], "team_name": ["Arsenal"]}).to_csv(
+        data_dir / DATA_FILES["league_table"], index=False
+    )
+    pd.DataFrame(
+        {
+            "event": [1, 1, 1, 1],
+            "team": ["Arsenal", "Wolves", "Chelsea", "Fulham"],
+            "total_points": [6 + home_score + 2, 0, 5, 5],
+            "total_win_points": [6, 0, 0, 0],
+            "total_draw_points": [0, 0, 3, 3],
+            "total_goal_points": [home_score, 0, 0, 0],
+            "total_cs_points": [2, 0, 2, 2],
+            "total_table_bonus": [0, 0, 0, 0],
+        }
+    ).to_csv(data_dir / DATA_FILES["assistant_manager_points"], index=False)
+
+
+def live_version(export_dir):
+    with open(os.path.join(export_dir, LATEST_FILE)) as f:
+        return json.load(f)["version"]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_outputs(tmp_path, 2)
+    return tmp_path
+
+
+def test_latest_follows_data_that_reverts(data_dir):
+    first = export_site(str(data_dir))
+    write_outputs(data_dir, 3)
+    second = export_site(str(data_dir))
+    assert first != second
+
+    write_outputs(data_dir, 2)
+    assert export_site(str(data_dir)) == first
+    assert live_version(data_dir / "export") == os.path.basename(first)
+
+
+def test_reused_version_is_kept_as_the_newest(data_dir):
+    first = export_site(str(data_dir), keep=2)
+    write_outputs(data_dir, 3)
+    second = export_site(str(data_dir), keep=2)
+
+    # The data reverts: the first export is live again and must survive
+    # pruning even though it was written before the second
+    write_outputs(data_dir, 2)
+    export_site(str(data_dir), keep=1)
+    assert os.path.exists(first) and not os.path.exists(second)
+    assert sorted(os.listdir(data_dir / "export")) == sorted(
+        [os.path.basename(first), LATEST_FILE]
+    )
+
+
+def test_metadata_changes_the_version(data_dir):
+    first = export_site(str(data_dir))
+    with open(data_dir / METADATA_FILE, "w") as f:
+        json.dump({"teams": {"1": "Arsenal"}, "logos": {}, "managers": {}}, f)
+    assert export_site(str(data_dir)) != first
@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+
+from scoring import event_points, event_table
+from what_if import WhatIf, parse_overrides
+
+TEAMS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+# Gameweek 2 is a double gameweek for A and B
+RESULTS = [
+    (1, "A", "B", 2, 0),
+    (1, "C", "D", 1, 1),
+    (1, "E", "F", 0, 3),
+    (1, "G", "H", 2, 2),
+    (2, "B", "C", 1, 0),
+    (2, "D", "A", 0, 1),
+    (2, "F", "G", 1, 1),
+    (2, "H", "E", 0, 2),
+    (2, "A", "B", 3, 1),
+    (3, "A", "C", 0, 0),
+    (3, "B", "D", 2, 1),
+    (3, "E", "G", 1, 0),
+    (3, "F", "H", 0, 1),
+]
+
+
+def publish(results_df):
+    """
+    League table and AMP as the batch pipeline computes them.
+    """
+    table = pd.DataFrame(
+        {
+            "event": 0,
+            "team_name": TEAMS,
+            "position": 1,
+            "points": 0,
+            "goal_difference": 0,
+            "goals_scored": 0,
+            "goals_conceded": 0,
+            "wins": 0,
+            "draws": 0,
+            "losses": 0,
+        }
+    )
+    tables, points = [table], []
+    for event, matches in results_df.groupby("event"):
+        positions = dict(zip(table["team_name"], table["position"]))
+        points.append(event_points(event, positions, matches))
+        table = event_table(table, event, matches)
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True), pd.concat(points, ignore_index=True)
+
+
+def results(overrides=()):
+    results_df = pd.DataFrame(
+        RESULTS, columns=["event", "home", "away", "home_score", "away_score"]
+    )
+    for event, home, away, home_score, away_score in overrides:
+        match = (
+            (results_df["event"] == event)
+            & (results_df["home"] == home)
+            & (results_df["away"] == away)
+        )
+        results_df.loc[match, ["home_score", "away_score"]] = [home_score, away_score]
+    return results_df
+
+
+@pytest.fixture
+def what_if():
+    return WhatIf(results(), *publish(results()))
+
+
+def test_unchanged_double_gameweek_score_reports_no_changes(what_if):
+    effect = what_if.compare([(2, "A", "B", 3, 1)])
+
+    assert effect["amp_changes"].empty
+    assert (effect["amp_totals"]["points_change"] == 0).all()
+    assert (effect["standings"]["points_change"] == 0).all()
+
+
+def test_double_gameweek_override_matches_a_full_recompute(what_if):
+    overrides = [(2, "A", "B", 1, 1)]
+    effect = what_if.compare(overrides)
+
+    league_df, amp_df = publish(results(overrides))
+    expected = amp_df.groupby("team")["total_points"].sum()
+    totals = effect["amp_totals"].set_index("team")["total_points"]
+    assert totals.sort_index().to_dict() == expected.sort_index().to_dict()
+
+    # One row per team for the double gameweek, with its change counted once
+    published = publish(results())[1].groupby("team")["total_points"].sum()
+    changes = effect["amp_changes"]
+    assert not changes.duplicated(["event", "team"]).any()
+    assert (
+        changes.groupby("team")["points_change"].sum().to_dict()
+        == (expected - published)[expected != published].to_dict()
+    )
+
+    final = league_df[league_df["event"] == 3].set_index("team_name")
+    standings = effect["standings"].set_index("team_name")
+    assert standings["points"].to_dict() == final["points"].to_dict()
+    assert standings["position"].to_dict() == final["position"].to_dict()
+
+
+def test_overrides_must_name_a_played_match(what_if):
+    with pytest.raises(ValueError):
+        what_if.compare([(2, "A", "H", 1, 0)])
+    with pytest.raises(ValueError):
+        parse_overrides("2:A:B")
+
+
+def test_parse_overrides():
+    assert parse_overrides("2:A:B:1-1, 3:B:D:0-2") == [
+        (2, "A", "B", 1, 1),
+        (3, "B", "D", 0, 2),
+    ]